@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import time
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.core.lifespan import run_periodically
+from app.database.models.enums import JobKind
+from app.repositories.job_repo import JobRepo
+from app.services.jobs.handlers import (
+    DEAD_LETTER_HANDLERS,
+    HANDLERS,
+    enqueue_offer_parsing,
+    fill_minhash_signatures,
+    offer_service,
+)
+from app.services.jobs.worker import JobWorker
+
+
+async def run(concurrency: int) -> None:
+    settings = get_settings()
+    worker = JobWorker(
+        HANDLERS,
+        concurrency=concurrency,
+        poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+        retry_backoff_seconds=settings.JOB_RETRY_BACKOFF_SECONDS,
+        retry_backoff_max_seconds=settings.JOB_RETRY_BACKOFF_MAX_SECONDS,
+        lock_timeout_seconds=settings.JOB_LOCK_TIMEOUT_SECONDS,
+        dead_letter_handlers=DEAD_LETTER_HANDLERS,
+    )
+    tasks = [worker.run(), run_periodically(fill_minhash_signatures, settings.MINHASH_SWEEP_SECONDS)]
+    if settings.OFFER_PARSE_PIPELINE_ENABLED:
+        tasks.append(run_periodically(enqueue_offer_parsing, settings.OFFER_PARSE_SWEEP_SECONDS))
+    await asyncio.gather(*tasks)
+
+
+async def requeue_dead(kind: JobKind | None) -> None:
+    async for session in get_db():
+        requeued = await JobRepo(session).requeue_dead(kind)
+
+    logger.info(f"Requeued {requeued} dead jobs")
+
+
+async def parse_backlog(batch_size: int, limit: int | None) -> None:
+    start_time = time.perf_counter()
+
+    async for session in get_db():
+        parsed = await offer_service(session).parse_new_offers(batch_size, limit)
+
+    logger.info(f"Parsed {parsed} NEW offers in {time.perf_counter() - start_time:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Process background jobs from the `jobs` table")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Claim and run jobs until stopped")
+    run_parser.add_argument("--concurrency", type=int, default=get_settings().JOB_WORKER_CONCURRENCY)
+
+    requeue_parser = subparsers.add_parser("requeue-dead", help="Give dead-lettered jobs a fresh set of attempts")
+    requeue_parser.add_argument("--kind", choices=[kind.value for kind in JobKind])
+
+    backlog_parser = subparsers.add_parser(
+        "parse-backlog", help="Parse all unparsed NEW offers, several per AI call, without the queue"
+    )
+    backlog_parser.add_argument("--batch-size", type=int, default=10)
+    backlog_parser.add_argument("--limit", type=int)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        asyncio.run(run(args.concurrency))
+    elif args.command == "requeue-dead":
+        asyncio.run(requeue_dead(JobKind(args.kind) if args.kind else None))
+    elif args.command == "parse-backlog":
+        asyncio.run(parse_backlog(args.batch_size, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+from loguru import logger
+from pydantic import TypeAdapter
+from sqlalchemy import event
+
+from app.core import database
+from app.core.database import get_db
+from app.database.models.enums import OfferStatus
+from app.repositories.filters.offer_filters import OfferFilters
+from app.repositories.offer_repo import OfferRepo
+from app.schemas.domain.offer import OfferIndexResponse
+
+RELATIONS = ["legal_roles", "place", "city"]
+FIELDS = list(OfferIndexResponse.model_fields)
+
+# selectinload: entities plus one round trip per relationship; single_query: rows with joined and aggregated relations
+STRATEGIES = {
+    "selectinload": {"load_relations": RELATIONS},
+    "single_query": {"columns": FIELDS},
+}
+
+
+async def measure(strategy: str, iterations: int, limit: int, status: OfferStatus | None) -> None:
+    items = TypeAdapter(list[OfferIndexResponse])
+    statements = 0
+
+    def count_statement(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    async for session in get_db():
+        repo = OfferRepo(session)
+        event.listen(database.engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            for _ in range(iterations):
+                start_time = time.perf_counter()
+                page = await repo.get_offers(
+                    0, limit, "created_at", "desc", OfferFilters(status=status), **STRATEGIES[strategy]
+                )
+                items.validate_python(page.items, from_attributes=True)
+                timings.append((time.perf_counter() - start_time) * 1000)
+                # Every iteration starts from an empty identity map
+                session.expunge_all()
+        finally:
+            event.remove(database.engine.sync_engine, "before_cursor_execute", count_statement)
+
+    logger.info(
+        f"{strategy}: {statements / iterations:.0f} statements per page, "
+        f"median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms over {iterations} pages of {limit}"
+    )
+
+
+async def compare(iterations: int, limit: int, status: OfferStatus | None) -> None:
+    for strategy in STRATEGIES:
+        # Warm up the connection pool and prepared statements
+        await measure(strategy, 3, limit, status)
+    for strategy in STRATEGIES:
+        await measure(strategy, iterations, limit, status)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the offer listing loader strategies")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--status", type=OfferStatus, default=None)
+
+    args = parser.parse_args()
+    asyncio.run(compare(args.iterations, args.limit, args.status))
+
+
+if __name__ == "__main__":
+    main()
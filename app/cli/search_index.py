@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import time
+
+from loguru import logger
+
+from app.core.database import get_db
+from app.repositories.offer_repo import OfferRepo
+
+
+async def rebuild(batch_size: int) -> None:
+    start_time = time.perf_counter()
+
+    async for session in get_db():
+        updated = await OfferRepo(session).rebuild_search_vectors(batch_size)
+
+    logger.info(f"Rebuilt search vectors for {updated} offers in {time.perf_counter() - start_time:.1f}s")
+
+
+async def rebuild_minhash(batch_size: int) -> None:
+    start_time = time.perf_counter()
+
+    async for session in get_db():
+        updated = await OfferRepo(session).rebuild_minhash(batch_size)
+
+    logger.info(f"Rebuilt MinHash signatures for {updated} offers in {time.perf_counter() - start_time:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the offers full-text search and near-duplicate indexes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser("rebuild", help="Recompute search vectors for all offers")
+    rebuild_parser.add_argument("--batch-size", type=int, default=5000)
+
+    minhash_parser = subparsers.add_parser("rebuild-minhash", help="Recompute near-duplicate signatures for all offers")
+    minhash_parser.add_argument("--batch-size", type=int, default=2000)
+
+    args = parser.parse_args()
+    if args.command == "rebuild":
+        asyncio.run(rebuild(args.batch_size))
+    elif args.command == "rebuild-minhash":
+        asyncio.run(rebuild_minhash(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from app.core.exceptions import BadRequestError
+
+
+def encode_cursor(sort_column: str, sort_order: str, value: Any, row_id: int) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe token.
+
+    The token carries the sort key of the last row on a page plus its `id` tiebreaker,
+    together with the ordering it was produced for, so it cannot be replayed against a different sort.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    payload = {"k": sort_column, "o": sort_order, "v": value, "i": row_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: str, sort_order: str) -> tuple[Any, int]:
+    """
+    Decode a token produced by `encode_cursor` into `(sort_value, id)`.
+
+    Raises BadRequestError when the token is malformed or was issued for another ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, row_id = payload["v"], int(payload["i"])
+        key, order = payload["k"], payload["o"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise BadRequestError("Invalid cursor") from e
+
+    if key != sort_column or order != sort_order:
+        raise BadRequestError("Cursor does not match the requested ordering")
+
+    return value, row_id
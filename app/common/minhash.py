@@ -0,0 +1,88 @@
+import hashlib
+import re
+import struct
+
+from unidecode import unidecode
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows: texts with a Jaccard similarity of 0.7 share a band ~99% of the time, at 0.3 ~12%
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+DUPLICATE_THRESHOLD = 0.7
+
+# One-permutation hashing: a shingle's 64-bit hash picks its bin (low bits) and its rank within the bin
+# (top 24 bits). Bins no shingle fell into borrow the next filled bin's rank, offset past any real rank.
+_BIN_MASK = NUM_PERMUTATIONS - 1
+_RANK_SHIFT = 40
+_EMPTY = 1 << 32
+_SIGNATURE = struct.Struct(f"<{NUM_PERMUTATIONS}I")
+_NON_WORD = re.compile(r"[^a-z0-9@.]+")
+
+
+def shingles(text: str) -> set[str]:
+    """Character shingles of the ASCII-folded, lowercased text with punctuation and spacing collapsed."""
+    normalized = _NON_WORD.sub(" ", unidecode(text).lower()).strip()
+    if not any(char.isalnum() for char in normalized):
+        return set()
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str | None) -> bytes | None:
+    """
+    MinHash signature (NUM_PERMUTATIONS 32-bit minima, 256 bytes), or None for a text without content.
+    One hash per shingle (one-permutation hashing with rotation densification), so the cost is linear in the
+    text length rather than in shingles times permutations.
+    """
+    grams = shingles(text or "")
+    if not grams:
+        return None
+
+    minima = [_EMPTY] * NUM_PERMUTATIONS
+    for gram in grams:
+        value = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest())
+        slot, rank = value & _BIN_MASK, value >> _RANK_SHIFT
+        if rank < minima[slot]:
+            minima[slot] = rank
+
+    filled = [slot for slot, rank in enumerate(minima) if rank != _EMPTY]
+    if len(filled) < NUM_PERMUTATIONS:
+        densified = list(minima)
+        for slot in range(NUM_PERMUTATIONS):
+            if minima[slot] == _EMPTY:
+                distance = next(step for step in range(1, NUM_PERMUTATIONS) if minima[(slot + step) & _BIN_MASK] != _EMPTY)
+                densified[slot] = minima[(slot + distance) & _BIN_MASK] + (distance << 24)
+        minima = densified
+    return _SIGNATURE.pack(*minima)
+
+
+def bands(signature_bytes: bytes) -> list[int]:
+    """
+    LSH band keys as signed 64-bit integers (bigint). The band number is part of the hash, so two offers
+    sharing any key agree on all rows of the same band.
+    """
+    width = ROWS_PER_BAND * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + signature_bytes[band * width:(band + 1) * width], digest_size=8).digest(),
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def signature_fields(text: str | None) -> dict[str, bytes | list[int] | None]:
+    """
+    `Offer.minhash` and `Offer.minhash_bands` values for an offer's text. A text without content gets no
+    band keys (`[]`, never a candidate); NULL bands mark an offer still waiting to be fingerprinted.
+    """
+    signature_bytes = signature(text)
+    return {"minhash": signature_bytes, "minhash_bands": bands(signature_bytes) if signature_bytes else []}
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    matches = sum(a == b for a, b in zip(_SIGNATURE.unpack(first), _SIGNATURE.unpack(second), strict=True))
+    return matches / NUM_PERMUTATIONS
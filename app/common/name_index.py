@@ -0,0 +1,127 @@
+import bisect
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+SIMILARITY_THRESHOLD = 0.3  # same default as pg_trgm.similarity_threshold
+
+
+def trigrams(value: str) -> set[str]:
+    """Trigrams of a hyphen-padded name, so word starts and ends get their own grams (`-wa`, `wa-`)."""
+    padded = f"-{value}-"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex[T]:
+    """
+    In-memory autocomplete index over sanitized (`sanitize_name`) names.
+
+    Mirrors the ranking of the trigram-backed SQL lookups: prefix matches first, then substring matches,
+    then typo-tolerant matches whose trigram similarity reaches SIMILARITY_THRESHOLD. Within a tier items are
+    ordered by `rank` (highest first) and then by similarity.
+    """
+
+    def __init__(self, key: Callable[[T], str], identity: Callable[[T], Any], rank: Callable[[T], tuple[float, ...]]) -> None:
+        self._key = key
+        self._identity = identity
+        self._rank = rank
+        self._items: dict[Any, T] = {}
+        self._names: dict[Any, str] = {}
+        self._grams: dict[Any, set[str]] = {}
+        self._postings: dict[str, set[Any]] = defaultdict(set)
+        self._sorted: list[tuple[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def rebuild(self, items: Iterable[T]) -> None:
+        self._items.clear()
+        self._names.clear()
+        self._grams.clear()
+        self._postings.clear()
+        for item in items:
+            self._insert(item)
+        self._sorted = sorted((name, item_id) for item_id, name in self._names.items())
+
+    def add(self, item: T) -> None:
+        item_id = self._identity(item)
+        if item_id in self._items:
+            self.remove(item_id)
+        if self._insert(item):
+            bisect.insort(self._sorted, (self._names[item_id], item_id))
+
+    def remove(self, item_id: Any) -> None:
+        if item_id not in self._items:
+            return
+        name = self._names.pop(item_id)
+        for gram in self._grams.pop(item_id):
+            self._postings[gram].discard(item_id)
+        del self._items[item_id]
+        position = bisect.bisect_left(self._sorted, (name, item_id))
+        if position < len(self._sorted) and self._sorted[position] == (name, item_id):
+            del self._sorted[position]
+
+    def search(self, query: str, limit: int, predicate: Callable[[T], bool] | None = None) -> list[T]:
+        query = query.lower()
+        if not query:
+            return []
+
+        scored: dict[Any, tuple[int, float]] = {}
+        for item_id in self._substring_candidates(query):
+            name = self._names[item_id]
+            if query in name:
+                scored[item_id] = (0 if name.startswith(query) else 1, 0.0)
+
+        if len(scored) < limit and len(query) >= 3:
+            for item_id, similarity in self._similar(query):
+                scored.setdefault(item_id, (2, similarity))
+
+        results = []
+        for item_id, (tier, similarity) in scored.items():
+            item = self._items[item_id]
+            if predicate is None or predicate(item):
+                results.append((tier, tuple(-value for value in self._rank(item)), -similarity, self._names[item_id], item))
+
+        results.sort(key=lambda result: result[:4])
+        return [result[4] for result in results[:limit]]
+
+    def _insert(self, item: T) -> bool:
+        name = self._key(item)
+        if not name:
+            return False
+        item_id = self._identity(item)
+        grams = trigrams(name)
+        self._items[item_id] = item
+        self._names[item_id] = name
+        self._grams[item_id] = grams
+        for gram in grams:
+            self._postings[gram].add(item_id)
+        return True
+
+    def _substring_candidates(self, query: str) -> Sequence[Any] | set[Any]:
+        if len(query) == 1:
+            start = bisect.bisect_left(self._sorted, (query,))
+            end = bisect.bisect_left(self._sorted, (query + "￿",))
+            return [item_id for _, item_id in self._sorted[start:end]]
+
+        if len(query) == 2:
+            # A 2-char substring is the head or tail of at least one padded trigram of the name
+            return set().union(*(ids for gram, ids in self._postings.items() if query in (gram[:2], gram[1:])))
+
+        # Every trigram of the query must appear in a matching name
+        postings = sorted((self._postings.get(query[i:i + 3], set()) for i in range(len(query) - 2)), key=len)
+        return set.intersection(*postings)
+
+    def _similar(self, query: str) -> list[tuple[Any, float]]:
+        query_grams = trigrams(query)
+        shared: dict[Any, int] = defaultdict(int)
+        for gram in query_grams:
+            for item_id in self._postings.get(gram, ()):
+                shared[item_id] += 1
+
+        matches = []
+        for item_id, common in shared.items():
+            similarity = common / (len(query_grams) + len(self._grams[item_id]) - common)
+            if similarity >= SIMILARITY_THRESHOLD:
+                matches.append((item_id, similarity))
+        return matches
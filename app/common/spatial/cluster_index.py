@@ -0,0 +1,130 @@
+import bisect
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+def lon_to_x(lon: float) -> float:
+    return lon / 360 + 0.5
+
+
+def lat_to_y(lat: float) -> float:
+    sin = math.sin(math.radians(lat))
+    y = 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi if abs(sin) < 1 else (0.0 if sin > 0 else 1.0)
+    return min(1.0, max(0.0, y))
+
+
+def x_to_lon(x: float) -> float:
+    return (x - 0.5) * 360
+
+
+def y_to_lat(y: float) -> float:
+    return math.degrees(2 * math.atan(math.exp((0.5 - y) * 2 * math.pi))) - 90
+
+
+@dataclass(slots=True)
+class ClusterNode[T]:
+    x: float
+    y: float
+    count: int
+    # The point itself for single points, None for clusters
+    item: T | None = None
+    # Zoom level at which the cluster was formed; it splits up from `zoom + 1` on
+    zoom: int | None = None
+
+    @property
+    def lat(self) -> float:
+        return y_to_lat(self.y)
+
+    @property
+    def lon(self) -> float:
+        return x_to_lon(self.x)
+
+    @property
+    def expansion_zoom(self) -> int | None:
+        return self.zoom + 1 if self.zoom is not None else None
+
+
+class ClusterIndex[T]:
+    """
+    Hierarchical greedy point clustering in Web Mercator space, the same scheme as mapbox's supercluster:
+    every zoom level merges the nodes of the level below that lie within `radius` pixels of each other,
+    so a viewport query only touches the nodes of one precomputed level.
+    """
+
+    def __init__(
+        self,
+        points: Iterable[tuple[float, float, T]],
+        radius: float = 60,
+        extent: int = 512,
+        min_zoom: int = 0,
+        max_zoom: int = 16,
+    ) -> None:
+        self.radius = radius
+        self.extent = extent
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+
+        nodes = [ClusterNode(lon_to_x(lon), lat_to_y(lat), 1, item) for lat, lon, item in points]
+        self._levels: dict[int, tuple[list[float], list[ClusterNode[T]]]] = {max_zoom + 1: self._sorted(nodes)}
+        for zoom in range(max_zoom, min_zoom - 1, -1):
+            nodes = self._cluster(nodes, zoom)
+            self._levels[zoom] = self._sorted(nodes)
+
+    def get_clusters(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: float) -> list[ClusterNode[T]]:
+        level = max(self.min_zoom, min(math.floor(zoom), self.max_zoom + 1))
+
+        if max_lon - min_lon >= 360:
+            min_lon, max_lon = -180.0, 180.0
+        elif min_lon > max_lon:
+            # Viewport crosses the antimeridian
+            return (
+                self.get_clusters(min_lon, min_lat, 180.0, max_lat, zoom)
+                + self.get_clusters(-180.0, min_lat, max_lon, max_lat, zoom)
+            )
+
+        xs, nodes = self._levels[level]
+        min_x, max_x = lon_to_x(min_lon), lon_to_x(max_lon)
+        min_y, max_y = lat_to_y(max_lat), lat_to_y(min_lat)
+
+        start, end = bisect.bisect_left(xs, min_x), bisect.bisect_right(xs, max_x)
+        return [node for node in nodes[start:end] if min_y <= node.y <= max_y]
+
+    def _cluster(self, nodes: list[ClusterNode[T]], zoom: int) -> list[ClusterNode[T]]:
+        radius = self.radius / (self.extent * 2 ** zoom)
+
+        cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for i, node in enumerate(nodes):
+            cells[(math.floor(node.x / radius), math.floor(node.y / radius))].append(i)
+
+        visited = [False] * len(nodes)
+        clustered = []
+        for i, node in enumerate(nodes):
+            if visited[i]:
+                continue
+            visited[i] = True
+
+            weighted_x, weighted_y, count = node.x * node.count, node.y * node.count, node.count
+            cell_x, cell_y = math.floor(node.x / radius), math.floor(node.y / radius)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for j in cells.get((cell_x + dx, cell_y + dy), ()):
+                        other = nodes[j]
+                        if visited[j] or (other.x - node.x) ** 2 + (other.y - node.y) ** 2 > radius ** 2:
+                            continue
+                        visited[j] = True
+                        weighted_x += other.x * other.count
+                        weighted_y += other.y * other.count
+                        count += other.count
+
+            if count == node.count:
+                clustered.append(node)
+            else:
+                clustered.append(ClusterNode(weighted_x / count, weighted_y / count, count, zoom=zoom))
+        return clustered
+
+    @staticmethod
+    def _sorted(nodes: list[ClusterNode[T]]) -> tuple[list[float], list[ClusterNode[T]]]:
+        ordered = sorted(nodes, key=lambda node: node.x)
+        return [node.x for node in ordered], ordered
@@ -0,0 +1,75 @@
+import math
+from collections import defaultdict
+from collections.abc import Hashable
+
+# Radius of earthdistance's `earth()`, so in-memory and SQL radius checks agree
+EARTH_RADIUS_KM = 6378.168
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """Uniform lat/lon grid of point ids answering "which points lie within N km" without scanning every point."""
+
+    def __init__(self, cell_degrees: float = 0.5) -> None:
+        self.cell_degrees = cell_degrees
+        self._lon_cells = math.ceil(360 / cell_degrees)
+        self._cells: dict[tuple[int, int], set[Hashable]] = defaultdict(set)
+        self._points: dict[Hashable, tuple[float, float, tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, point_id: Hashable) -> bool:
+        return point_id in self._points
+
+    def upsert(self, point_id: Hashable, lat: float, lon: float) -> None:
+        self.remove(point_id)
+        cell = self._cell(lat, lon)
+        self._cells[cell].add(point_id)
+        self._points[point_id] = (lat, lon, cell)
+
+    def remove(self, point_id: Hashable) -> None:
+        point = self._points.pop(point_id, None)
+        if point is None:
+            return
+        cell = point[2]
+        self._cells[cell].discard(point_id)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    def within(self, lat: float, lon: float, distance_km: float) -> list[Hashable]:
+        lat_span = distance_km / KM_PER_DEGREE_LAT
+        lat_min, lat_max = max(-90.0, lat - lat_span), min(90.0, lat + lat_span)
+
+        # Widest longitude span is at the latitude edge closest to a pole
+        cos_edge = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+        lon_span = 180.0 if cos_edge < 1e-6 else min(180.0, distance_km / (KM_PER_DEGREE_LAT * cos_edge))
+
+        row_min = math.floor((lat_min + 90) / self.cell_degrees)
+        row_max = math.floor((lat_max + 90) / self.cell_degrees)
+        col_min = math.floor((lon - lon_span + 180) / self.cell_degrees)
+        col_max = math.floor((lon + lon_span + 180) / self.cell_degrees)
+        col_count = min(self._lon_cells, col_max - col_min + 1)
+
+        matches = []
+        for row in range(row_min, row_max + 1):
+            for offset in range(col_count):
+                # Columns wrap around the antimeridian
+                for point_id in self._cells.get((row, (col_min + offset) % self._lon_cells), ()):
+                    point_lat, point_lon, _ = self._points[point_id]
+                    if haversine_km(lat, lon, point_lat, point_lon) <= distance_km:
+                        matches.append(point_id)
+        return matches
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        row = math.floor((lat + 90) / self.cell_degrees)
+        col = math.floor((lon + 180) / self.cell_degrees) % self._lon_cells
+        return row, col
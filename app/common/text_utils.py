@@ -85,6 +85,11 @@ def sanitize_name(input_str: str) -> str:
     return hyphenated_str.strip("-")
 
 
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so the value is matched literally (default `\\` escape character)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def split_street(street: str) -> tuple[str, str | None]:
     """
     Splits a street string into (street_name, street_number).
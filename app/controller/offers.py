@@ -2,15 +2,23 @@ from datetime import UTC, datetime, timedelta
 from typing import Annotated, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from starlette.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.status import HTTP_201_CREATED, HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED
 
 from app.core.dependencies import get_offer_service
+from app.core.http_cache import CachePolicy, cache_headers, conditional_json, etag_matches, listing_etag, not_modified
+from app.core.responses import MSGPACK, accepts_gzip, negotiate, negotiated_response, type_adapter, variant_etag
 from app.database.models.enums import OfferStatus
 from app.repositories.filters.offer_filters import OfferFilters
 from app.schemas.domain.ai import ParseResponse
 from app.schemas.domain.common import Coordinates
 from app.schemas.domain.offer import (
+    DuplicateOfferIndexResponse,
+    MapClusterResponse,
+    MapClustersResponse,
+    MapPointResponse,
     OfferAdd,
     OfferEmail,
     OfferIndexResponse,
@@ -20,26 +28,74 @@ from app.schemas.domain.offer import (
     OffersPaginated,
     OfferUpdate,
     RawOfferIndexResponse,
+    RawOffersImported,
     RawOffersPaginated,
     SimilarOfferIndexResponse,
 )
 from app.schemas.domain.place import LegalRoleIndexResponse
 from app.services.offer_service import OfferService
+from app.services.offers.offer_export import EXPORT_MEDIA_TYPES, ExportFormat
 
 offer_router = APIRouter()
 
 offerServiceDependency = Annotated[OfferService, Depends(get_offer_service)]
 
 
-@offer_router.get("/legal_roles")
-async def get_legal_roles(offer_service: offerServiceDependency) -> list[LegalRoleIndexResponse]:
-    return await offer_service.get_legal_roles()
+# Listings always revalidate: checking their validator is one index lookup, building them is not.
+# They are served as JSON or, on request, msgpack (see `app.core.responses`).
+LISTING_CACHE = CachePolicy(vary="Accept")
+RAW_LISTING_CACHE = CachePolicy(private=True, vary="Accept")
+RAW_OFFER_CACHE = CachePolicy(private=True)
+OFFER_DETAIL_CACHE = CachePolicy(max_age=60, stale_while_revalidate=300)
+REFERENCE_DATA_CACHE = CachePolicy(max_age=3600)
 
+NEGOTIATED_RESPONSES = {200: {"content": {MSGPACK: {}}}}
+
+# Keeps one import within a single INSERT statement's parameter limit
+RAW_OFFER_BATCH_MAX_SIZE = 1000
+
+FieldsQuery = Annotated[
+    str | None, Query(max_length=512, description="Comma separated fields of each item to return (uuid is always included)")
+]
+
+
+def _sparse_fields(fields: str | None, item_type: type[BaseModel]) -> list[str] | None:
+    if fields is None:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in item_type.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(["uuid", *requested]))
+
+
+def _paginated_response(page: BaseModel, fields: list[str] | None, media_type: str, headers: dict[str, str]) -> Response:
+    """A paginated response, with only `fields` of each item in `data` when a sparse fieldset was requested."""
+    include = dict.fromkeys(type(page).model_fields, True) | {"data": {"__all__": set(fields)}} if fields else None
+    return negotiated_response(type(page), page, media_type, headers, include)
+
+
+@offer_router.get("/legal_roles", response_model=list[LegalRoleIndexResponse])
+async def get_legal_roles(
+    offer_service: offerServiceDependency, if_none_match: Annotated[str | None, Header()] = None
+) -> Response:
+    return conditional_json(await offer_service.get_legal_roles_response(), REFERENCE_DATA_CACHE, if_none_match)
+
+
+@offer_router.get("/count", responses=NEGOTIATED_RESPONSES)
+async def offers_count(
+    offer_service: offerServiceDependency,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> OffersCount:
+    media_type = negotiate(accept)
+    etag = variant_etag(listing_etag("offers_count", await offer_service.get_offers_version()), media_type)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, LISTING_CACHE)
 
-@offer_router.get("/count")
-async def offers_count(offer_service: offerServiceDependency) -> OffersCount:
     count = await offer_service.offers_count()
-    return OffersCount(count=count)
+    return negotiated_response(OffersCount, OffersCount(count=count), media_type, cache_headers(etag, LISTING_CACHE))
 
 
 @offer_router.post("", status_code=HTTP_201_CREATED)
@@ -54,19 +110,24 @@ async def update_offer(offer_service: offerServiceDependency, offer_uuid: UUID,
     return await offer_service.update_offers(offer_uuid, offer_update)
 
 
-@offer_router.get("")
+@offer_router.get("", responses=NEGOTIATED_RESPONSES)
 async def list_offers(
     offer_service: offerServiceDependency,
     search: Annotated[str | None, Query(max_length=50)] = None,
     limit: int = 10,
     offset: int = 0,
-    field: Literal["valid_to", "created_at"] = "valid_to",
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
+    field: Literal["valid_to", "created_at", "relevance"] = "valid_to",
     order: Literal["asc", "desc"] = "asc",
     lat: Annotated[float | None, Query(ge=-90, le=90)] = None,
     lon: Annotated[float | None, Query(ge=-180, le=180)] = None,
     distance_km: Annotated[float | None, Query(gt=0, le=1000)] = None,
     legal_role_uuids: Annotated[list[UUID] | None, Query()] = None,
     invoice: Annotated[bool | None, Query()] = None,
+    include_count: bool = True,
+    fields: FieldsQuery = None,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> OffersPaginated:
     if (lat is not None or lon is not None or distance_km is not None) and not (
         lat is not None and lon is not None and distance_km is not None
@@ -75,6 +136,12 @@ async def list_offers(
             status_code=400, detail="lat, lon, and distance_km must all be provided together for location filtering"
         )
 
+    sparse_fields = _sparse_fields(fields, OfferIndexResponse)
+    media_type = negotiate(accept)
+    etag = variant_etag(listing_etag("offers", await offer_service.get_visible_offers_version()), media_type)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, LISTING_CACHE)
+
     coordinates = Coordinates(lat=lat, lon=lon) if lat is not None and lon is not None else None
 
     filters = OfferFilters(
@@ -89,44 +156,154 @@ async def list_offers(
         invoice=invoice,
         status=OfferStatus.ACTIVE,
         valid_to=datetime.now(UTC) - timedelta(hours=12),
+        cursor=cursor,
     )
 
-    db_offers, count = await offer_service.list_offers(offset, limit, field, order, filters)
+    page = await offer_service.list_offers(
+        offset, limit, field, order, filters, "exact" if include_count else "none", sparse_fields
+    )
 
-    return OffersPaginated(data=db_offers, count=count, offset=offset, limit=limit)
+    paginated = OffersPaginated(data=page.items, count=page.count, offset=offset, limit=limit, next_cursor=page.next_cursor)
+    return _paginated_response(paginated, sparse_fields, media_type, cache_headers(etag, LISTING_CACHE))
 
 
-@offer_router.get("/raw")
+@offer_router.get("/raw", responses=NEGOTIATED_RESPONSES)
 async def list_raw_offers(
     offer_service: offerServiceDependency,
     search: Annotated[str | None, Query(max_length=50)] = None,
     limit: int = 10,
     offset: int = 0,
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
     status: Annotated[OfferStatus | None, Query()] = None,
-    field: Literal["name", "created_at"] = "created_at",
+    field: Literal["name", "created_at", "relevance"] = "created_at",
     order: Literal["asc", "desc"] = "desc",
+    include_count: bool = True,
+    count_mode: Literal["exact", "estimate"] = "exact",
+    fields: FieldsQuery = None,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> RawOffersPaginated:
+    sparse_fields = _sparse_fields(fields, RawOfferIndexResponse)
+    media_type = negotiate(accept)
+    etag = variant_etag(listing_etag("raw_offers", await offer_service.get_offers_version()), media_type)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, RAW_LISTING_CACHE)
+
     filters = OfferFilters(
-        search=search, limit=limit, offset=offset, sort_column=field, sort_order=order, status=status
+        search=search, limit=limit, offset=offset, sort_column=field, sort_order=order, status=status, cursor=cursor
     )
 
-    db_offers, count = await offer_service.list_raw_offers(offset, limit, field, order, filters)
+    page = await offer_service.list_raw_offers(
+        offset, limit, field, order, filters, count_mode if include_count else "none", sparse_fields
+    )
+
+    paginated = RawOffersPaginated(
+        data=page.items,
+        count=page.count,
+        offset=offset,
+        limit=limit,
+        next_cursor=page.next_cursor,
+        count_is_estimate=page.count_is_estimate,
+    )
+    return _paginated_response(paginated, sparse_fields, media_type, cache_headers(etag, RAW_LISTING_CACHE))
 
-    return RawOffersPaginated(data=db_offers, count=count, offset=offset, limit=limit)
 
+@offer_router.get("/map", responses=NEGOTIATED_RESPONSES)
+async def list_map_offers(
+    offer_service: offerServiceDependency,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> list[OfferMapResponse]:
+    media_type = negotiate(accept)
+    etag = variant_etag(listing_etag("offers_map", await offer_service.get_visible_offers_version()), media_type)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, LISTING_CACHE)
 
-@offer_router.get("/map")
-async def list_map_offers(offer_service: offerServiceDependency) -> list[OfferMapResponse]:
     filters = OfferFilters(limit=100, offset=0, status=OfferStatus.ACTIVE, valid_to=datetime.now(UTC) - timedelta(hours=12))
 
-    db_offers, count = await offer_service.list_map_offers(0, 100, "created_at", "desc", filters)
+    page = await offer_service.list_map_offers(0, 100, "created_at", "desc", filters)
 
-    return db_offers
+    items = type_adapter(list[OfferMapResponse]).validate_python(page.items, from_attributes=True)
+    return negotiated_response(list[OfferMapResponse], items, media_type, cache_headers(etag, LISTING_CACHE))
+
+
+@offer_router.get("/map/geojson", response_class=Response, responses={200: {"content": {"application/geo+json": {}}}})
+async def get_map_geojson(
+    offer_service: offerServiceDependency,
+    accept_encoding: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """GeoJSON FeatureCollection of all active offers, served from the in-memory snapshot."""
+    payload = await offer_service.get_map_payload()
 
+    use_gzip = accepts_gzip(accept_encoding)
+    # The gzip variant is a different representation, so it gets its own strong validator
+    etag = f'{payload.etag[:-1]}-gzip"' if use_gzip else payload.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
 
-@offer_router.get("/{offer_uuid}")
-async def get_offer_by_id(offer_service: offerServiceDependency, offer_uuid: UUID) -> OfferIndexResponse:
-    return await offer_service.get_offer_by_id(offer_uuid)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload.gzip_body, media_type="application/geo+json", headers=headers)
+    return Response(content=payload.body, media_type="application/geo+json", headers=headers)
+
+
+@offer_router.get("/map/clusters")
+async def get_map_clusters(
+    offer_service: offerServiceDependency,
+    bbox: Annotated[str, Query(description="min_lon,min_lat,max_lon,max_lat")],
+    zoom: Annotated[int, Query(ge=0, le=22)],
+) -> MapClustersResponse:
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400, detail="bbox must be four comma-separated numbers: min_lon,min_lat,max_lon,max_lat"
+        ) from e
+
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise HTTPException(status_code=400, detail="bbox is out of range")
+
+    nodes = await offer_service.get_map_clusters(min_lon, min_lat, max_lon, max_lat, zoom)
+
+    clusters, offers = [], []
+    for node in nodes:
+        if node.item is None:
+            clusters.append(MapClusterResponse(lat=node.lat, lon=node.lon, count=node.count, expansion_zoom=node.expansion_zoom))
+        else:
+            offers.append(MapPointResponse(lat=node.item.lat, lon=node.item.lon, **node.item.properties))
+
+    return MapClustersResponse(zoom=zoom, clusters=clusters, offers=offers)
+
+
+@offer_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_offers(
+    offer_service: offerServiceDependency,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    status: Annotated[OfferStatus | None, Query()] = None,
+    since: Annotated[datetime | None, Query(description="Only offers updated at or after this time")] = None,
+) -> StreamingResponse:
+    """Stream every matching offer, raw data included, in id order."""
+    filters = OfferFilters(status=status, updated_since=since)
+    return StreamingResponse(
+        offer_service.export_offers(export_format, filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="offers.{export_format}"', "Cache-Control": "no-store"},
+    )
+
+
+@offer_router.get("/{offer_uuid}", response_model=OfferIndexResponse)
+async def get_offer_by_id(
+    offer_service: offerServiceDependency, offer_uuid: UUID, if_none_match: Annotated[str | None, Header()] = None
+) -> Response:
+    representation = await offer_service.get_offer_response(offer_uuid, if_none_match)
+    return conditional_json(representation, OFFER_DETAIL_CACHE, if_none_match)
 
 
 @offer_router.get("/{offer_uuid}/email")
@@ -141,16 +318,35 @@ async def get_similar_offers_by_user(offer_service: offerServiceDependency, offe
     return await offer_service.get_similar_offers(offer_uuid)
 
 
-@offer_router.post("/raw", status_code=HTTP_201_CREATED)
-async def create_raw_offer(offer_service: offerServiceDependency, offer_add: OfferRawAdd) -> None:
-    await offer_service.create_raw_offer(offer_add)
+@offer_router.get("/{offer_uuid}/duplicates")
+async def get_duplicate_offers(offer_service: offerServiceDependency, offer_uuid: UUID) -> list[DuplicateOfferIndexResponse]:
+    return await offer_service.get_duplicate_offers(offer_uuid)
+
+
+@offer_router.post(
+    "/raw", status_code=HTTP_201_CREATED, responses={HTTP_202_ACCEPTED: {"description": "Queued for the job worker"}}
+)
+async def create_raw_offer(offer_service: offerServiceDependency, offer_add: OfferRawAdd, response: Response) -> None:
+    if await offer_service.submit_raw_offer(offer_add):
+        response.status_code = HTTP_202_ACCEPTED
 
     return None
 
 
-@offer_router.get("/raw/{offer_uuid}")
-async def get_raw_offer(offer_service: offerServiceDependency, offer_uuid: UUID) -> RawOfferIndexResponse:
-    return await offer_service.get_offer_by_id(offer_uuid)
+@offer_router.post("/raw/batch")
+async def create_raw_offers(
+    offer_service: offerServiceDependency,
+    offers: Annotated[list[OfferRawAdd], Body(min_length=1, max_length=RAW_OFFER_BATCH_MAX_SIZE)],
+) -> RawOffersImported:
+    return await offer_service.create_raw_offers(offers)
+
+
+@offer_router.get("/raw/{offer_uuid}", response_model=RawOfferIndexResponse)
+async def get_raw_offer(
+    offer_service: offerServiceDependency, offer_uuid: UUID, if_none_match: Annotated[str | None, Header()] = None
+) -> Response:
+    representation = await offer_service.get_raw_offer_response(offer_uuid, if_none_match)
+    return conditional_json(representation, RAW_OFFER_CACHE, if_none_match)
 
 
 @offer_router.get("/raw/{offer_uuid}/parse")
@@ -2,18 +2,28 @@ from collections.abc import Sequence
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 
 from app.core.dependencies import get_place_service
+from app.core.http_cache import CachePolicy, cache_headers, content_etag, etag_matches, not_modified, weak_etag
 from app.database.models.models import City, Place
 from app.schemas.domain.place import CityAdd, CityIndexResponse, PlaceAdd, PlaceIndexResponse
 from app.services.place_service import PlaceService
+from app.services.places.gazetteer import CityEntry, PlaceEntry
 
 place_router = APIRouter()
 
 # CurrentUser = Annotated[User, Depends(check_token)]
 placeServiceDependency = Annotated[PlaceService, Depends(get_place_service)]
 
+# Places and cities are never edited once created; only searches can gain new rows
+PLACE_CACHE = CachePolicy(max_age=86400)
+PLACE_SEARCH_CACHE = CachePolicy(max_age=300)
+
+
+def _search_etag(results: Sequence[Place | City | PlaceEntry | CityEntry]) -> str:
+    return content_etag("\x1f".join(str(result.uuid) for result in results).encode())
+
 
 @place_router.post("/")
 async def create_place(place_service: placeServiceDependency, place_add: PlaceAdd):
@@ -32,22 +42,63 @@ async def create_city(place_service: placeServiceDependency, city: CityAdd):
 @place_router.get("/facility/{place_name}", response_model=list[PlaceIndexResponse])
 async def get_facilities(
     place_service: placeServiceDependency,
+    response: Response,
     place_name: str,
     place_type: str | None = None,
-) -> Sequence[Place]:
-    return await place_service.get_facilities(place_name, place_type)
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Sequence[Place | PlaceEntry] | Response:
+    places = await place_service.get_facilities(place_name, place_type)
+
+    etag = _search_etag(places)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PLACE_SEARCH_CACHE)
+    response.headers.update(cache_headers(etag, PLACE_SEARCH_CACHE))
+    return places
 
 
 @place_router.get("/facility/uuid/{place_uuid}", response_model=PlaceIndexResponse)
-async def get_facility(place_service: placeServiceDependency, place_uuid: UUID) -> Place:
-    return await place_service.get_place_by_uuid(place_uuid)
+async def get_facility(
+    place_service: placeServiceDependency,
+    response: Response,
+    place_uuid: UUID,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Place | Response:
+    place = await place_service.get_place_by_uuid(place_uuid)
+
+    etag = weak_etag("place", place.uuid.hex)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PLACE_CACHE)
+    response.headers.update(cache_headers(etag, PLACE_CACHE))
+    return place
 
 
 @place_router.get("/city/uuid/{city_uuid}", response_model=CityIndexResponse)
-async def get_city(place_service: placeServiceDependency, city_uuid: UUID) -> City:
-    return await place_service.get_city_by_uuid(city_uuid)
+async def get_city(
+    place_service: placeServiceDependency,
+    response: Response,
+    city_uuid: UUID,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> City | Response:
+    city = await place_service.get_city_by_uuid(city_uuid)
+
+    etag = weak_etag("city", city.uuid.hex)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PLACE_CACHE)
+    response.headers.update(cache_headers(etag, PLACE_CACHE))
+    return city
 
 
 @place_router.get("/city/{city_name}", response_model=list[CityIndexResponse])
-async def get_cities(place_service: placeServiceDependency, city_name: str) -> Sequence[City]:
-    return await place_service.get_cities(city_name)
+async def get_cities(
+    place_service: placeServiceDependency,
+    response: Response,
+    city_name: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Sequence[City | CityEntry] | Response:
+    cities = await place_service.get_cities(city_name)
+
+    etag = _search_etag(cities)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PLACE_SEARCH_CACHE)
+    response.headers.update(cache_headers(etag, PLACE_SEARCH_CACHE))
+    return cities
@@ -39,6 +39,39 @@ class Settings(BaseSettings):
             )
         return None
 
+    GAZETTEER_INDEX_ENABLED: bool = True
+    GAZETTEER_REFRESH_SECONDS: int = 300
+    OFFER_COUNT_CACHE_TTL_SECONDS: int = 30
+    ACTIVE_OFFER_INDEX_ENABLED: bool = True
+    ACTIVE_OFFER_INDEX_REFRESH_SECONDS: int = 300
+    ACTIVE_OFFER_INDEX_MAX_CANDIDATES: int = 5000
+    MAP_SNAPSHOT_REFRESH_SECONDS: int = 300
+    OFFER_READ_CACHE_TTL_SECONDS: int = 60
+    OFFER_READ_CACHE_MAX_ENTRIES: int = 2048
+    VISIBLE_OFFERS_VIEW_ENABLED: bool = True
+    VISIBLE_OFFERS_REFRESH_SECONDS: int = 60
+    # Moderation writes mark the view stale; it is rebuilt at most once per this interval
+    VISIBLE_OFFERS_REFRESH_DEBOUNCE_SECONDS: float = 2.0
+    # `POST /offers/raw` enqueues the import for `app.cli.job_worker` and answers 202 instead of importing inline
+    RAW_OFFER_QUEUE_ENABLED: bool = False
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BACKOFF_SECONDS: int = 10
+    JOB_RETRY_BACKOFF_MAX_SECONDS: int = 3600
+    JOB_LOCK_TIMEOUT_SECONDS: int = 600
+    # The job worker parses NEW raw offers ahead of moderation, at most OFFER_PARSE_CONCURRENCY at once per process
+    OFFER_PARSE_PIPELINE_ENABLED: bool = True
+    OFFER_PARSE_CONCURRENCY: int = 2
+    OFFER_PARSE_SWEEP_SECONDS: int = 30
+    OFFER_PARSE_SWEEP_LIMIT: int = 100
+    # The job worker fingerprints imported offers (MinHash) outside the import request
+    MINHASH_SWEEP_SECONDS: int = 10
+    MINHASH_SWEEP_LIMIT: int = 500
+    AI_PARSE_CACHE_ENABLED: bool = True
+    AI_PARSE_CACHE_TTL_SECONDS: int = 86400
+    AI_PARSE_CACHE_MAX_ENTRIES: int = 4096
+
     API_KEY_OPENAI: str | None = os.getenv("API_KEY_OPENAI")
     API_KEY_MAILERSEND: str | None = os.getenv("API_KEY_MAILERSEND")
     APP_SECRET_KEY: str = os.getenv("APP_SECRET_KEY", "change-me-in-production-for-security")
@@ -4,19 +4,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
 from app.core.database import get_db
 from app.infrastructure.ai.parsers.base import AIParser
+from app.infrastructure.ai.parsers.caching_parser import CachingAIParser
 from app.infrastructure.ai.parsers.factory import get_ai_parser
+from app.infrastructure.cache.factory import get_ai_parse_cache, get_offer_count_cache
 from app.infrastructure.notifications.email.email_notifier_base import EmailNotifierBase
 from app.infrastructure.notifications.email.factory import get_email_notifier
 from app.infrastructure.notifications.slack.factory import get_slack_notifier
 from app.infrastructure.notifications.slack.slack_notifier_base import SlackNotifierBase
+from app.repositories.ai_parse_cache_repo import AIParseCacheRepo
 from app.repositories.city_repo import CityRepo
+from app.repositories.job_repo import JobRepo
 from app.repositories.legal_role_repo import LegalRoleRepo
 from app.repositories.offer_repo import OfferRepo
 from app.repositories.place_repo import PlaceRepo
+from app.repositories.visible_offer_repo import VisibleOfferRepo
 from app.services.email_validation_service import EmailValidationService
 from app.services.offer_service import OfferService
+from app.services.offers.active_offer_index import get_active_offer_index
+from app.services.offers.map_snapshot import get_map_snapshot
 from app.services.offers.offer_notification_service import OfferNotificationService
+from app.services.offers.offer_read_cache import get_offer_read_cache
+from app.services.offers.visible_offers_refresher import get_visible_offers_refresher
 from app.services.place_service import PlaceService
+from app.services.places.gazetteer import get_gazetteer_index
 
 
 def get_city_repo(session: AsyncSession = Depends(get_db)) -> CityRepo:
@@ -31,10 +41,35 @@ def get_offer_repo(session: AsyncSession = Depends(get_db)) -> OfferRepo:
     return OfferRepo(session)
 
 
+def get_visible_offer_repo(session: AsyncSession = Depends(get_db)) -> VisibleOfferRepo | None:
+    return VisibleOfferRepo(session) if get_settings().VISIBLE_OFFERS_VIEW_ENABLED else None
+
+
 def get_legal_role_repo(session: AsyncSession = Depends(get_db)) -> LegalRoleRepo:
     return LegalRoleRepo(session)
 
 
+def get_job_repo(session: AsyncSession = Depends(get_db)) -> JobRepo | None:
+    return JobRepo(session) if get_settings().RAW_OFFER_QUEUE_ENABLED else None
+
+
+def get_cached_ai_parser(
+        parser: AIParser = Depends(get_ai_parser),
+        session: AsyncSession = Depends(get_db),
+) -> AIParser:
+    settings = get_settings()
+    if not settings.AI_PARSE_CACHE_ENABLED:
+        return parser
+    return CachingAIParser(
+        parser,
+        AIParseCacheRepo(session),
+        get_ai_parse_cache(),
+        settings.OPENAI_MODEL,
+        settings.SYSTEM_PROMPT,
+        parser.batch_system_prompt,
+    )
+
+
 def get_email_validator() -> EmailValidationService:
     return EmailValidationService(settings=get_settings())
 
@@ -43,7 +78,8 @@ def get_place_service(
         city_repo: CityRepo = Depends(get_city_repo),
         place_repo: PlaceRepo = Depends(get_place_repo),
 ) -> PlaceService:
-    return PlaceService(city_repo=city_repo, place_repo=place_repo)
+    gazetteer = get_gazetteer_index() if get_settings().GAZETTEER_INDEX_ENABLED else None
+    return PlaceService(city_repo=city_repo, place_repo=place_repo, gazetteer=gazetteer)
 
 
 def get_offer_notification_service(
@@ -61,9 +97,11 @@ def get_offer_service(
         place_repo: PlaceRepo = Depends(get_place_repo),
         city_repo: CityRepo = Depends(get_city_repo),
         legal_role_repo: LegalRoleRepo = Depends(get_legal_role_repo),
-        ai_parser: AIParser = Depends(get_ai_parser),
+        ai_parser: AIParser = Depends(get_cached_ai_parser),
         email_validator: EmailValidationService = Depends(get_email_validator),
         notification_service: OfferNotificationService = Depends(get_offer_notification_service),
+        visible_offer_repo: VisibleOfferRepo | None = Depends(get_visible_offer_repo),
+        job_repo: JobRepo | None = Depends(get_job_repo),
 ) -> OfferService:
     return OfferService(
         offer_repo=offer_repo,
@@ -73,4 +111,11 @@ def get_offer_service(
         ai_parser=ai_parser,
         email_validator=email_validator,
         notification_service=notification_service,
+        count_cache=get_offer_count_cache(),
+        active_offer_index=get_active_offer_index() if get_settings().ACTIVE_OFFER_INDEX_ENABLED else None,
+        map_snapshot=get_map_snapshot(),
+        read_cache=get_offer_read_cache(),
+        visible_offer_repo=visible_offer_repo,
+        visible_offers_refresher=get_visible_offers_refresher(),
+        job_repo=job_repo,
     )
@@ -11,3 +11,13 @@ class NotFoundError(Exception):
 
 class ConflictError(Exception):
     pass
+
+
+class BadRequestError(Exception):
+    """Raised when a request is well-formed but carries an unusable value (e.g. a stale cursor)"""
+    pass
+
+
+class AIParseError(Exception):
+    """Raised when the AI parser returned no result (rate limit, outage, unusable output), so the parse can be retried"""
+    pass
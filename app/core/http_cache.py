@@ -0,0 +1,88 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.utils.timestamp_utils import as_utc
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """
+    `Cache-Control` of a route: `max_age=0` means clients may store the response but must revalidate it.
+    `vary` lists the request headers the representation depends on.
+    """
+
+    max_age: int = 0
+    private: bool = False
+    stale_while_revalidate: int = 0
+    vary: str | None = None
+
+    @property
+    def header(self) -> str:
+        directives = ["private" if self.private else "public"]
+        directives.append(f"max-age={self.max_age}" if self.max_age else "no-cache")
+        if self.stale_while_revalidate:
+            directives.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(directives)
+
+
+@dataclass(frozen=True, slots=True)
+class Representation:
+    etag: str
+    # None when the client's validator matched and the response was never serialized
+    body: bytes | None = None
+
+
+def etag_matches(if_none_match: str | None, *etags: str) -> bool:
+    """`If-None-Match` check with weak comparison (RFC 9110 13.1.2): `W/` prefixes are ignored, `*` matches anything."""
+    if not if_none_match:
+        return False
+
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    return any(etag.removeprefix("W/") in candidates for etag in etags)
+
+
+def weak_etag(*parts: object) -> str:
+    return f'W/"{"-".join(str(part) for part in parts)}"'
+
+
+def version_token(value: datetime | None) -> str:
+    """Compact, stable token of a modification timestamp (microseconds since the epoch)."""
+    return "0" if value is None else format(int(as_utc(value).timestamp() * 1_000_000), "x")
+
+
+def listing_etag(kind: str, version: datetime | None, bucket_seconds: int = 60) -> str:
+    """
+    Validator of a collection: its latest modification plus the current time bucket. The bucket covers rows
+    leaving a listing as they expire, and commits landing out of order (`now()` is the transaction start time).
+    """
+    return weak_etag(kind, version_token(version), int(time.time() // bucket_seconds))
+
+
+def content_etag(content: bytes) -> str:
+    return weak_etag(hashlib.sha256(content).hexdigest()[:32])
+
+
+def cache_headers(etag: str, policy: CachePolicy) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": policy.header}
+    if policy.vary:
+        headers["Vary"] = policy.vary
+    return headers
+
+
+def not_modified(etag: str, policy: CachePolicy) -> Response:
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, policy))
+
+
+def conditional_json(representation: Representation, policy: CachePolicy, if_none_match: str | None) -> Response:
+    if representation.body is None or etag_matches(if_none_match, representation.etag):
+        return not_modified(representation.etag, policy)
+    return Response(
+        content=representation.body, media_type="application/json", headers=cache_headers(representation.etag, policy)
+    )
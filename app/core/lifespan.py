@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.infrastructure.cache.factory import get_offer_count_cache
+from app.repositories.city_repo import CityRepo
+from app.repositories.offer_repo import OfferRepo
+from app.repositories.place_repo import PlaceRepo
+from app.repositories.visible_offer_repo import VisibleOfferRepo
+from app.services.offers.active_offer_index import get_active_offer_index
+from app.services.offers.map_snapshot import get_map_snapshot
+from app.services.offers.visible_offers_refresher import get_visible_offers_refresher
+from app.services.places.gazetteer import get_gazetteer_index
+
+
+async def refresh_gazetteer() -> None:
+    async for session in get_db():
+        await get_gazetteer_index().load(CityRepo(session), PlaceRepo(session))
+
+
+async def refresh_active_offer_index() -> None:
+    async for session in get_db():
+        await get_active_offer_index().load(OfferRepo(session))
+
+
+async def refresh_map_snapshot() -> None:
+    async for session in get_db():
+        await get_map_snapshot().load(OfferRepo(session))
+
+
+async def refresh_visible_offers() -> None:
+    async for session in get_db():
+        await VisibleOfferRepo(session).refresh()
+
+
+async def refresh_stale_visible_offers() -> None:
+    async for session in get_db():
+        if await get_visible_offers_refresher().refresh_if_stale(VisibleOfferRepo(session)):
+            # Totals may have been counted from the view before it caught up
+            get_offer_count_cache().clear()
+
+
+async def run_periodically(job: Callable[[], Awaitable[None]], interval_seconds: float) -> None:
+    """Run `job` now and then every `interval_seconds`; failures are logged and retried on the next tick."""
+    while True:
+        try:
+            await job()
+        except Exception:
+            logger.exception(f"Background job `{job.__name__}` failed")
+        await asyncio.sleep(interval_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    settings = get_settings()
+    tasks: list[asyncio.Task[None]] = []
+
+    if settings.DB_POSTGRES_URL and settings.GAZETTEER_INDEX_ENABLED:
+        tasks.append(asyncio.create_task(run_periodically(refresh_gazetteer, settings.GAZETTEER_REFRESH_SECONDS)))
+
+    if settings.DB_POSTGRES_URL and settings.ACTIVE_OFFER_INDEX_ENABLED:
+        tasks.append(asyncio.create_task(
+            run_periodically(refresh_active_offer_index, settings.ACTIVE_OFFER_INDEX_REFRESH_SECONDS)
+        ))
+
+    if settings.DB_POSTGRES_URL:
+        # Catches writes made by other processes; local writes patch the snapshot immediately
+        tasks.append(asyncio.create_task(run_periodically(refresh_map_snapshot, settings.MAP_SNAPSHOT_REFRESH_SECONDS)))
+
+    if settings.DB_POSTGRES_URL and settings.VISIBLE_OFFERS_VIEW_ENABLED:
+        # Drops expired rows and picks up writes made outside the API
+        tasks.append(asyncio.create_task(
+            run_periodically(refresh_visible_offers, settings.VISIBLE_OFFERS_REFRESH_SECONDS)
+        ))
+        # Rebuilds the view after API writes, once per tick
+        tasks.append(asyncio.create_task(
+            run_periodically(refresh_stale_visible_offers, settings.VISIBLE_OFFERS_REFRESH_DEBOUNCE_SECONDS)
+        ))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,10 +2,15 @@ from collections.abc import Sequence
 from typing import Any, Protocol
 from uuid import UUID
 
+from sqlalchemy import Row
+
 from app.database.models.models import City, Place
 
 
 class CityRepoProtocol(Protocol):
+    async def get_all(self) -> Sequence[City]: ...
+    async def get_version(self) -> tuple[int, int | None]: ...
+    async def get_gazetteer_rows(self) -> Sequence[Row]: ...
     async def get_by_uuid(self, uuid: UUID) -> City: ...
     async def find_by_teryt(self, teryt: str) -> City | None: ...
     async def get_by_partial_name(self, name: str) -> Sequence[City]: ...
@@ -13,6 +18,9 @@ class CityRepoProtocol(Protocol):
 
 
 class PlaceRepoProtocol(Protocol):
+    async def get_all(self) -> Sequence[Place]: ...
+    async def get_version(self) -> tuple[int, int | None]: ...
+    async def get_gazetteer_rows(self) -> Sequence[Row]: ...
     async def get_by_uuid(self, uuid: UUID) -> Place: ...
     async def get_by_name_and_distance(
         self,
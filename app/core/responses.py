@@ -0,0 +1,69 @@
+from functools import lru_cache
+from typing import Any
+
+import msgpack
+from fastapi import Response
+from pydantic import TypeAdapter
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+_MSGPACK_MEDIA_TYPES = {MSGPACK, "application/x-msgpack"}
+
+
+@lru_cache
+def type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def negotiate(accept: str | None) -> str:
+    """
+    Media type of the response: msgpack only when the client lists it explicitly with a non-zero q-value,
+    JSON otherwise (`*/*` included).
+    """
+    for media_range in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        if media_type.lower() in _MSGPACK_MEDIA_TYPES and _quality(params) > 0:
+            return MSGPACK
+    return JSON
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Whether `Accept-Encoding` allows gzip: listed, or covered by `*`, with a non-zero q-value."""
+    qualities = {}
+    for coding in (accept_encoding or "").split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        if name:
+            qualities[name.lower()] = _quality(params)
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def _quality(params: list[str]) -> float:
+    for param in params:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def variant_etag(etag: str, media_type: str) -> str:
+    """The msgpack variant is a different representation, so it gets its own validator."""
+    return etag if media_type == JSON else f'{etag[:-1]}-msgpack"'
+
+
+def negotiated_response(
+    response_type: Any, value: Any, media_type: str, headers: dict[str, str], include: Any = None
+) -> Response:
+    """
+    Serialize an already validated `value` with Pydantic's core: straight to JSON bytes, or to msgpack from
+    its JSON-compatible form (UUIDs, decimals and datetimes as strings, same as in JSON).
+    """
+    adapter = type_adapter(response_type)
+    if media_type == MSGPACK:
+        content = msgpack.packb(adapter.dump_python(value, mode="json", include=include))
+    else:
+        content = adapter.dump_json(value, include=include)
+    return Response(content=content, media_type=media_type, headers=headers)
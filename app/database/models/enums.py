@@ -41,3 +41,14 @@ class Voivodeship(Enum):
     WARMINSKO_MAZURSKIE = "Warmińsko-Mazurskie"
     WIELKOPOLSKIE = "Wielkopolskie"
     ZACHODNIOPOMORSKIE = "Zachodniopomorskie"
+
+
+class JobKind(Enum):
+    INGEST_RAW_OFFER = "ingest_raw_offer"
+    PARSE_RAW_OFFER = "parse_raw_offer"
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DEAD = "dead"
@@ -1,12 +1,30 @@
 from datetime import datetime
 
 import sqlalchemy as sa
-from sqlalchemy import Boolean, Column, Date, DateTime, Enum, ForeignKey, Numeric, String, Table, Text, Time, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    Numeric,
+    String,
+    Table,
+    Text,
+    Time,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.database.models.enums import OfferStatus, PlaceCategory, SourceType
+from app.database.models.enums import JobKind, JobStatus, OfferStatus, PlaceCategory, SourceType
 
 
 class BaseModel(Base):
@@ -40,7 +58,8 @@ offers_legal_roles_link = Table(
     "offers_legal_roles_link",
     Base.metadata,
     Column("offer_id", ForeignKey("offers.id"), primary_key=True),
-    Column("legal_role_id", ForeignKey("legal_roles.id"), primary_key=True)
+    Column("legal_role_id", ForeignKey("legal_roles.id"), primary_key=True),
+    Index("ix_offers_legal_roles_link_legal_role_id", "legal_role_id", "offer_id"),
 )
 
 
@@ -92,21 +111,30 @@ class City(BaseModel):
 
 class Offer(BaseModel):
     __tablename__ = "offers"
+    __table_args__ = (
+        Index("ix_offers_active_valid_to", "valid_to", "id", postgresql_where=text("status = 'ACTIVE'")),
+        Index("ix_offers_active_created_at", "created_at", "id", postgresql_where=text("status = 'ACTIVE'")),
+        Index("ix_offers_status_created_at", "status", text("created_at DESC"), text("id DESC")),
+        Index("ix_offers_created_at", "created_at", "id"),
+        Index("ix_offers_new_unparsed", "id", postgresql_where=text("status = 'NEW' AND parsed_at IS NULL")),
+        Index("ix_offers_minhash_bands", "minhash_bands", postgresql_using="gin"),
+        Index("ix_offers_minhash_pending", "id", postgresql_where=text("minhash_bands IS NULL")),
+    )
     uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False, unique=True, index=True)
     raw_data: Mapped[str | None] = mapped_column(String(1024))
-    offer_uid: Mapped[str | None] = mapped_column(String(1024), index=True)
+    offer_uid: Mapped[str | None] = mapped_column(String(1024), unique=True, index=True)
     author: Mapped[str] = mapped_column(String(96))
     author_uid: Mapped[str | None] = mapped_column(String(1024))
     source: Mapped[SourceType] = mapped_column(Enum(SourceType))
-    status: Mapped[OfferStatus] = mapped_column(Enum(OfferStatus), default=OfferStatus.NEW, index=True)
+    status: Mapped[OfferStatus] = mapped_column(Enum(OfferStatus), default=OfferStatus.NEW)
 
     place_name: Mapped[str | None] = mapped_column(String(1024))
     city_name: Mapped[str | None] = mapped_column(String(1024))
     lat: Mapped[float | None] = mapped_column(Numeric(10, 7))
     lon: Mapped[float | None] = mapped_column(Numeric(10, 7))
 
-    place_id: Mapped[int | None] = mapped_column(ForeignKey("places.id", ondelete="SET NULL"), nullable=True)
-    city_id: Mapped[int | None] = mapped_column(ForeignKey("cities.id", ondelete="SET NULL"), nullable=True)
+    place_id: Mapped[int | None] = mapped_column(ForeignKey("places.id", ondelete="SET NULL"), nullable=True, index=True)
+    city_id: Mapped[int | None] = mapped_column(ForeignKey("cities.id", ondelete="SET NULL"), nullable=True, index=True)
 
     place: Mapped[Place | None] = relationship(back_populates="offers")
     city: Mapped[City | None] = relationship(back_populates="offers")
@@ -121,11 +149,105 @@ class Offer(BaseModel):
 
     visible: Mapped[bool | None] = mapped_column(Boolean())
     added_at: Mapped[datetime | None] = mapped_column(DateTime())
-    valid_to: Mapped[datetime | None] = mapped_column(DateTime(), index=True)
-    updated_at: Mapped[DateTime | None] = mapped_column(DateTime(), default=func.now(), onupdate=func.now())
-    created_at: Mapped[DateTime | None] = mapped_column(DateTime(), default=func.now(), index=True)
+    valid_to: Mapped[datetime | None] = mapped_column(DateTime())
+    updated_at: Mapped[DateTime | None] = mapped_column(DateTime(), default=func.now(), onupdate=func.now(), index=True)
+    created_at: Mapped[DateTime | None] = mapped_column(DateTime(), default=func.now())
+
+    # Stored `ParseResponse` of the AI parser, filled ahead of moderation by the job worker
+    parse_result: Mapped[dict | None] = mapped_column(JSONB())
+    parsed_at: Mapped[datetime | None] = mapped_column(DateTime())
+
+    # MinHash signature of raw_data (or description) and its LSH band keys, see `app.common.minhash`
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary(), deferred=True)
+    minhash_bands: Mapped[list[int] | None] = mapped_column(ARRAY(BigInteger()), deferred=True)
+
+    # Maintained by the `trg_offers_search_vector` trigger, never written from Python
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR(), deferred=True)
 
     legal_roles: Mapped[list[LegalRole]] = relationship(
         back_populates="offers",
         secondary=offers_legal_roles_link
     )
+
+
+class VisibleOffer(Base):
+    """
+    Read-only mapping of the `visible_offers` materialized view: active, unexpired offers with their place,
+    city and legal roles resolved. Refreshed by `VisibleOfferRepo.refresh`, never written through the ORM.
+    """
+    __tablename__ = "visible_offers"
+
+    id: Mapped[int] = mapped_column(sa.INTEGER(), primary_key=True)
+    uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True))
+    author: Mapped[str] = mapped_column(String(96))
+    status: Mapped[OfferStatus] = mapped_column(Enum(OfferStatus))
+    place_name: Mapped[str | None] = mapped_column(String(1024))
+    city_name: Mapped[str | None] = mapped_column(String(1024))
+    city_uuid: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True))
+    facility_uuid: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True))
+    date: Mapped[Date | None] = mapped_column(Date())
+    hour: Mapped[Time | None] = mapped_column(Time())
+    price: Mapped[float | None] = mapped_column(Numeric(10, 2))
+    description: Mapped[str | None] = mapped_column(Text())
+    invoice: Mapped[bool | None] = mapped_column(Boolean())
+    added_at: Mapped[datetime | None] = mapped_column(DateTime())
+    valid_to: Mapped[datetime | None] = mapped_column(DateTime())
+    created_at: Mapped[DateTime | None] = mapped_column(DateTime())
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR(), deferred=True)
+
+    # Coordinates and display name fall back from the offer to its place, then its city
+    lat: Mapped[float | None] = mapped_column(Numeric(10, 7))
+    lon: Mapped[float | None] = mapped_column(Numeric(10, 7))
+    location_name: Mapped[str | None] = mapped_column(Text())
+    legal_role_uuids: Mapped[list[UUID]] = mapped_column(ARRAY(UUID(as_uuid=True)))
+    # [{"uuid": ..., "name": ...}] ordered by name
+    legal_roles: Mapped[list[dict]] = mapped_column(JSONB())
+
+
+class ViewRefresh(Base):
+    """
+    Time of the latest refresh of each materialized view, committed together with it: the version of the
+    listings served from the view.
+    """
+    __tablename__ = "view_refreshes"
+
+    name: Mapped[str] = mapped_column(Text(), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class Job(BaseModel):
+    """
+    Unit of background work, claimed by `app.cli.job_worker` processes with `FOR UPDATE SKIP LOCKED`.
+    Completed jobs are deleted; jobs out of attempts stay behind as DEAD with their last error.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_queued_run_at", "run_at", "id", postgresql_where=text("status = 'QUEUED'")),
+        Index("ix_jobs_running_locked_at", "locked_at", postgresql_where=text("status = 'RUNNING'")),
+    )
+    # Stored as a plain string, so new kinds don't need a migration
+    kind: Mapped[JobKind] = mapped_column(Enum(JobKind, native_enum=False, length=64))
+    # Jobs derived from a row (e.g. parsing an offer) are enqueued at most once per key
+    dedupe_key: Mapped[str | None] = mapped_column(Text(), unique=True, index=True)
+    payload: Mapped[dict] = mapped_column(JSONB())
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.QUEUED)
+    attempts: Mapped[int] = mapped_column(sa.INTEGER(), default=0)
+    max_attempts: Mapped[int] = mapped_column(sa.INTEGER())
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    locked_by: Mapped[str | None] = mapped_column(Text())
+    last_error: Mapped[str | None] = mapped_column(Text())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class AIParseCache(BaseModel):
+    """Successful AI parses shared by all processes, keyed by normalized text, model and system prompt."""
+    __tablename__ = "ai_parse_cache"
+    __table_args__ = (
+        UniqueConstraint("text_hash", "model", "prompt_hash", name="uq_ai_parse_cache_key"),
+    )
+    text_hash: Mapped[str] = mapped_column(String(64))
+    model: Mapped[str] = mapped_column(Text())
+    prompt_hash: Mapped[str] = mapped_column(String(64))
+    result: Mapped[dict] = mapped_column(JSONB())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
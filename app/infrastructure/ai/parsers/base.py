@@ -6,6 +6,9 @@ from app.schemas.domain.ai import ParseResponse
 class AIParser(Protocol):
     """Protocol for AI parsing services."""
 
+    # System prompt `parse_offers` sends, so cached batch results are not mistaken for single-offer ones
+    batch_system_prompt: str
+
     async def parse_offer(self, raw_data: str) -> ParseResponse:
         """
         Parse raw offer data into structured format.
@@ -17,3 +20,15 @@ class AIParser(Protocol):
             ParseResponse with structured data or error
         """
         ...
+
+    async def parse_offers(self, raw_data: list[str]) -> list[ParseResponse]:
+        """
+        Parse several raw offers, sharing model calls where the implementation supports it.
+
+        Args:
+            raw_data: Raw text contents to parse
+
+        Returns:
+            One ParseResponse per text, in the same order
+        """
+        ...
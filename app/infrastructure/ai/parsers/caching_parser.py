@@ -0,0 +1,107 @@
+import hashlib
+import re
+from functools import lru_cache
+
+from app.common.text_utils import sanitize_and_normalize_text
+from app.infrastructure.ai.parsers.base import AIParser
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.repositories.ai_parse_cache_repo import AIParseCacheRepo
+from app.schemas.domain.ai import ParseResponse
+
+# Zero-width characters Facebook sprinkles into edited and reposted posts
+_INVISIBLE = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+
+
+def text_hash(raw_data: str) -> str:
+    """Hash of the text as the parser would read it: reposts differing only in spacing or quotes share it."""
+    normalized = sanitize_and_normalize_text(_INVISIBLE.sub("", raw_data))
+    return hashlib.sha256(" ".join(normalized.split()).encode()).hexdigest()
+
+
+@lru_cache
+def prompt_hash(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode()).hexdigest()
+
+
+class CachingAIParser:
+    """
+    `AIParser` decorator serving repeated texts from cache: a process-local LRU first, then the shared
+    `ai_parse_cache` table. Only successful parses are stored; the key includes the model and the system
+    prompt, so changing either starts from an empty cache. Batch results are stored under the batch prompt,
+    which single-offer parsing never reads.
+    """
+
+    def __init__(
+        self,
+        parser: AIParser,
+        repo: AIParseCacheRepo,
+        memory: TTLCache[ParseResponse],
+        model: str,
+        system_prompt: str,
+        batch_system_prompt: str,
+    ) -> None:
+        self.parser = parser
+        self.repo = repo
+        self.memory = memory
+        self.model = model
+        self.prompt_hash = prompt_hash(system_prompt)
+        self.batch_prompt_hash = prompt_hash(batch_system_prompt)
+
+    async def parse_offer(self, raw_data: str) -> ParseResponse:
+        key = self._key(raw_data)
+
+        cached = await self._lookup(key)
+        if cached is not None:
+            return cached
+
+        parsed = await self.parser.parse_offer(raw_data)
+        await self._store(key, parsed)
+        return parsed
+
+    async def parse_offers(self, raw_data: list[str]) -> list[ParseResponse]:
+        """
+        Serve texts cached by either prompt directly and send each distinct remaining text to the parser's
+        batch call once.
+        """
+        hashes = [text_hash(text) for text in raw_data]
+        results: dict[str, ParseResponse] = {}
+        misses: dict[str, str] = {}
+
+        for hashed, text in zip(hashes, raw_data, strict=True):
+            if hashed in results or hashed in misses:
+                continue
+            cached = await self._lookup((hashed, self.model, self.prompt_hash))
+            if cached is None:
+                cached = await self._lookup((hashed, self.model, self.batch_prompt_hash))
+            if cached is None:
+                misses[hashed] = text
+            else:
+                results[hashed] = cached
+
+        if misses:
+            parsed = await self.parser.parse_offers(list(misses.values()))
+            for hashed, response in zip(misses, parsed, strict=True):
+                await self._store((hashed, self.model, self.batch_prompt_hash), response)
+                results[hashed] = response
+
+        return [results[hashed] for hashed in hashes]
+
+    def _key(self, raw_data: str) -> tuple[str, str, str]:
+        return text_hash(raw_data), self.model, self.prompt_hash
+
+    async def _lookup(self, key: tuple[str, str, str]) -> ParseResponse | None:
+        cached = self.memory.get(key)
+        if cached is not None:
+            return cached
+
+        stored = await self.repo.get_result(*key)
+        if stored is not None:
+            cached = ParseResponse.model_validate(stored)
+            self.memory.set(key, cached)
+        return cached
+
+    async def _store(self, key: tuple[str, str, str], parsed: ParseResponse) -> None:
+        if parsed.success:
+            cached = parsed.model_copy(update={"usage": None, "cached": True})
+            await self.repo.save_result(*key, cached.model_dump(mode="json"))
+            self.memory.set(key, cached)
@@ -17,6 +17,8 @@ class OpenAIParser:
         self.api_key = api_key or settings.API_KEY_OPENAI
         self.model = settings.OPENAI_MODEL
         self.system_prompt = settings.SYSTEM_PROMPT
+        # parse_offers sends the single-offer prompt once per text
+        self.batch_system_prompt = self.system_prompt
         self.client = AsyncOpenAI(api_key=self.api_key)
 
     async def parse_offer(self, raw_data: str) -> ParseResponse:
@@ -80,3 +82,7 @@ class OpenAIParser:
         except Exception as e:
             logger.error(f"Error in OpenAI parsing: {e}")
             return ParseResponse(success=False, error=str(e), data=None)
+
+    async def parse_offers(self, raw_data: list[str]) -> list[ParseResponse]:
+        """Function calling returns a single offer, so texts are parsed one request at a time."""
+        return [await self.parse_offer(text) for text in raw_data]
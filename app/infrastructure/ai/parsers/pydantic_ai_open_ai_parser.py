@@ -7,10 +7,16 @@ from pydantic_ai.models.openai import OpenAIResponsesModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
 from app.core.config import get_settings
-from app.schemas.domain.ai import ParseResponse, SubstitutionOffer, UsageDetails
+from app.schemas.domain.ai import BatchParseOutput, ParseResponse, SubstitutionOffer, UsageDetails
 
 settings = get_settings()
 
+BATCH_INSTRUCTIONS = """
+    Otrzymasz kilka opisów zastępstw procesowych, każdy poprzedzony nagłówkiem `### <numer>`.
+    Dla każdego opisu zwróć osobny element listy `items`: pole `index` z numerem opisu i pole `offer`
+    z informacjami wyodrębnionymi zgodnie z powyższymi zasadami. Nie łącz ani nie pomijaj opisów.
+    """
+
 
 class PydanticAIOpenAIParser:
     """Parser using the pydantic-ai library with OpenAI backend."""
@@ -19,8 +25,10 @@ class PydanticAIOpenAIParser:
         self.api_key = api_key or settings.API_KEY_OPENAI
         self.model_name = settings.OPENAI_MODEL
         self.system_prompt = settings.SYSTEM_PROMPT
+        self.batch_system_prompt = self.system_prompt + BATCH_INSTRUCTIONS
 
         self.agent = self._initialize_agent()
+        self._batch_agent: Agent[BatchParseOutput] | None = None
 
     def _initialize_agent(self) -> Agent[SubstitutionOffer]:
         model = OpenAIResponsesModel(model_name=self.model_name, provider=OpenAIProvider(api_key=self.api_key))
@@ -31,6 +39,17 @@ class PydanticAIOpenAIParser:
             output_type=SubstitutionOffer,
         )
 
+    @property
+    def batch_agent(self) -> Agent[BatchParseOutput]:
+        # Built on first use: most parser instances only ever parse single offers
+        if self._batch_agent is None:
+            self._batch_agent = Agent[BatchParseOutput](
+                model=self.agent.model,
+                system_prompt=self.batch_system_prompt,
+                output_type=BatchParseOutput,
+            )
+        return self._batch_agent
+
     async def parse_offer(self, raw_data: str) -> ParseResponse:
         start_time = time.process_time()
 
@@ -46,6 +65,53 @@ class PydanticAIOpenAIParser:
             logger.exception("Error in Responses API parsing")
             return ParseResponse(success=False, error=str(e), data=None)
 
+    async def parse_offers(self, raw_data: list[str]) -> list[ParseResponse]:
+        """
+        Parse all texts in one call, so the system prompt is sent once and the usage is split across the
+        items. When the call fails or its output doesn't validate - including items whose indices are not
+        exactly 0..n-1 - every text falls back to single-offer parsing.
+        """
+        if len(raw_data) <= 1:
+            return [await self.parse_offer(text) for text in raw_data]
+
+        start_time = time.process_time()
+        offers: list[SubstitutionOffer] | None = None
+        usage_info = None
+        try:
+            result = await self.batch_agent.run(self._batch_prompt(raw_data))
+            offers = self._batch_offers(result.output, len(raw_data))
+            usage_info = self._extract_usage(result, start_time)
+        except Exception:
+            logger.exception(f"Error in Responses API batch parsing of {len(raw_data)} offers")
+
+        if offers is None:
+            return [await self.parse_offer(text) for text in raw_data]
+
+        item_usage = self._split_usage(usage_info, len(raw_data))
+        return [ParseResponse(success=True, data=offer, usage=item_usage) for offer in offers]
+
+    @staticmethod
+    def _batch_offers(output: BatchParseOutput, items: int) -> list[SubstitutionOffer]:
+        indices = sorted(item.index for item in output.items)
+        if indices != list(range(items)):
+            raise ValueError(f"Batch output indices {indices} do not match {items} offers")
+        return [item.offer for item in sorted(output.items, key=lambda item: item.index)]
+
+    @staticmethod
+    def _batch_prompt(raw_data: list[str]) -> str:
+        return "\n\n".join(f"### {index}\n{text}" for index, text in enumerate(raw_data))
+
+    @staticmethod
+    def _split_usage(usage_info: UsageDetails | None, items: int) -> UsageDetails | None:
+        if usage_info is None:
+            return None
+        return UsageDetails(
+            input_tokens=usage_info.input_tokens // items,
+            output_tokens=usage_info.output_tokens // items,
+            total_tokens=usage_info.total_tokens // items,
+            elapsed_time=usage_info.elapsed_time / items,
+        )
+
     def _validate_output(self, output: SubstitutionOffer | str | dict) -> SubstitutionOffer:
         if isinstance(output, SubstitutionOffer):
             return output
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+from app.core.config import get_settings
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.schemas.domain.ai import ParseResponse
+
+
+@lru_cache
+def get_offer_count_cache() -> TTLCache[int]:
+    """Process-wide cache of listing totals keyed by `OfferFilters.count_fingerprint()`."""
+    return TTLCache(ttl_seconds=get_settings().OFFER_COUNT_CACHE_TTL_SECONDS)
+
+
+@lru_cache
+def get_ai_parse_cache() -> TTLCache[ParseResponse]:
+    """Process-wide LRU in front of the `ai_parse_cache` table, keyed by `CachingAIParser` cache keys."""
+    settings = get_settings()
+    return TTLCache(ttl_seconds=settings.AI_PARSE_CACHE_TTL_SECONDS, max_size=settings.AI_PARSE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,48 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class TTLCache[V]:
+    """Small process-local cache: entries expire after `ttl_seconds`, the least recently used go first when full."""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
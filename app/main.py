@@ -14,8 +14,11 @@ from app.controller.offers import offer_router
 from app.controller.places import place_router
 from app.core.auth import check_token
 from app.core.config import get_settings
-from app.core.exceptions import ConflictError, NotFoundError
-from app.schemas.domain.common import HealthCheck
+from app.core.exceptions import BadRequestError, ConflictError, NotFoundError
+from app.core.lifespan import lifespan
+from app.infrastructure.cache.factory import get_ai_parse_cache, get_offer_count_cache
+from app.schemas.domain.common import CacheMetrics, HealthCheck
+from app.services.offers.offer_read_cache import get_offer_read_cache
 
 settings = get_settings()
 
@@ -34,7 +37,7 @@ def create_application() -> FastAPI:
         FastAPI: [description]
     """
     app = FastAPI(debug=settings.APP_DEBUG, openapi_url=settings.APP_API_DOCS,
-                  generate_unique_id_function=custom_generate_unique_id,)
+                  generate_unique_id_function=custom_generate_unique_id, lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -54,8 +57,12 @@ def create_application() -> FastAPI:
     async def _conflict_handler(request: Request, exc: ConflictError):
         return JSONResponse(status_code=409, content={"detail": str(exc)})
 
+    async def _bad_request_handler(request: Request, exc: BadRequestError):
+        return JSONResponse(status_code=400, content={"detail": str(exc)})
+
     app.add_exception_handler(NotFoundError, _not_found_handler)
     app.add_exception_handler(ConflictError, _conflict_handler)
+    app.add_exception_handler(BadRequestError, _bad_request_handler)
 
     return app
 
@@ -99,3 +106,12 @@ async def read_root():
          )
 async def health_check() -> HealthCheck:
     return HealthCheck(status="OK")
+
+
+@app.get("/metrics", tags=["healthcheck"], summary="Process-local cache statistics")
+async def cache_metrics() -> CacheMetrics:
+    return CacheMetrics(
+        offer_read_cache=get_offer_read_cache().stats(),
+        offer_count_cache=get_offer_count_cache().stats(),
+        ai_parse_cache=get_ai_parse_cache().stats(),
+    )
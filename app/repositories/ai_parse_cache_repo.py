@@ -0,0 +1,29 @@
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.models import AIParseCache
+from app.repositories.generics import GenericRepo
+
+
+class AIParseCacheRepo(GenericRepo[AIParseCache]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, AIParseCache)
+
+    async def get_result(self, text_hash: str, model: str, prompt_hash: str) -> dict[str, Any] | None:
+        query = select(self.model.result).where(
+            self.model.text_hash == text_hash, self.model.model == model, self.model.prompt_hash == prompt_hash
+        )
+        return await self.session.scalar(query)
+
+    async def save_result(self, text_hash: str, model: str, prompt_hash: str, result: dict[str, Any]) -> None:
+        # Concurrent misses of the same text all parse it; the first stored result wins
+        query = (
+            insert(self.model)
+            .values(text_hash=text_hash, model=model, prompt_hash=prompt_hash, result=result)
+            .on_conflict_do_nothing(constraint="uq_ai_parse_cache_key")
+        )
+        await self.session.execute(query)
+        await self.session.commit()
@@ -1,11 +1,12 @@
 from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.database.models.models import City
+from app.repositories.filters.name_filters import fuzzy_name_condition, name_match_tier, name_similarity
 from app.repositories.generics import GenericRepo
 
 
@@ -13,6 +14,21 @@ class CityRepo(GenericRepo[City]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, City)
 
+    async def get_gazetteer_rows(self) -> Sequence[Row]:
+        """Only the columns the autocomplete index keeps, read as plain rows rather than ORM objects."""
+        query = select(
+            self.model.uuid,
+            self.model.name,
+            self.model.name_ascii,
+            self.model.lat,
+            self.model.lon,
+            self.model.voivodeship_name,
+            self.model.importance,
+            self.model.population,
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
     async def get_by_uuid(self, uuid: UUID) -> City:
         query = select(self.model).where(self.model.uuid == uuid)
 
@@ -32,7 +48,19 @@ class CityRepo(GenericRepo[City]):
         return result.scalar_one_or_none()
 
     async def get_by_partial_name(self, name: str) -> Sequence[City]:
-        query = select(self.model).where(func.lower(self.model.name_ascii).ilike(f"%{name}%")).order_by(
-            desc(self.model.importance)).limit(5)
+        """Autocomplete: prefix and substring hits ranked by importance first, then typo-tolerant trigram matches."""
+        name = name.lower()
+        name_ascii = self.model.name_ascii
+
+        query = (
+            select(self.model)
+            .where(fuzzy_name_condition(name_ascii, name))
+            .order_by(
+                name_match_tier(name_ascii, name),
+                self.model.importance.desc().nulls_last(),
+                name_similarity(name_ascii, name).desc(),
+            )
+            .limit(5)
+        )
         result = await self.session.execute(query)
         return result.scalars().all()
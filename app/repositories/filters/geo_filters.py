@@ -0,0 +1,22 @@
+from sqlalchemy import Numeric, and_, cast, func
+
+
+def geo_point(lat_column, lon_column):
+    """Earth-cube point of a row; matches the expression of the `ix_*_geo_point` GiST indexes."""
+    return func.geo_point(lat_column, lon_column)
+
+
+def within_distance(lat_column, lon_column, lat: float, lon: float, distance_km: float):
+    """
+    Rows within `distance_km` (great-circle) of `(lat, lon)`.
+
+    `earth_box @>` is the index-backed bounding-cube check; `earth_distance` trims its corners.
+    """
+    origin = func.geo_point(cast(lat, Numeric), cast(lon, Numeric))
+    point = geo_point(lat_column, lon_column)
+    radius_m = float(distance_km) * 1000
+
+    return and_(
+        func.earth_box(origin, radius_m).op("@>")(point),
+        func.earth_distance(origin, point) <= radius_m,
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import case, func, or_
+
+from app.common.text_utils import escape_like
+
+
+def fuzzy_name_condition(column, name: str):
+    """Substring match or pg_trgm similarity above `pg_trgm.similarity_threshold`; both served by a gin_trgm_ops index."""
+    return or_(column.ilike(f"%{escape_like(name)}%"), column.op("%")(name))
+
+
+def name_match_tier(column, name: str):
+    """0 for prefix matches, 1 for other substring matches, 2 for typo-tolerant (similarity only) matches."""
+    escaped = escape_like(name)
+    return case(
+        (column.ilike(f"{escaped}%"), 0),
+        (column.ilike(f"%{escaped}%"), 1),
+        else_=2,
+    )
+
+
+def name_similarity(column, name: str):
+    return func.similarity(column, name)
@@ -14,13 +14,16 @@ class OfferFilters(BaseModel):
     sort_order: str = "desc"
     status: OfferStatus | None = None
     search: str | None = None
-    search_fields: list[str] | None = None
     load_relations: list[str] | str | None = None
     coordinates: Coordinates | None = None
     distance_km: float | None = None
     legal_role_uuids: list[UUID] | None = None
     invoice: bool | None = None
     valid_to: datetime | None = None
+    updated_since: datetime | None = None
+    cursor: str | None = None
+    # Pre-resolved matches of the location filter (from the in-memory index); replaces the SQL radius check
+    offer_ids: list[int] | None = None
 
     @property
     def has_location_filter(self) -> bool:
@@ -29,3 +32,31 @@ class OfferFilters(BaseModel):
     @property
     def has_legal_role_filter(self) -> bool:
         return self.legal_role_uuids is not None and len(self.legal_role_uuids) > 0
+
+    @property
+    def has_conditions(self) -> bool:
+        return any([
+            self.status,
+            self.search,
+            self.invoice is not None,
+            self.valid_to,
+            self.updated_since,
+            self.has_legal_role_filter,
+            self.has_location_filter,
+        ])
+
+    def count_fingerprint(self) -> tuple:
+        """
+        Normalized key of the fields that affect the total count (paging, ordering and loading are ignored).
+        `valid_to` is floored to the minute, as listings pass a moving `now - 12h` threshold.
+        """
+        return (
+            self.status.name if self.status else None,
+            self.search.strip().lower() if self.search else None,
+            self.invoice,
+            self.valid_to.replace(second=0, microsecond=0).isoformat() if self.valid_to else None,
+            self.updated_since.isoformat() if self.updated_since else None,
+            tuple(sorted(str(role_uuid) for role_uuid in self.legal_role_uuids)) if self.legal_role_uuids else None,
+            (round(float(self.coordinates.lat), 5), round(float(self.coordinates.lon), 5), self.distance_km)
+            if self.has_location_filter else None,
+        )
@@ -1,6 +1,6 @@
 from typing import Any, TypeVar
 
-from sqlalchemy import Sequence, and_, select, update
+from sqlalchemy import Sequence, and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.models.models import BaseModel
@@ -28,6 +28,16 @@ class GenericRepo[T]:
         result = await self.session.execute(select(self.model))
         return result.scalars().all()
 
+    async def get_version(self) -> tuple[int, int | None]:
+        """
+        Row count and highest id: a cheap change marker for tables whose rows are only inserted or deleted.
+
+        :return: The row count and the highest ID (None for an empty table).
+        """
+        result = await self.session.execute(select(func.count(), func.max(self.model.id)))
+        count, max_id = result.one()
+        return count, max_id
+
     async def get_by_id(self, id: int) -> T | None:
         """
         Retrieves an object by its ID.
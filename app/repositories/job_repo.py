@@ -0,0 +1,131 @@
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import delete, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.enums import JobKind, JobStatus, OfferStatus
+from app.database.models.models import Job, Offer
+from app.repositories.generics import GenericRepo
+
+
+class JobRepo(GenericRepo[Job]):
+    """
+    Postgres-backed job queue. Every state change is its own short transaction, so no row lock is held while
+    a job runs: a claim flips jobs to RUNNING and commits, and the worker reports the outcome afterwards.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, Job)
+
+    async def enqueue(self, kind: JobKind, payload: dict[str, Any], max_attempts: int) -> Job:
+        return await self.create(kind=kind, payload=payload, status=JobStatus.QUEUED, max_attempts=max_attempts)
+
+    async def enqueue_offer_parsing(self, limit: int, max_attempts: int) -> int:
+        """
+        Enqueue a parse job for up to `limit` NEW offers that have neither a stored parse result nor a job.
+        Offers whose job was dead-lettered keep their key, so they aren't picked up again.
+        """
+        kind = JobKind.PARSE_RAW_OFFER
+        dedupe_key = func.concat(f"{kind.value}:", Offer.id)
+        unparsed = (
+            select(
+                literal(kind.name),
+                dedupe_key,
+                func.jsonb_build_object("offer_id", Offer.id),
+                literal(JobStatus.QUEUED.name),
+                literal(max_attempts),
+            )
+            .where(
+                Offer.status == literal(OfferStatus.NEW, Offer.status.type, literal_execute=True),
+                Offer.parsed_at.is_(None),
+                Offer.raw_data.is_not(None),
+                ~exists().where(self.model.dedupe_key == dedupe_key),
+            )
+            .order_by(Offer.id)
+            .limit(limit)
+        )
+        query = (
+            insert(self.model)
+            .from_select(["kind", "dedupe_key", "payload", "status", "max_attempts"], unparsed)
+            .on_conflict_do_nothing(index_elements=[self.model.dedupe_key])
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
+
+    async def claim(self, limit: int, worker_id: str) -> Sequence[Job]:
+        """
+        Take up to `limit` due jobs, oldest first. `SKIP LOCKED` lets concurrent workers claim different
+        jobs instead of queueing on the same rows.
+        """
+        due = (
+            select(self.model.id)
+            .where(self._status_is(JobStatus.QUEUED), self.model.run_at <= func.now())
+            .order_by(self.model.run_at, self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(self.model)
+            .where(self.model.id.in_(due.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=self.model.attempts + 1,
+                locked_at=func.now(),
+                locked_by=worker_id,
+            )
+            .returning(self.model)
+        )
+        result = await self.session.execute(query)
+        jobs = result.scalars().all()
+        await self.session.commit()
+        return jobs
+
+    async def complete(self, job_id: int) -> None:
+        await self.session.execute(delete(self.model).where(self.model.id == job_id))
+        await self.session.commit()
+
+    async def retry(self, job_id: int, error: str, delay: timedelta) -> None:
+        await self.update(
+            job_id,
+            status=JobStatus.QUEUED,
+            run_at=func.now() + delay,
+            locked_at=None,
+            locked_by=None,
+            last_error=error,
+        )
+
+    async def bury(self, job_id: int, error: str) -> None:
+        """Dead-letter a job: it is kept with its last error but never claimed again."""
+        await self.update(job_id, status=JobStatus.DEAD, locked_at=None, locked_by=None, last_error=error)
+
+    async def release_stale(self, lock_timeout: timedelta) -> int:
+        """Requeue jobs whose worker died mid-run (locked for longer than `lock_timeout`)."""
+        query = (
+            update(self.model)
+            .where(self._status_is(JobStatus.RUNNING), self.model.locked_at < func.now() - lock_timeout)
+            .values(status=JobStatus.QUEUED, locked_at=None, locked_by=None)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
+
+    async def requeue_dead(self, kind: JobKind | None = None) -> int:
+        """Give dead-lettered jobs (optionally of one `kind`) a fresh set of attempts."""
+        query = (
+            update(self.model)
+            .where(self.model.status == JobStatus.DEAD)
+            .values(status=JobStatus.QUEUED, attempts=0, run_at=func.now())
+        )
+        if kind is not None:
+            query = query.where(self.model.kind == kind)
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
+
+    def _status_is(self, status: JobStatus):
+        # Inline, like `OfferRepo._status_is`, so prepared statements keep matching the partial indexes
+        return self.model.status == literal(status, self.model.status.type, literal_execute=True)
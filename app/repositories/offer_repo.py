@@ -1,21 +1,42 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import BinaryExpression, and_, func, or_, select
+from sqlalchemy import (
+    BinaryExpression,
+    DateTime,
+    Row,
+    and_,
+    bindparam,
+    func,
+    inspect,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.exceptions import NotFoundError
+from app.common.cursor import decode_cursor, encode_cursor
+from app.common.minhash import signature_fields
+from app.core.exceptions import BadRequestError, NotFoundError
 from app.database.models.enums import OfferStatus
-from app.database.models.models import LegalRole, Offer, Place
+from app.database.models.models import City, LegalRole, Offer, Place, offers_legal_roles_link
+from app.repositories.filters.geo_filters import within_distance
 from app.repositories.filters.offer_filters import OfferFilters
 from app.repositories.generics import GenericRepo
+from app.repositories.pagination import Page
+from app.utils.timestamp_utils import as_utc
 
 
 class OfferRepo(GenericRepo[Offer]):
-    EARTH_RADIUS_KM = 6371
-    KM_PER_DEGREE_LAT = 111.0
+    RELEVANCE = "relevance"
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Offer)
@@ -34,14 +55,70 @@ class OfferRepo(GenericRepo[Offer]):
 
         return query
 
+    async def get_last_updated_at(self) -> datetime | None:
+        return await self.session.scalar(select(func.max(self.model.updated_at)))
+
     async def get_offers_count(self):
-        count_query = select(func.count(self.model.id)).where(self.model.status == OfferStatus.ACTIVE).where(
+        count_query = select(func.count(self.model.id)).where(self._status_is(OfferStatus.ACTIVE)).where(
             self.model.valid_to > datetime.now(UTC))
 
         result = await self.session.execute(count_query)
         count = result.scalar_one()
         return count
 
+    async def get_active_locations(self, valid_after: datetime) -> Sequence[Row]:
+        """
+        `(id, lat, lon, valid_to)` of active, located offers that are still listed after `valid_after`, with
+        coordinates resolved like `get_map_rows` (and the `visible_offers` view) resolve them.
+        """
+        lat = func.coalesce(self.model.lat, Place.lat, City.lat)
+        lon = func.coalesce(self.model.lon, Place.lon, City.lon)
+        query = (
+            select(self.model.id, lat.label("lat"), lon.label("lon"), self.model.valid_to)
+            .outerjoin(Place, self.model.place_id == Place.id)
+            .outerjoin(City, self.model.city_id == City.id)
+            .where(
+                self._status_is(OfferStatus.ACTIVE),
+                self.model.valid_to > valid_after,
+                lat.is_not(None),
+                lon.is_not(None),
+            )
+        )
+
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_map_rows(self, valid_after: datetime) -> Sequence[Row]:
+        """
+        Map fields of active offers listed after `valid_after`, with coordinates and place name resolved
+        from the offer, then its place, then its city (same precedence as `OfferMapResponse`).
+        """
+        lat = func.coalesce(self.model.lat, Place.lat, City.lat)
+        lon = func.coalesce(self.model.lon, Place.lon, City.lon)
+        query = (
+            select(
+                self.model.id,
+                self.model.uuid,
+                self.model.description,
+                self.model.date,
+                self.model.valid_to,
+                lat.label("lat"),
+                lon.label("lon"),
+                func.coalesce(self.model.place_name, Place.name, City.name).label("place_name"),
+            )
+            .outerjoin(Place, self.model.place_id == Place.id)
+            .outerjoin(City, self.model.city_id == City.id)
+            .where(
+                self._status_is(OfferStatus.ACTIVE),
+                self.model.valid_to > valid_after,
+                lat.is_not(None),
+                lon.is_not(None),
+            )
+        )
+
+        result = await self.session.execute(query)
+        return result.all()
+
     async def find_by_uuid(self, uuid: UUID, load_relations: list[str | BinaryExpression] | None = None) -> Offer | None:
         """Find offer by UUID. Returns None if not found (no exception)."""
         query = select(self.model).where(self.model.uuid == uuid)
@@ -63,12 +140,104 @@ class OfferRepo(GenericRepo[Offer]):
 
         return offer
 
+    async def load_location(self, offer: Offer) -> None:
+        """Load the offer's place and city (unless already loaded), which its coordinates fall back to."""
+        unloaded = [relation for relation in ("place", "city") if relation in inspect(offer).unloaded]
+        if unloaded:
+            await self.session.refresh(offer, unloaded)
+
     async def get_by_offer_uid(self, offer_uid: str) -> Offer | None:
         query = select(self.model).where(self.model.offer_uid == offer_uid)
 
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def insert_raw_offers(self, rows: list[dict[str, Any]]) -> Sequence[str]:
+        """
+        Insert `rows` with a single multi-row statement, skipping those whose `offer_uid` already exists
+        (or repeats within `rows`). Returns the `offer_uid`s that were inserted.
+        """
+        query = (
+            insert(self.model)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[self.model.offer_uid])
+            .returning(self.model.offer_uid)
+        )
+        result = await self.session.execute(query)
+        inserted = result.scalars().all()
+        await self.session.commit()
+        return inserted
+
+    async def save_parse_result(self, offer_id: int, parse_result: dict[str, Any]) -> None:
+        # `updated_at` is kept: parse results are not part of any offer representation or listing validator
+        query = (
+            update(self.model)
+            .where(self.model.id == offer_id)
+            .values(parse_result=parse_result, parsed_at=func.now(), updated_at=self.model.updated_at)
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def save_parse_results(self, parse_results: dict[int, dict[str, Any]]) -> None:
+        """`save_parse_result` for a batch of offers, as one executemany and one commit."""
+        table = self.model.__table__
+        query = (
+            update(table)
+            .where(table.c.id == bindparam("offer_id"))
+            .values(
+                parse_result=bindparam("result", type_=table.c.parse_result.type),
+                parsed_at=func.now(),
+                updated_at=table.c.updated_at,
+            )
+        )
+        params = [{"offer_id": offer_id, "result": result} for offer_id, result in parse_results.items()]
+        if params:
+            await self.session.execute(query, params)
+            await self.session.commit()
+
+    async def get_unparsed_new_offers(self, limit: int, after_id: int = 0) -> Sequence[Row]:
+        """Ids and raw posts of NEW offers without a stored parse result, in id order after `after_id`."""
+        query = (
+            select(self.model.id, self.model.raw_data)
+            .where(
+                self._status_is(OfferStatus.NEW),
+                self.model.parsed_at.is_(None),
+                self.model.raw_data.is_not(None),
+                self.model.id > after_id,
+            )
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def get_minhash(self, uuid: UUID) -> Row:
+        """The offer's id with its (deferred) MinHash signature and band keys."""
+        query = select(self.model.id, self.model.minhash, self.model.minhash_bands).where(self.model.uuid == uuid)
+        row = (await self.session.execute(query)).one_or_none()
+        if row is None:
+            raise NotFoundError("Offer", str(uuid))
+        return row
+
+    async def find_by_minhash_bands(self, minhash_bands: list[int], exclude_id: int, limit: int = 50) -> Sequence[Row]:
+        """
+        Near-duplicate candidates: offers sharing at least one LSH band key, most shared keys first (then
+        newest). Ranking before the limit keeps true duplicates ahead of the many template-alike posts that
+        share a single band by chance.
+        """
+        band_key = func.unnest(self.model.minhash_bands).table_valued("key").render_derived()
+        shared_bands = (
+            select(func.count()).select_from(band_key).where(band_key.c.key.in_(minhash_bands)).scalar_subquery()
+        )
+        query = (
+            select(self.model.uuid, self.model.author, self.model.status, self.model.minhash)
+            .where(self.model.minhash_bands.overlap(minhash_bands), self.model.id != exclude_id)
+            .order_by(shared_bands.desc(), self.model.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
     async def get_by_email(self, email: str) -> Sequence[Offer]:
         query = select(self.model).where(self.model.email == email).where(self.model.valid_to.is_not(None))
 
@@ -83,26 +252,179 @@ class OfferRepo(GenericRepo[Offer]):
             sort_order: str,
             filters: OfferFilters,
             load_relations: list[str | BinaryExpression] | None = None,
-    ) -> tuple[Sequence[Offer], int]:
-        query = select(self.model)
-        query = self._apply_relationship_loading(query, load_relations)
+            include_count: bool = True,
+            columns: Sequence[str] | None = None,
+    ) -> Page[Offer | Row]:
+        """
+        Fetch one page of offers.
+
+        With `filters.cursor` set the page starts right after the encoded `(sort_column, id)` position
+        (keyset pagination) and `offset` is ignored, so deep pages cost a single index range scan.
+        One extra row is fetched to decide whether a `next_cursor` should be issued.
+        With `include_count=False` the total is not computed and `Page.count` is None.
+
+        When all of `columns` are columns of the model or relation fields (see `_relation_columns`), only those
+        (plus `id` and the sort column, which cursors need) are selected in a single statement and the page
+        holds `Row` tuples instead of entities: no relationship loading round trips, no identity map.
+        Otherwise full entities are loaded with `load_relations`.
+
+        Offset pages get their total from `count(*) OVER ()` in the same statement, so items and count come
+        from one snapshot in one round trip; only a page past the end needs a separate count. Keyset pages
+        can't use the window (it would only count rows after the cursor) and run the count query instead.
+        """
+        projection = self._projection(columns, sort_column)
+        if projection:
+            query = self._join_relations(select(*projection).select_from(self.model), columns)
+        else:
+            query = self._apply_relationship_loading(select(self.model), load_relations)
         query = self._apply_filters(query, filters)
-        query = query.order_by(getattr(getattr(self.model, sort_column), sort_order)())
-
-        result = await self.session.execute(query.offset(offset).limit(limit))
-        items = result.scalars().all()
-
-        count_query = self._build_count_query(filters)
-        count_result = await self.session.execute(count_query)
-        total_records = count_result.scalar_one()
+        query = self._apply_ordering(query, sort_column, sort_order, filters)
+
+        windowed_count = include_count and not filters.cursor
+        if windowed_count:
+            query = query.add_columns(func.count().over().label("total_count"))
+
+        if filters.cursor:
+            query = self._apply_cursor(query, sort_column, sort_order, filters.cursor)
+        else:
+            query = query.offset(offset)
+
+        result = await self.session.execute(query.limit(limit + 1))
+
+        total_records = None
+        if windowed_count:
+            records = result.all()
+            rows = records if projection else [record[0] for record in records]
+            if records:
+                total_records = records[0].total_count
+            else:
+                total_records = await self.count_offers(filters) if offset > 0 else 0
+        else:
+            rows = result.all() if projection else result.scalars().all()
+            if include_count:
+                total_records = await self.count_offers(filters)
+
+        items = rows[:limit]
+
+        next_cursor = None
+        if limit > 0 and len(rows) > limit and sort_column != self.RELEVANCE:
+            next_cursor = self._build_cursor(items[-1], sort_column, sort_order)
+
+        return Page(items=items, count=total_records, next_cursor=next_cursor)
+
+    def _projection(self, columns: Sequence[str] | None, sort_column: str) -> list:
+        """Expressions to select for `columns`, or an empty list when some of them can't be selected directly."""
+        if columns is None:
+            return []
+
+        model_columns = inspect(self.model).column_attrs.keys()
+        relation_columns = self._relation_columns()
+        if not all(name in model_columns or name in relation_columns for name in columns):
+            return []
+
+        names = ["id", *columns] if sort_column == self.RELEVANCE else ["id", sort_column, *columns]
+        return [
+            getattr(self.model, name) if name in model_columns else relation_columns[name].label(name)
+            for name in dict.fromkeys(names)
+        ]
+
+    def _relation_columns(self) -> dict:
+        """
+        Response fields backed by relationships, as expressions of the listing statement: place and city
+        UUIDs through the joins of `_join_relations`, legal roles aggregated per offer (ordered by name, as in
+        `visible_offers`) by a correlated subquery that only runs for the rows of the page.
+        """
+        legal_roles = (
+            select(
+                func.coalesce(
+                    func.jsonb_agg(
+                        aggregate_order_by(func.jsonb_build_object("uuid", LegalRole.uuid, "name", LegalRole.name), LegalRole.name)
+                    ),
+                    literal_column("'[]'::jsonb"),
+                )
+            )
+            .select_from(offers_legal_roles_link)
+            .join(LegalRole, LegalRole.id == offers_legal_roles_link.c.legal_role_id)
+            .where(offers_legal_roles_link.c.offer_id == self.model.id)
+            .scalar_subquery()
+        )
+        return {"facility_uuid": Place.uuid, "city_uuid": City.uuid, "legal_roles": legal_roles}
+
+    def _join_relations(self, query, columns: Sequence[str]):
+        """Outer joins needed by the relation fields among `columns` (many-to-one, so rows aren't multiplied)."""
+        relation_fields = set(columns) - set(inspect(self.model).column_attrs.keys())
+        if "facility_uuid" in relation_fields:
+            query = query.outerjoin(Place, self.model.place_id == Place.id)
+        if "city_uuid" in relation_fields:
+            query = query.outerjoin(City, self.model.city_id == City.id)
+        return query
 
-        return items, total_records
+    async def stream_rows(
+        self, columns: Sequence[str], filters: OfferFilters, batch_size: int = 2000
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        `Row` tuples of `columns` (as in `get_offers`) for every offer matching `filters`, in id order.
+        Rows come from a server-side cursor `batch_size` at a time, so memory use doesn't grow with the result.
+        """
+        query = self._join_relations(select(*self._projection(columns, "id")).select_from(self.model), columns)
+        query = self._apply_filters(query, filters).order_by(self.model.id)
+
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+    async def count_offers(self, filters: OfferFilters) -> int:
+        result = await self.session.execute(self._build_count_query(filters))
+        return result.scalar_one()
+
+    async def estimate_count(self) -> int | None:
+        """Planner row estimate for the whole table; None until the table has been analyzed."""
+        query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'offers'::regclass")
+        estimate = (await self.session.execute(query)).scalar_one_or_none()
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    def _apply_ordering(self, query, sort_column: str, sort_order: str, filters: OfferFilters):
+        if sort_column == self.RELEVANCE:
+            if not filters.search:
+                return query.order_by(self.model.created_at.desc(), self.model.id.desc())
+            return query.order_by(self._search_rank(filters.search).desc(), self.model.id.desc())
+
+        # PostgreSQL's default placement, spelled out for `_apply_cursor`: NULLs sort after every value in
+        # ascending order and before them in descending order, which keeps the (column, id) indexes usable
+        column = getattr(self.model, sort_column)
+        ordered = column.asc().nulls_last() if sort_order == "asc" else column.desc().nulls_first()
+        return query.order_by(ordered, getattr(self.model.id, sort_order)())
+
+    def _apply_cursor(self, query, sort_column: str, sort_order: str, cursor: str):
+        if sort_column == self.RELEVANCE:
+            raise BadRequestError("Cursor pagination is not available when sorting by relevance")
+
+        value, row_id = decode_cursor(cursor, sort_column, sort_order)
+        column = getattr(self.model, sort_column)
+        if isinstance(column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+            # Keep the offset of aware values (valid_to is timestamptz in the database)
+            value = literal(value, DateTime(timezone=value.tzinfo is not None))
+
+        if sort_order == "asc":
+            # NULLs come last: after a NULL key only NULL keys with a greater id follow
+            if value is None:
+                return query.where(column.is_(None), self.model.id > row_id)
+            return query.where(or_(tuple_(column, self.model.id) > tuple_(value, row_id), column.is_(None)))
+
+        # NULLs come first: after a NULL key the remaining NULL keys, then every non-NULL one
+        if value is None:
+            return query.where(or_(and_(column.is_(None), self.model.id < row_id), column.is_not(None)))
+        return query.where(tuple_(column, self.model.id) < tuple_(value, row_id))
+
+    def _build_cursor(self, offer: Offer | Row, sort_column: str, sort_order: str) -> str:
+        return encode_cursor(sort_column, sort_order, getattr(offer, sort_column), offer.id)
 
     def _apply_filters(self, query, filters: OfferFilters):
         conditions = []
 
         if filters.status:
-            conditions.append(self.model.status == filters.status)
+            conditions.append(self._status_is(filters.status))
 
         if filters.search:
             self._add_search_filter(conditions, filters)
@@ -113,50 +435,136 @@ class OfferRepo(GenericRepo[Offer]):
         if filters.valid_to:
             conditions.append(self.model.valid_to > filters.valid_to)
 
+        if filters.updated_since:
+            # `updated_at` is a naive UTC timestamp
+            conditions.append(self.model.updated_at >= as_utc(filters.updated_since).astimezone(UTC).replace(tzinfo=None))
+
         if filters.legal_role_uuids:
-            conditions.append(
-                self.model.legal_roles.any(LegalRole.uuid.in_(filters.legal_role_uuids))
-            )
+            conditions.append(self._legal_roles_filter(filters.legal_role_uuids))
 
-        if filters.coordinates and filters.distance_km:
+        if filters.offer_ids is not None:
+            conditions.append(self.model.id.in_(filters.offer_ids))
+        elif filters.coordinates and filters.distance_km:
             conditions.append(self._distance_filter(float(filters.coordinates.lat), float(filters.coordinates.lon), filters.distance_km))
 
         if conditions:
             query = query.filter(and_(*conditions))
         return query
 
-    def _add_search_filter(self, conditions, filters: OfferFilters):
-        search_terms = []
-        search_fields = filters.search_fields or ["description"]
-        for field in search_fields:
-            column = getattr(self.model, field, None)
-            if column is not None:
-                search_terms.append(column.ilike(f"%{filters.search}%"))
-        if search_terms:
-            conditions.append(or_(*search_terms))
+    def _status_is(self, status: OfferStatus):
+        # Rendered inline rather than bound: once psycopg prepares a statement, a generic plan for
+        # `status = $1` could no longer use the partial indexes on active offers
+        return self.model.status == literal(status, self.model.status.type, literal_execute=True)
 
-    def _distance_filter(self, lat: float, lon: float, distance_km: float):
-        lat_diff = distance_km / self.KM_PER_DEGREE_LAT
-        lon_diff = distance_km / (self.KM_PER_DEGREE_LAT * func.cos(func.radians(lat)))
-
-        return and_(
-            self.model.lat.between(lat - lat_diff, lat + lat_diff),
-            self.model.lon.between(lon - lon_diff, lon + lon_diff),
-            func.acos(
-                func.sin(func.radians(lat)) * func.sin(func.radians(self.model.lat)) +
-                func.cos(func.radians(lat)) * func.cos(func.radians(self.model.lat)) *
-                func.cos(func.radians(self.model.lon) - func.radians(lon))
-            ) * self.EARTH_RADIUS_KM <= distance_km
+    def _legal_roles_filter(self, legal_role_uuids: list[UUID]):
+        return self.model.legal_roles.any(LegalRole.uuid.in_(legal_role_uuids))
+
+    def _add_search_filter(self, conditions, filters: OfferFilters):
+        conditions.append(self.model.search_vector.op("@@")(self._search_query(filters.search)))
+
+    @staticmethod
+    def _search_query(search: str):
+        return func.offers_search_query(search)
+
+    def _search_rank(self, search: str):
+        return func.ts_rank_cd(self.model.search_vector, self._search_query(search))
+
+    async def rebuild_search_vectors(self, batch_size: int = 5000) -> int:
+        """Recompute `search_vector` for every offer in id-range batches, committing after each one."""
+        max_id = (await self.session.execute(select(func.max(self.model.id)))).scalar_one() or 0
+        document = func.offers_search_document(
+            self.model.description,
+            self.model.place_name,
+            self.model.city_name,
+            self.model.author,
+            self.model.raw_data,
+            self.model.offer_uid,
         )
 
-    def _build_count_query(self, filters: OfferFilters):
-        count_query = select(func.count(self.model.id))
-        count_query = count_query.select_from(self.model)
+        updated = 0
+        for start in range(0, max_id, batch_size):
+            query = (
+                update(self.model)
+                .where(self.model.id > start, self.model.id <= start + batch_size)
+                # Pass updated_at through explicitly so its `onupdate` does not fire
+                .values(search_vector=document, updated_at=self.model.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.session.execute(query)
+            await self.session.commit()
+            updated += result.rowcount
 
-        if filters.legal_role_uuids:
-            count_query = count_query.join(self.model.legal_roles)
+        return updated
 
-        if filters.coordinates and filters.distance_km and not filters.legal_role_uuids:
-            count_query = count_query.join(Place, self.model.place_id == Place.id, isouter=True)
+    async def rebuild_minhash(self, batch_size: int = 2000) -> int:
+        """Compute the MinHash signature and band keys of every offer in id-range batches, committing after each one."""
+        max_id = (await self.session.execute(select(func.max(self.model.id)))).scalar_one() or 0
+
+        updated = 0
+        for start in range(0, max_id, batch_size):
+            rows = await self.session.execute(
+                select(self.model.id, self.model.raw_data, self.model.description)
+                .where(self.model.id > start, self.model.id <= start + batch_size)
+            )
+            updated += await self._save_minhash(rows.all())
 
+        return updated
+
+    async def fill_minhash(self, limit: int) -> int:
+        """Fingerprint up to `limit` offers still waiting for their MinHash signature (NULL band keys)."""
+        rows = await self.session.execute(
+            select(self.model.id, self.model.raw_data, self.model.description)
+            .where(self.model.minhash_bands.is_(None))
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        return await self._save_minhash(rows.all())
+
+    async def _save_minhash(self, rows: Sequence[Row]) -> int:
+        table = self.model.__table__
+        query = (
+            update(table)
+            .where(table.c.id == bindparam("offer_id"))
+            # Pass updated_at through explicitly so its `onupdate` does not fire
+            .values(
+                minhash=bindparam("signature_minhash", type_=table.c.minhash.type),
+                minhash_bands=bindparam("signature_minhash_bands", type_=table.c.minhash_bands.type),
+                updated_at=table.c.updated_at,
+            )
+        )
+        params = [
+            {
+                "offer_id": row.id,
+                **{f"signature_{name}": value for name, value in signature_fields(row.raw_data or row.description).items()},
+            }
+            for row in rows
+        ]
+        if params:
+            await self.session.execute(query, params)
+            await self.session.commit()
+        return len(params)
+
+    def _distance_filter(self, lat: float, lon: float, distance_km: float):
+        """
+        Offers within the radius of their location resolved like `visible_offers` resolves it: the offer's
+        own coordinates, else its place's, else its city's. One branch per source (coordinates are stored
+        in pairs), so each is answered by the `ix_*_geo_point` index of its own table.
+        """
+        nearby_places = select(Place.id).where(within_distance(Place.lat, Place.lon, lat, lon, distance_km))
+        nearby_cities = select(City.id).where(within_distance(City.lat, City.lon, lat, lon, distance_km))
+        unlocated_places = select(Place.id).where(Place.lat.is_(None))
+
+        return or_(
+            within_distance(self.model.lat, self.model.lon, lat, lon, distance_km),
+            and_(self.model.lat.is_(None), self.model.place_id.in_(nearby_places)),
+            and_(
+                self.model.lat.is_(None),
+                or_(self.model.place_id.is_(None), self.model.place_id.in_(unlocated_places)),
+                self.model.city_id.in_(nearby_cities),
+            ),
+        )
+
+    def _build_count_query(self, filters: OfferFilters):
+        # Every filter is a predicate on `offers` itself (roles go through EXISTS), so no joins are needed
+        count_query = select(func.count(self.model.id)).select_from(self.model)
         return self._apply_filters(count_query, filters)
@@ -0,0 +1,14 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+# exact: real count(*); estimate: planner estimate when nothing is filtered; none: skip the count
+CountMode = Literal["exact", "estimate", "none"]
+
+
+@dataclass
+class Page[T]:
+    items: Sequence[T]
+    count: int | None
+    next_cursor: str | None = None
+    count_is_estimate: bool = False
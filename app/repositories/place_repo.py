@@ -1,20 +1,35 @@
 from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import Row, and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.database.models.models import Place
+from app.repositories.filters.geo_filters import within_distance
+from app.repositories.filters.name_filters import fuzzy_name_condition, name_match_tier, name_similarity
 from app.repositories.generics import GenericRepo
 
-EARTH_RADIUS_KM = 6371.0
-
 
 class PlaceRepo(GenericRepo[Place]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Place)
 
+    async def get_gazetteer_rows(self) -> Sequence[Row]:
+        """Only the columns the autocomplete index keeps, read as plain rows rather than ORM objects."""
+        query = select(
+            self.model.uuid,
+            self.model.name,
+            self.model.name_ascii,
+            self.model.category,
+            self.model.type,
+            self.model.city,
+            self.model.street_name,
+            self.model.street_number,
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
     async def get_by_uuid(self, uuid: UUID) -> Place:
         query = select(self.model).where(self.model.uuid == uuid)
 
@@ -26,31 +41,28 @@ class PlaceRepo(GenericRepo[Place]):
         return place
 
     async def get_by_partial_name(self, name: str, place_type: str | None = None) -> Sequence[Place]:
-        conditions = [func.lower(self.model.name_ascii).ilike(f"%{name.lower()}%")]
+        name = name.lower()
+        name_ascii = self.model.name_ascii
+        conditions = [fuzzy_name_condition(name_ascii, name)]
 
         if place_type:
             conditions.append(self.model.type == place_type)
 
-        query = select(self.model).where(and_(*conditions)).limit(7)
+        query = (
+            select(self.model)
+            .where(and_(*conditions))
+            .order_by(name_match_tier(name_ascii, name), name_similarity(name_ascii, name).desc())
+            .limit(7)
+        )
         result = await self.session.execute(query)
         return result.scalars().all()
 
     async def get_by_name_and_distance(self, name: str, lat: float, lon: float, min_distance_km: float = 1.0) -> Sequence[Place]:
-        haversine = EARTH_RADIUS_KM * func.acos(
-            func.least(1.0, func.greatest(-1.0,
-                func.cos(func.radians(lat)) *
-                func.cos(func.radians(self.model.lat)) *
-                func.cos(func.radians(self.model.lon) - func.radians(lon)) +
-                func.sin(func.radians(lat)) *
-                func.sin(func.radians(self.model.lat))
-            ))
-        )
-
         # Detect places WITHIN the given distance threshold (potential duplicates)
         query = select(self.model).where(
             and_(
                 func.lower(self.model.name) == name.lower(),
-                haversine < min_distance_km
+                within_distance(self.model.lat, self.model.lon, lat, lon, min_distance_km),
             )
         )
 
@@ -0,0 +1,53 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BinaryExpression, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.models import ViewRefresh, VisibleOffer
+from app.repositories.filters.geo_filters import within_distance
+from app.repositories.offer_repo import OfferRepo
+
+
+class VisibleOfferRepo(OfferRepo):
+    """
+    Public offer listings served from the `visible_offers` materialized view.
+
+    Filtering, ordering, cursors and counts are the ones of `OfferRepo`, applied to the view's denormalized
+    rows, so listing a page needs no joins and no relationship loading.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        # Skips OfferRepo.__init__, which binds the `offers` table
+        super(OfferRepo, self).__init__(session, VisibleOffer)
+
+    async def refresh(self) -> None:
+        """
+        Rebuild the view without blocking readers; concurrent refreshes queue on the view's lock. The refresh
+        time is committed in the same transaction, so `get_refreshed_at` never runs ahead of the view.
+        """
+        await self.session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY visible_offers"))
+        refreshed_at = func.clock_timestamp()
+        await self.session.execute(
+            insert(ViewRefresh)
+            .values(name=self.model.__tablename__, refreshed_at=refreshed_at)
+            .on_conflict_do_update(index_elements=[ViewRefresh.name], set_={"refreshed_at": refreshed_at})
+        )
+        await self.session.commit()
+
+    async def get_refreshed_at(self) -> datetime | None:
+        return await self.session.scalar(
+            select(ViewRefresh.refreshed_at).where(ViewRefresh.name == self.model.__tablename__)
+        )
+
+    def _apply_relationship_loading(self, query, load_relations: list[str | BinaryExpression] | None = None):
+        # Place, city and legal roles are columns of the view
+        return query
+
+    def _distance_filter(self, lat: float, lon: float, distance_km: float):
+        # The view's coordinates already fall back to the place's and city's
+        return within_distance(self.model.lat, self.model.lon, lat, lon, distance_km)
+
+    def _legal_roles_filter(self, legal_role_uuids: list[UUID]):
+        return self.model.legal_role_uuids.overlap(legal_role_uuids)
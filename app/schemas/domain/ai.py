@@ -8,6 +8,16 @@ class SubstitutionOffer(BaseModel):
     email: str | None = None
 
 
+class BatchOfferItem(BaseModel):
+    index: int
+    offer: SubstitutionOffer
+
+
+class BatchParseOutput(BaseModel):
+    """Structured output of a multi-offer call: one item per numbered offer of the prompt."""
+    items: list[BatchOfferItem]
+
+
 class UsageDetails(BaseModel):
     input_tokens: int
     output_tokens: int
@@ -20,3 +30,5 @@ class ParseResponse(BaseModel):
     data: SubstitutionOffer | None = None
     error: str | None = None
     usage: UsageDetails | None = None
+    # Served from the parse cache: no tokens were spent, so there is no usage
+    cached: bool = False
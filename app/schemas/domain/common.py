@@ -32,5 +32,18 @@ class HealthCheck(BaseModel):
     status: str = "OK"
 
 
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
+class CacheMetrics(BaseModel):
+    offer_read_cache: CacheStats
+    offer_count_cache: CacheStats
+    ai_parse_cache: CacheStats
+
+
 class BaseResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -18,6 +18,11 @@ class OfferRawAdd(BaseModel):
     source: SourceType
 
 
+class RawOffersImported(BaseResponse):
+    inserted: int
+    skipped: int
+
+
 class OfferAdd(BaseModel):
     author: str
     facility_uuid: UUID | None = None
@@ -106,10 +111,14 @@ class OfferMapResponse(BaseResponse):
     @model_validator(mode="before")
     @classmethod
     def map_fields(cls, data):
+        if isinstance(data, dict):
+            return data
+
         # Handle lat/lon conversion to string, preferring direct fields if available
         lat = getattr(data, "lat", None)
         lon = getattr(data, "lon", None)
-        place_name = getattr(data, "place_name", None)
+        # Rows of `visible_offers` carry the already resolved name
+        place_name = getattr(data, "location_name", None) or getattr(data, "place_name", None)
 
         # If direct fields are missing, try to get them from place or city relations
         if lat is None:
@@ -130,12 +139,36 @@ class OfferMapResponse(BaseResponse):
             elif hasattr(data, "city") and data.city and data.city.name is not None:
                 place_name = data.city.name
 
-        if lat is not None and lon is not None:
-            data.coordinates = Coordinates(lat=lat, lon=lon)
-        if place_name is not None:
-            data.place_name = place_name
+        # Build the fields instead of assigning them to `data`, which would dirty the ORM instance
+        return {
+            "uuid": data.uuid,
+            "coordinates": Coordinates(lat=lat, lon=lon) if lat is not None and lon is not None else None,
+            "place_name": place_name,
+            "description": data.description,
+            "date": data.date,
+        }
 
-        return data
+
+class MapClusterResponse(BaseResponse):
+    lat: float
+    lon: float
+    count: int
+    expansion_zoom: int
+
+
+class MapPointResponse(BaseResponse):
+    uuid: UUID
+    lat: float
+    lon: float
+    place_name: str | None = None
+    description: str | None = None
+    date: dt_date | None = None
+
+
+class MapClustersResponse(BaseResponse):
+    zoom: int
+    clusters: list[MapClusterResponse]
+    offers: list[MapPointResponse]
 
 
 class OfferEmail(BaseResponse):
@@ -148,9 +181,10 @@ class OffersCount(BaseResponse):
 
 class OffersPaginated(BaseResponse):
     data: list[OfferIndexResponse]
-    count: int
+    count: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
 
 
 class RawOfferIndexResponse(BaseResponse):
@@ -175,11 +209,48 @@ class RawOfferIndexResponse(BaseResponse):
 
 class RawOffersPaginated(BaseResponse):
     data: list[RawOfferIndexResponse]
-    count: int
+    count: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+    count_is_estimate: bool = False
+
+
+class OfferExportRow(BaseResponse):
+    uuid: UUID
+    status: OfferStatus
+    source: SourceType | None = None
+    author: str
+    author_uid: str | None = None
+    email: str | None = None
+    offer_uid: str | None = None
+    raw_data: str | None = None
+    description: str | None = None
+    place_name: str | None = None
+    city_name: str | None = None
+    facility_uuid: UUID | None = None
+    city_uuid: UUID | None = None
+    lat: Decimal | None = None
+    lon: Decimal | None = None
+    date: dt_date | None = None
+    hour: dt_time | None = None
+    price: Decimal | None = None
+    invoice: bool | None = None
+    visible: bool | None = None
+    url: str | None = None
+    legal_roles: list[LegalRoleIndexResponse] = []
+    added_at: dt_datetime | None = None
+    valid_to: dt_datetime | None = None
+    created_at: dt_datetime | None = None
+    updated_at: dt_datetime | None = None
 
 
 class SimilarOfferIndexResponse(BaseResponse):
     uuid: UUID
     author: str
+
+
+class DuplicateOfferIndexResponse(SimilarOfferIndexResponse):
+    status: OfferStatus
+    # Estimated Jaccard similarity of the texts' character shingles (0-1)
+    similarity: float
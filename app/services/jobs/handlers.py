@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.core.dependencies import (
+    get_cached_ai_parser,
+    get_email_validator,
+    get_offer_notification_service,
+    get_offer_service,
+    get_visible_offer_repo,
+)
+from app.database.models.enums import JobKind
+from app.infrastructure.ai.parsers.factory import get_ai_parser
+from app.infrastructure.notifications.email.factory import get_email_notifier
+from app.infrastructure.notifications.slack.factory import get_slack_notifier
+from app.repositories.city_repo import CityRepo
+from app.repositories.job_repo import JobRepo
+from app.repositories.legal_role_repo import LegalRoleRepo
+from app.repositories.offer_repo import OfferRepo
+from app.repositories.place_repo import PlaceRepo
+from app.schemas.domain.offer import OfferRawAdd
+from app.services.jobs.worker import DeadLetterHandler, JobHandler
+from app.services.offer_service import OfferService
+
+# AI calls of one worker process, whatever the worker's concurrency
+_parse_slots = asyncio.Semaphore(get_settings().OFFER_PARSE_CONCURRENCY)
+
+
+def offer_service(session: AsyncSession) -> OfferService:
+    """The API's `OfferService` wiring, minus the job queue: inside the worker, imports run inline."""
+    return get_offer_service(
+        offer_repo=OfferRepo(session),
+        place_repo=PlaceRepo(session),
+        city_repo=CityRepo(session),
+        legal_role_repo=LegalRoleRepo(session),
+        ai_parser=get_cached_ai_parser(get_ai_parser(), session),
+        email_validator=get_email_validator(),
+        notification_service=get_offer_notification_service(get_slack_notifier(), get_email_notifier()),
+        visible_offer_repo=get_visible_offer_repo(session),
+        job_repo=None,
+    )
+
+
+async def ingest_raw_offer(payload: dict[str, Any]) -> None:
+    # The batch import skips known `offer_uid`s, so duplicates and re-runs of the same job are no-ops
+    async for session in get_db():
+        await offer_service(session).create_raw_offers([OfferRawAdd.model_validate(payload)])
+
+
+async def parse_raw_offer(payload: dict[str, Any]) -> None:
+    async with _parse_slots:
+        async for session in get_db():
+            await offer_service(session).parse_new_offer(payload["offer_id"])
+
+
+async def store_parse_failure(payload: dict[str, Any], error: str) -> None:
+    async for session in get_db():
+        await offer_service(session).save_parse_failure(payload["offer_id"], error)
+
+
+async def enqueue_offer_parsing() -> None:
+    """Periodic sweep feeding NEW raw offers to `parse_raw_offer`, however they were imported."""
+    settings = get_settings()
+    async for session in get_db():
+        await JobRepo(session).enqueue_offer_parsing(settings.OFFER_PARSE_SWEEP_LIMIT, settings.JOB_MAX_ATTEMPTS)
+
+
+async def fill_minhash_signatures() -> None:
+    """Periodic sweep fingerprinting offers imported without a MinHash signature."""
+    async for session in get_db():
+        await OfferRepo(session).fill_minhash(get_settings().MINHASH_SWEEP_LIMIT)
+
+
+HANDLERS: dict[JobKind, JobHandler] = {
+    JobKind.INGEST_RAW_OFFER: ingest_raw_offer,
+    JobKind.PARSE_RAW_OFFER: parse_raw_offer,
+}
+
+DEAD_LETTER_HANDLERS: dict[JobKind, DeadLetterHandler] = {
+    JobKind.PARSE_RAW_OFFER: store_parse_failure,
+}
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import socket
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import timedelta
+from typing import Any
+
+from loguru import logger
+
+from app.core.database import get_db
+from app.core.lifespan import run_periodically
+from app.database.models.enums import JobKind
+from app.database.models.models import Job
+from app.repositories.job_repo import JobRepo
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+# Called with the payload and the last error when a job of its kind is dead-lettered
+DeadLetterHandler = Callable[[dict[str, Any], str], Awaitable[None]]
+
+
+class JobWorker:
+    """
+    Consumes the `jobs` table with `concurrency` claim loops. Claims skip rows locked by other workers, so
+    throughput scales by starting more worker processes against the same database.
+
+    Handlers run in their own session and must be idempotent: a job whose outcome couldn't be recorded
+    (crash, lost connection) is requeued once its lock times out and runs again. `dead_letter_handlers`
+    record the final failure of a kind's jobs wherever its handler keeps results.
+    """
+
+    def __init__(
+        self,
+        handlers: Mapping[JobKind, JobHandler],
+        concurrency: int,
+        poll_interval_seconds: float,
+        retry_backoff_seconds: int,
+        retry_backoff_max_seconds: int,
+        lock_timeout_seconds: int,
+        worker_id: str | None = None,
+        dead_letter_handlers: Mapping[JobKind, DeadLetterHandler] | None = None,
+    ) -> None:
+        self.handlers = handlers
+        self.dead_letter_handlers = dead_letter_handlers or {}
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retry_backoff_max_seconds = retry_backoff_max_seconds
+        self.lock_timeout = timedelta(seconds=lock_timeout_seconds)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run(self) -> None:
+        logger.info(f"Job worker {self.worker_id} started with concurrency {self.concurrency}")
+        await asyncio.gather(
+            run_periodically(self.release_stale_jobs, self.lock_timeout.total_seconds()),
+            *(self._consume() for _ in range(self.concurrency)),
+        )
+
+    async def _consume(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Claiming a job failed")
+                claimed = False
+            if not claimed:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    async def run_once(self) -> bool:
+        """Claim and process one due job; False when the queue had none."""
+        claimed = False
+        async for session in get_db():
+            repo = JobRepo(session)
+            for job in await repo.claim(1, self.worker_id):
+                claimed = True
+                await self.process(repo, job)
+        return claimed
+
+    async def process(self, repo: JobRepo, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await repo.bury(job.id, f"No handler for {job.kind.name}")
+            return
+
+        try:
+            await handler(job.payload)
+        except Exception as error:
+            message = f"{type(error).__name__}: {error}"
+            if job.attempts >= job.max_attempts:
+                logger.exception(f"Job {job.id} ({job.kind.name}) failed {job.attempts} times, dead-lettering it")
+                await self._dead_lettered(job, message)
+                await repo.bury(job.id, message)
+            else:
+                delay = self.retry_delay(job.attempts)
+                logger.warning(f"Job {job.id} ({job.kind.name}) failed, retrying in {delay}: {message}")
+                await repo.retry(job.id, message, delay)
+            return
+
+        await repo.complete(job.id)
+
+    async def _dead_lettered(self, job: Job, message: str) -> None:
+        dead_letter_handler = self.dead_letter_handlers.get(job.kind)
+        if dead_letter_handler is None:
+            return
+        try:
+            await dead_letter_handler(job.payload, message)
+        except Exception:
+            logger.exception(f"Recording the failure of job {job.id} ({job.kind.name}) failed")
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        """Exponential backoff: the base delay doubled after every failed attempt, capped."""
+        return timedelta(seconds=min(self.retry_backoff_seconds * 2 ** (attempts - 1), self.retry_backoff_max_seconds))
+
+    async def release_stale_jobs(self) -> None:
+        async for session in get_db():
+            released = await JobRepo(session).release_stale(self.lock_timeout)
+            if released:
+                logger.warning(f"Requeued {released} jobs locked for longer than {self.lock_timeout}")
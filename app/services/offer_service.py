@@ -1,31 +1,68 @@
+from collections.abc import AsyncIterator
+from dataclasses import replace
 from datetime import UTC, date, datetime, time
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException
 from loguru import logger
-from sqlalchemy import Sequence
+from pydantic import BaseModel
+from sqlalchemy import Row, Sequence
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
 
+from app.common.minhash import DUPLICATE_THRESHOLD, signature_fields, similarity
+from app.common.spatial.cluster_index import ClusterNode
 from app.core.config import get_settings
-from app.database.models.enums import OfferStatus, SourceType
+from app.core.exceptions import AIParseError
+from app.core.http_cache import Representation
+from app.database.models.enums import JobKind, OfferStatus, SourceType
 from app.database.models.models import Offer
 from app.infrastructure.ai.parsers.base import AIParser
+from app.infrastructure.cache.ttl_cache import TTLCache
 from app.repositories.city_repo import CityRepo
 from app.repositories.filters.offer_filters import OfferFilters
+from app.repositories.job_repo import JobRepo
 from app.repositories.legal_role_repo import LegalRoleRepo
 from app.repositories.offer_repo import OfferRepo
+from app.repositories.pagination import CountMode, Page
 from app.repositories.place_repo import PlaceRepo
+from app.repositories.visible_offer_repo import VisibleOfferRepo
 from app.schemas.domain.ai import ParseResponse
-from app.schemas.domain.offer import OfferAdd, OfferRawAdd, OfferUpdate
+from app.schemas.domain.offer import (
+    DuplicateOfferIndexResponse,
+    OfferAdd,
+    OfferIndexResponse,
+    OfferRawAdd,
+    OfferUpdate,
+    RawOfferIndexResponse,
+    RawOffersImported,
+)
+from app.schemas.domain.place import LegalRoleIndexResponse
 from app.services.email_validation_service import EmailValidationService
+from app.services.offers.active_offer_index import ActiveOfferIndex
+from app.services.offers.map_snapshot import MapFeature, MapPayload, MapSnapshot
 from app.services.offers.offer_date_handler import OfferDateHandler
+from app.services.offers.offer_export import EXPORT_FIELDS, ExportFormat, export_chunks
 from app.services.offers.offer_location_mapper import OfferLocationMapper
 from app.services.offers.offer_notification_service import OfferNotificationService
+from app.services.offers.offer_read_cache import (
+    LEGAL_ROLES,
+    OFFER_DETAIL,
+    RAW_OFFER_DETAIL,
+    OfferReadCache,
+    offer_etag,
+)
 from app.services.offers.offer_role_mapper import OfferRoleMapper
+from app.services.offers.visible_offers_refresher import VisibleOffersRefresher
 
 settings = get_settings()
 
 
+def _projected_fields(response_type: type[BaseModel], fields: list[str] | None) -> list[str]:
+    """Fields of `response_type` to load: the requested ones (all by default) plus the ones it requires."""
+    required = [name for name, field in response_type.model_fields.items() if field.is_required()]
+    return list(dict.fromkeys([*required, *(fields or response_type.model_fields)]))
+
+
 class OfferService:
     def __init__(
         self,
@@ -36,6 +73,13 @@ class OfferService:
         ai_parser: AIParser,
         email_validator: EmailValidationService,
         notification_service: OfferNotificationService,
+        count_cache: TTLCache[int] | None = None,
+        active_offer_index: ActiveOfferIndex | None = None,
+        map_snapshot: MapSnapshot | None = None,
+        read_cache: OfferReadCache | None = None,
+        visible_offer_repo: VisibleOfferRepo | None = None,
+        visible_offers_refresher: VisibleOffersRefresher | None = None,
+        job_repo: JobRepo | None = None,
     ) -> None:
         self.offer_repo = offer_repo
         self.place_repo = place_repo
@@ -44,19 +88,52 @@ class OfferService:
         self.ai_parser = ai_parser
         self.email_validator = email_validator
         self.notification_service = notification_service
+        self.count_cache = count_cache
+        self.active_offer_index = active_offer_index
+        self.map_snapshot = map_snapshot
+        self.read_cache = read_cache
+        self.visible_offer_repo = visible_offer_repo
+        self.visible_offers_refresher = visible_offers_refresher
+        self.job_repo = job_repo
+
+    async def submit_raw_offer(self, offer: OfferRawAdd) -> bool:
+        """
+        Hand the import over to the job worker when the raw offer queue is enabled (returns True), otherwise
+        import the offer inline.
+        """
+        if self.job_repo is None:
+            await self.create_raw_offer(offer)
+            return False
+
+        await self.job_repo.enqueue(JobKind.INGEST_RAW_OFFER, offer.model_dump(mode="json"), settings.JOB_MAX_ATTEMPTS)
+        return True
 
     async def create_raw_offer(self, offer: OfferRawAdd) -> None:
-        db_offer = await self.offer_repo.get_by_offer_uid(offer.offer_uid)
-        if db_offer:
+        # A single `INSERT ... ON CONFLICT DO NOTHING`: known posts cost no prior read and concurrent imports of
+        # the same post can't both insert it
+        if not await self.offer_repo.insert_raw_offers([self._raw_offer_data(offer)]):
             raise HTTPException(status_code=HTTP_409_CONFLICT, detail=f"Offer with {offer.offer_uid} already exists")
 
+        await self._offers_changed()
+        return None
+
+    async def create_raw_offers(self, offers: list[OfferRawAdd]) -> RawOffersImported:
+        """Import a batch of raw offers in one statement; offers whose `offer_uid` is already known are skipped."""
+        inserted = await self.offer_repo.insert_raw_offers([self._raw_offer_data(offer) for offer in offers])
+        if inserted:
+            await self._offers_changed()
+        return RawOffersImported(inserted=len(inserted), skipped=len(offers) - len(inserted))
+
+    @staticmethod
+    def _raw_offer_data(offer: OfferRawAdd) -> dict:
+        # No MinHash signature here: imports can carry a thousand posts, the job worker fingerprints them
         from app.utils.email_utils import extract_and_fix_email
 
         email = None
         if isinstance(offer.raw_data, str):
             email = extract_and_fix_email(offer.raw_data)
 
-        offer_data = {
+        return {
             "uuid": str(uuid4()),
             "author": offer.author,
             "author_uid": offer.author_uid,
@@ -64,22 +141,17 @@ class OfferService:
             "raw_data": offer.raw_data,
             "added_at": offer.timestamp,
             "source": offer.source,
-            "status": OfferStatus.POSTPONED,
+            "email": email or None,
+            "status": OfferStatus.NEW if email else OfferStatus.POSTPONED,
         }
 
-        if email:
-            offer_data["email"] = email
-            offer_data["status"] = OfferStatus.NEW
-
-        await self.offer_repo.create(**offer_data)
-        return None
-
     async def create_offer(self, offer_add: OfferAdd):
         offer_uuid = str(uuid4())
         offer_data = offer_add.model_dump(exclude_unset=True)
         relations = self._extract_offer_relations(offer_data)
 
         offer_data.update(self._system_offer_fields(offer_data, offer_uuid))
+        offer_data.update(signature_fields(offer_data.get("description")))
 
         date_obj, hour_obj = OfferDateHandler.parse_date_hour(relations["date_str"], relations["hour_str"])
         self._apply_datetime_data(offer_data, date_obj, hour_obj)
@@ -95,26 +167,96 @@ class OfferService:
 
         # Notify via Email if conditions met
         new_offer = await self.offer_repo.get_by_uuid(UUID(offer_uuid))
+        # The author looks the new offer up in the public listing right away
+        await self._offers_changed(new_offer, refresh_view=True)
         if self.email_validator.should_send_user_offer_creation_email(new_offer):
             await self.notification_service.send_user_offer_created_email(new_offer)
 
         return None
 
     async def parse_raw_offer(self, offer_uuid: UUID) -> ParseResponse:
-        """Parse raw offer data using the configured AI parser."""
+        """
+        Parse raw offer data using the configured AI parser. A successful result stored by the background
+        pipeline is returned as is; otherwise the parser is called and a successful result stored for next
+        time (a failed one is left for the background pipeline to retry).
+        """
         db_offer = await self.offer_repo.get_by_uuid(offer_uuid)
 
         if not db_offer.raw_data:
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"Offer `{offer_uuid}` has no data to parse!")
 
+        if db_offer.parse_result and db_offer.parse_result.get("success"):
+            return ParseResponse.model_validate(db_offer.parse_result)
+
         try:
-            return await self.ai_parser.parse_offer(db_offer.raw_data)
+            parsed = await self.ai_parser.parse_offer(db_offer.raw_data)
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Error parsing offer {offer_uuid}: {e}")
             return ParseResponse(success=False, error=str(e), data=None)
 
+        if parsed.success:
+            await self.offer_repo.save_parse_result(db_offer.id, parsed.model_dump(mode="json"))
+        return parsed
+
+    async def parse_new_offer(self, offer_id: int) -> None:
+        """
+        Parse a NEW raw offer ahead of moderation and store the `ParseResponse`. A failed parse raises
+        `AIParseError`, so the job is retried with backoff instead of being stored as final; offers moderated
+        or successfully parsed meanwhile are skipped.
+        """
+        db_offer = await self.offer_repo.get_by_id(offer_id)
+        if db_offer is None or db_offer.status != OfferStatus.NEW or not db_offer.raw_data:
+            return
+        if db_offer.parse_result and db_offer.parse_result.get("success"):
+            return
+
+        parsed = await self.ai_parser.parse_offer(db_offer.raw_data)
+        if not parsed.success:
+            raise AIParseError(f"Parsing offer {offer_id} failed: {parsed.error}")
+        await self.offer_repo.save_parse_result(offer_id, parsed.model_dump(mode="json"))
+
+    async def save_parse_failure(self, offer_id: int, error: str) -> None:
+        """
+        Store the final failure of a background parse that ran out of attempts, so the sweep stops enqueuing
+        the offer (a moderator opening it still retries live). A result stored meanwhile is kept.
+        """
+        db_offer = await self.offer_repo.get_by_id(offer_id)
+        if db_offer is None or (db_offer.parse_result and db_offer.parse_result.get("success")):
+            return
+
+        failed = ParseResponse(success=False, error=error)
+        await self.offer_repo.save_parse_result(offer_id, failed.model_dump(mode="json"))
+
+    async def parse_new_offers(self, batch_size: int, limit: int | None = None) -> int:
+        """
+        Drain the parse backlog with the parser's batch mode: up to `limit` NEW offers, `batch_size` per call.
+        Like `parse_new_offer`, only successful results are stored; failed offers stay in the backlog for the
+        next run or the job queue. Returns how many offers were parsed successfully.
+        """
+        parsed_count = 0
+        seen = 0
+        after_id = 0
+        while limit is None or seen < limit:
+            size = batch_size if limit is None else min(batch_size, limit - seen)
+            rows = await self.offer_repo.get_unparsed_new_offers(size, after_id)
+            if not rows:
+                break
+
+            parsed = await self.ai_parser.parse_offers([row.raw_data for row in rows])
+            results = {
+                row.id: response.model_dump(mode="json")
+                for row, response in zip(rows, parsed, strict=True)
+                if response.success
+            }
+            await self.offer_repo.save_parse_results(results)
+            parsed_count += len(results)
+            seen += len(rows)
+            after_id = rows[-1].id
+
+        return parsed_count
+
     async def update_offers(self, offer_uuid: UUID, offer_update: OfferUpdate) -> None:
         db_offer = await self.offer_repo.get_by_uuid(offer_uuid, ["legal_roles", "place"])
 
@@ -126,6 +268,9 @@ class OfferService:
         # Extract special fields
         relations = self._extract_offer_relations(update_data)
         submit_email = update_data.pop("submit_email", None)
+        # Offers entered by users are fingerprinted by their description, imported ones by their raw post
+        if "description" in update_data and not db_offer.raw_data:
+            update_data.update(signature_fields(update_data["description"]))
 
         # Apply basic updates
         for field, value in update_data.items():
@@ -139,6 +284,7 @@ class OfferService:
 
         await self.offer_repo.update(db_offer.id, **update_data)
         updated_offer = await self.offer_repo.get_by_uuid(offer_uuid, [])
+        await self._offers_changed(updated_offer)
 
         # Send email if needed
         if self.email_validator.should_send_offer_email(updated_offer, db_offer, submit_email):
@@ -168,30 +314,146 @@ class OfferService:
             db_offer.city_name = city_name
 
     async def list_map_offers(self, offset: int, limit: int, sort_column: str, sort_order: str, filters: OfferFilters):
-        return await self._get_paginated_offers(offset, limit, sort_column, sort_order, filters, ["place", "city"])
+        return await self._get_paginated_offers(
+            offset, limit, sort_column, sort_order, filters, ["place", "city"], "none", self.visible_offer_repo
+        )
+
+    async def get_map_payload(self) -> MapPayload:
+        snapshot = await self._loaded_map_snapshot()
+        return snapshot.payload()
+
+    async def get_map_clusters(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int
+    ) -> list[ClusterNode[MapFeature]]:
+        snapshot = await self._loaded_map_snapshot()
+        return snapshot.cluster_index().get_clusters(min_lon, min_lat, max_lon, max_lat, zoom)
+
+    async def _loaded_map_snapshot(self) -> MapSnapshot:
+        snapshot = self.map_snapshot or MapSnapshot()
+        if not snapshot.is_ready:
+            await snapshot.load(self.offer_repo)
+        return snapshot
 
     async def list_raw_offers(
-        self, offset: int, limit: int, sort_column: str, sort_order: str, filters: OfferFilters
-    ) -> tuple[Sequence[Offer], int]:
+        self,
+        offset: int,
+        limit: int,
+        sort_column: str,
+        sort_order: str,
+        filters: OfferFilters,
+        count_mode: CountMode = "exact",
+        fields: list[str] | None = None,
+    ) -> Page[Offer | Row]:
         filters.load_relations = ["legal_roles", "place", "city"]
-        filters.search_fields = ["offer_uid", "raw_data", "author"]
         if sort_column == "name":
             sort_column = "author"
 
-        return await self._get_paginated_offers(offset, limit, sort_column, sort_order, filters, ["legal_roles", "place", "city"])
+        return await self._get_paginated_offers(
+            offset, limit, sort_column, sort_order, filters, ["legal_roles", "place", "city"], count_mode,
+            columns=_projected_fields(RawOfferIndexResponse, fields),
+        )
 
     async def list_offers(
-        self, offset: int, limit: int, sort_column: str, sort_order: str, filters: OfferFilters
-    ) -> tuple[Sequence[Offer], int]:
+        self,
+        offset: int,
+        limit: int,
+        sort_column: str,
+        sort_order: str,
+        filters: OfferFilters,
+        count_mode: CountMode = "exact",
+        fields: list[str] | None = None,
+    ) -> Page[Offer | Row]:
         filters.load_relations = ["legal_roles", "place", "city"]
-        return await self._get_paginated_offers(offset, limit, sort_column, sort_order, filters, ["legal_roles", "place", "city"])
+        filters = self._with_indexed_location(filters)
+        return await self._get_paginated_offers(
+            offset, limit, sort_column, sort_order, filters, ["legal_roles", "place", "city"], count_mode,
+            self.visible_offer_repo, _projected_fields(OfferIndexResponse, fields),
+        )
 
     async def _get_paginated_offers(
-        self, offset: int, limit: int, sort_column: str, sort_order: str, filters: OfferFilters, load_relations: list[str]
-    ) -> tuple[Sequence[Offer], int]:
-        return await self.offer_repo.get_offers(
-            offset, limit, sort_column, sort_order, filters, load_relations
+        self,
+        offset: int,
+        limit: int,
+        sort_column: str,
+        sort_order: str,
+        filters: OfferFilters,
+        load_relations: list[str],
+        count_mode: CountMode = "exact",
+        repo: OfferRepo | None = None,
+        columns: list[str] | None = None,
+    ) -> Page[Offer | Row]:
+        """
+        One page from `repo` (the offers table by default), with its total resolved per `count_mode`.
+        `columns` are the fields to select, see `OfferRepo.get_offers`.
+        """
+        repo = repo or self.offer_repo
+        estimate = None
+        if count_mode == "estimate" and not filters.has_conditions:
+            estimate = await self.offer_repo.estimate_count()
+
+        cached_count = self._cached_count(filters) if count_mode != "none" and estimate is None else None
+
+        # Let the repository compute the total alongside the page unless it's already known
+        include_count = count_mode != "none" and estimate is None and cached_count is None
+        page = await repo.get_offers(
+            offset, limit, sort_column, sort_order, filters, load_relations, include_count=include_count, columns=columns
+        )
+
+        if estimate is not None:
+            return replace(page, count=estimate, count_is_estimate=True)
+        if cached_count is not None:
+            return replace(page, count=cached_count)
+
+        if include_count and self.count_cache is not None:
+            self.count_cache.set(filters.count_fingerprint(), page.count)
+        return page
+
+    def _cached_count(self, filters: OfferFilters) -> int | None:
+        if self.count_cache is None:
+            return None
+        return self.count_cache.get(filters.count_fingerprint())
+
+    async def _offers_changed(self, offer: Offer | None = None, refresh_view: bool = False) -> None:
+        """
+        Refresh derived data after any write to offers: cached totals are dropped and, when the written
+        offer is known (its in-session state already reflects the update), the `visible_offers` view is
+        marked stale for the background refresh (or, with `refresh_view`, rebuilt before the request returns),
+        its cached responses are invalidated and the in-memory active offer index and map snapshot follow it.
+        Raw imports (no offer) can't be publicly visible yet.
+        """
+        if offer is not None and self.visible_offer_repo is not None:
+            if refresh_view or self.visible_offers_refresher is None:
+                await self.visible_offer_repo.refresh()
+            else:
+                self.visible_offers_refresher.mark_stale()
+        if self.count_cache is not None:
+            self.count_cache.clear()
+        if offer is None:
+            return
+        if self.read_cache is not None:
+            self.read_cache.invalidate_offer(offer.uuid)
+        if self.active_offer_index is not None or self.map_snapshot is not None:
+            # Offers located only through their place or city must not drop out of the in-memory copies
+            await self.offer_repo.load_location(offer)
+        if self.active_offer_index is not None:
+            self.active_offer_index.offer_changed(offer)
+        if self.map_snapshot is not None:
+            self.map_snapshot.offer_changed(offer)
+
+    def _with_indexed_location(self, filters: OfferFilters) -> OfferFilters:
+        """Resolve the radius filter of an active-offer listing in memory when the index can answer it."""
+        index = self.active_offer_index
+        if not (index and index.is_ready and filters.has_location_filter and filters.status == OfferStatus.ACTIVE):
+            return filters
+
+        offer_ids = index.candidate_ids(
+            float(filters.coordinates.lat), float(filters.coordinates.lon), filters.distance_km, filters.valid_to
         )
+        # Very wide searches are cheaper as an index scan than as a huge IN list
+        if len(offer_ids) > settings.ACTIVE_OFFER_INDEX_MAX_CANDIDATES:
+            return filters
+
+        return filters.model_copy(update={"offer_ids": offer_ids})
 
     async def get_similar_offers(self, offer_uuid: UUID) -> Sequence[Offer]:
         db_offer = await self.offer_repo.get_by_uuid(offer_uuid, ["legal_roles", "place", "city"])
@@ -202,6 +464,29 @@ class OfferService:
 
         return db_offers
 
+    async def get_duplicate_offers(self, offer_uuid: UUID) -> list[DuplicateOfferIndexResponse]:
+        """
+        Near-duplicates of the offer (reposts, edits, re-entries), most similar first. Candidates come from a
+        single LSH band lookup and are kept when their estimated similarity reaches DUPLICATE_THRESHOLD.
+        """
+        source = await self.offer_repo.get_minhash(offer_uuid)
+        if source.minhash is None:
+            return []
+
+        candidates = await self.offer_repo.find_by_minhash_bands(source.minhash_bands, exclude_id=source.id)
+        duplicates = [
+            DuplicateOfferIndexResponse(
+                uuid=candidate.uuid, author=candidate.author, status=candidate.status,
+                similarity=similarity(source.minhash, candidate.minhash),
+            )
+            for candidate in candidates
+        ]
+        return sorted(
+            (duplicate for duplicate in duplicates if duplicate.similarity >= DUPLICATE_THRESHOLD),
+            key=lambda duplicate: duplicate.similarity,
+            reverse=True,
+        )
+
     async def get_offer_email(self, offer_uuid: UUID) -> str:
         db_offer = await self.offer_repo.get_by_uuid(offer_uuid)
         if not db_offer.email:
@@ -212,6 +497,49 @@ class OfferService:
     async def get_offer_by_id(self, offer_uuid: UUID) -> Offer:
         return await self.offer_repo.get_by_uuid(offer_uuid, ["legal_roles", "place", "city"])
 
+    async def get_offer_response(self, offer_uuid: UUID, if_none_match: str | None = None) -> Representation:
+        return await self._cached_response(
+            (OFFER_DETAIL, offer_uuid),
+            OfferIndexResponse,
+            lambda: self.get_offer_by_id(offer_uuid),
+            lambda offer: offer_etag(OFFER_DETAIL, offer),
+            if_none_match,
+        )
+
+    async def get_raw_offer_response(self, offer_uuid: UUID, if_none_match: str | None = None) -> Representation:
+        return await self._cached_response(
+            (RAW_OFFER_DETAIL, offer_uuid),
+            RawOfferIndexResponse,
+            lambda: self.get_offer_by_id(offer_uuid),
+            lambda offer: offer_etag(RAW_OFFER_DETAIL, offer),
+            if_none_match,
+        )
+
+    async def get_legal_roles_response(self) -> Representation:
+        return await self._cached_response((LEGAL_ROLES,), list[LegalRoleIndexResponse], self.get_legal_roles)
+
+    async def _cached_response(self, key: tuple, response_type, build, etag=None, if_none_match=None) -> Representation:
+        """Serialized JSON of a read response, served from the read cache when one is configured."""
+        read_cache = self.read_cache or OfferReadCache(ttl_seconds=0)
+        return await read_cache.get_or_build(key, response_type, build, etag, if_none_match)
+
+    def export_offers(self, export_format: ExportFormat, filters: OfferFilters) -> AsyncIterator[bytes]:
+        """All offers matching `filters` (raw data included), encoded chunk by chunk as they are streamed."""
+        return export_chunks(self.offer_repo.stream_rows(EXPORT_FIELDS, filters), export_format)
+
+    async def get_offers_version(self) -> datetime | None:
+        """Latest modification time over all offers; every insert and update moves it forward."""
+        return await self.offer_repo.get_last_updated_at()
+
+    async def get_visible_offers_version(self) -> datetime | None:
+        """
+        Version of the public listings: the last `visible_offers` refresh when the view serves them, since
+        offer writes only reach the view with its next (debounced) refresh.
+        """
+        if self.visible_offer_repo is not None:
+            return await self.visible_offer_repo.get_refreshed_at()
+        return await self.get_offers_version()
+
     async def accept_raw_offer(self, offer_uuid: UUID) -> None:
         db_offer = await self.offer_repo.get_by_uuid(offer_uuid)
         if db_offer.status == OfferStatus.REJECTED:
@@ -219,12 +547,14 @@ class OfferService:
         if db_offer.status == OfferStatus.ACTIVE:
             return None
         await self.offer_repo.update(db_offer.id, **{"status": OfferStatus.ACTIVE})
+        await self._offers_changed(db_offer)
 
         return None
 
     async def reject_raw_offer(self, offer_uuid: UUID) -> None:
         db_offer = await self.offer_repo.get_by_uuid(offer_uuid)
         await self.offer_repo.update(db_offer.id, **{"status": OfferStatus.REJECTED})
+        await self._offers_changed(db_offer)
 
         return None
 
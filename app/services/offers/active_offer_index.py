@@ -0,0 +1,104 @@
+import time
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+
+from loguru import logger
+from sqlalchemy import inspect
+
+from app.common.spatial.grid_index import GridIndex
+from app.database.models.enums import OfferStatus
+from app.database.models.models import Offer
+from app.repositories.offer_repo import OfferRepo
+from app.utils.timestamp_utils import as_utc
+
+# Public listings hide offers that expired more than this long ago
+VISIBILITY_GRACE = timedelta(hours=12)
+
+
+def offer_location(offer: Offer) -> tuple[float, float] | None:
+    """
+    The offer's coordinates, falling back to its place's, then its city's: the precedence of the
+    `visible_offers` view and `OfferRepo.get_map_rows`. Relations are only consulted when already
+    loaded, never lazy-loaded.
+    """
+    unloaded = inspect(offer).unloaded
+    place = offer.place if "place" not in unloaded else None
+    city = offer.city if "city" not in unloaded else None
+
+    lat = next((value for value in (offer.lat, place and place.lat, city and city.lat) if value is not None), None)
+    lon = next((value for value in (offer.lon, place and place.lon, city and city.lon) if value is not None), None)
+    if lat is None or lon is None:
+        return None
+    return float(lat), float(lon)
+
+
+class ActiveOfferIndex:
+    """
+    Process-local grid over the coordinates of active offers, answering radius filters of the public
+    listing without trigonometry in SQL. Writes made through this process are applied immediately;
+    writes made elsewhere show up on the next periodic `load`.
+    """
+
+    def __init__(self, cell_degrees: float = 0.5) -> None:
+        self.cell_degrees = cell_degrees
+        self.grid = GridIndex(cell_degrees)
+        self.valid_to: dict[int, datetime] = {}
+        self.loaded_at: float | None = None
+        self._loading = False
+        self._writes_during_load: list[Offer] = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    async def load(self, offer_repo: OfferRepo) -> None:
+        start_time = time.perf_counter()
+        self._loading = True
+        self._writes_during_load = []
+        try:
+            rows = await offer_repo.get_active_locations(datetime.now(UTC) - VISIBILITY_GRACE)
+
+            grid = GridIndex(self.cell_degrees)
+            valid_to = {}
+            for row in rows:
+                grid.upsert(row.id, float(row.lat), float(row.lon))
+                valid_to[row.id] = as_utc(row.valid_to)
+
+            self.grid, self.valid_to = grid, valid_to
+            # Offers written while the snapshot was being read may be missing from it or outdated
+            for offer in self._writes_during_load:
+                self.offer_changed(offer)
+            self.loaded_at = time.monotonic()
+        finally:
+            self._loading = False
+            self._writes_during_load = []
+
+        logger.info(f"Active offer index loaded {len(self.grid)} offers in {time.perf_counter() - start_time:.2f}s")
+
+    def offer_changed(self, offer: Offer) -> None:
+        if self._loading:
+            self._writes_during_load.append(offer)
+
+        location = offer_location(offer) if offer.status == OfferStatus.ACTIVE and offer.valid_to else None
+        if location is not None:
+            self.grid.upsert(offer.id, *location)
+            self.valid_to[offer.id] = as_utc(offer.valid_to)
+        else:
+            self.grid.remove(offer.id)
+            self.valid_to.pop(offer.id, None)
+
+    def candidate_ids(self, lat: float, lon: float, distance_km: float, valid_after: datetime | None = None) -> list[int]:
+        ids = self.grid.within(lat, lon, distance_km)
+        if valid_after is None:
+            return ids
+
+        valid_after = as_utc(valid_after)
+        return [offer_id for offer_id in ids if self.valid_to[offer_id] > valid_after]
+
+
+@lru_cache
+def get_active_offer_index() -> ActiveOfferIndex:
+    return ActiveOfferIndex()
@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import inspect
+
+from app.common.spatial.cluster_index import ClusterIndex
+from app.database.models.enums import OfferStatus
+from app.database.models.models import Offer
+from app.repositories.offer_repo import OfferRepo
+from app.services.offers.active_offer_index import VISIBILITY_GRACE, offer_location
+from app.utils.timestamp_utils import as_utc
+
+
+@dataclass(frozen=True, slots=True)
+class MapFeature:
+    offer_id: int
+    lat: float
+    lon: float
+    valid_to: datetime
+    properties: dict[str, Any]
+
+    def to_geojson(self) -> dict[str, Any]:
+        return {
+            "type": "Feature",
+            "id": self.properties["uuid"],
+            "geometry": {"type": "Point", "coordinates": [self.lon, self.lat]},
+            "properties": self.properties,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class MapPayload:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    feature_count: int
+
+
+class MapSnapshot:
+    """
+    Prebuilt GeoJSON FeatureCollection of every active, located offer.
+
+    Features are kept per offer and patched on writes; the serialized (and gzipped) payload and the
+    cluster index are rebuilt lazily on the next read after a change. The payload's content hash is its
+    strong ETag.
+    """
+
+    def __init__(self) -> None:
+        self.features: dict[int, MapFeature] = {}
+        self.loaded_at: float | None = None
+        self.version = 0
+        self._payload: MapPayload | None = None
+        self._clusters: ClusterIndex[MapFeature] | None = None
+        self._loading = False
+        self._writes_during_load: list[Offer] = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self.loaded_at is not None
+
+    async def load(self, offer_repo: OfferRepo) -> None:
+        start_time = time.perf_counter()
+        self._loading = True
+        self._writes_during_load = []
+        try:
+            rows = await offer_repo.get_map_rows(datetime.now(UTC) - VISIBILITY_GRACE)
+            self.features = {
+                row.id: MapFeature(
+                    offer_id=row.id,
+                    lat=float(row.lat),
+                    lon=float(row.lon),
+                    valid_to=as_utc(row.valid_to),
+                    properties=self._properties(row.uuid, row.place_name, row.description, row.date),
+                )
+                for row in rows
+            }
+            for offer in self._writes_during_load:
+                self.offer_changed(offer)
+            self._changed()
+            self.loaded_at = time.monotonic()
+        finally:
+            self._loading = False
+            self._writes_during_load = []
+
+        logger.info(f"Map snapshot loaded {len(self.features)} offers in {time.perf_counter() - start_time:.2f}s")
+
+    def offer_changed(self, offer: Offer) -> None:
+        if self._loading:
+            self._writes_during_load.append(offer)
+
+        feature = self._feature_from_offer(offer)
+        if feature is None:
+            if self.features.pop(offer.id, None) is not None:
+                self._changed()
+            return
+
+        if self.features.get(offer.id) != feature:
+            self.features[offer.id] = feature
+            self._changed()
+
+    def visible_features(self) -> list[MapFeature]:
+        self._drop_expired()
+        return list(self.features.values())
+
+    def payload(self) -> MapPayload:
+        self._drop_expired()
+        if self._payload is None:
+            body = json.dumps(
+                {"type": "FeatureCollection", "features": [feature.to_geojson() for feature in self.features.values()]},
+                separators=(",", ":"),
+                ensure_ascii=False,
+            ).encode()
+            self._payload = MapPayload(
+                body=body,
+                gzip_body=gzip.compress(body, compresslevel=6, mtime=0),
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                feature_count=len(self.features),
+            )
+        return self._payload
+
+    def cluster_index(self) -> ClusterIndex[MapFeature]:
+        self._drop_expired()
+        if self._clusters is None:
+            self._clusters = ClusterIndex((feature.lat, feature.lon, feature) for feature in self.features.values())
+        return self._clusters
+
+    def _drop_expired(self) -> None:
+        threshold = datetime.now(UTC) - VISIBILITY_GRACE
+        expired = [offer_id for offer_id, feature in self.features.items() if feature.valid_to <= threshold]
+        for offer_id in expired:
+            del self.features[offer_id]
+        if expired:
+            self._changed()
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._payload = None
+        self._clusters = None
+
+    def _feature_from_offer(self, offer: Offer) -> MapFeature | None:
+        if offer.status != OfferStatus.ACTIVE or offer.valid_to is None:
+            return None
+
+        location = offer_location(offer)
+        if location is None:
+            return None
+
+        # Relations are only consulted when already loaded, never lazy-loaded
+        unloaded = inspect(offer).unloaded
+        place = offer.place if "place" not in unloaded else None
+        city = offer.city if "city" not in unloaded else None
+        # Same precedence as `OfferRepo.get_map_rows`, so a full reload doesn't change the feature
+        place_name = offer.place_name or (place and place.name) or (city and city.name)
+        return MapFeature(
+            offer_id=offer.id,
+            lat=location[0],
+            lon=location[1],
+            valid_to=as_utc(offer.valid_to),
+            properties=self._properties(offer.uuid, place_name, offer.description, offer.date),
+        )
+
+    @staticmethod
+    def _properties(uuid, place_name: str | None, description: str | None, date) -> dict[str, Any]:
+        return {
+            "uuid": str(uuid),
+            "place_name": place_name,
+            "description": description,
+            "date": date.isoformat() if date else None,
+        }
+
+
+@lru_cache
+def get_map_snapshot() -> MapSnapshot:
+    return MapSnapshot()
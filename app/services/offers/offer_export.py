@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal
+
+from sqlalchemy import Row
+
+from app.core.responses import type_adapter
+from app.schemas.domain.offer import OfferExportRow
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_FIELDS = list(OfferExportRow.model_fields)
+
+
+async def export_chunks(batches: AsyncIterator[Sequence[Row]], export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """One encoded chunk per batch of rows (CSV starts with its header line)."""
+    if export_format == "csv":
+        yield _csv_lines([EXPORT_FIELDS])
+
+    encode = _csv if export_format == "csv" else _ndjson
+
+    async for batch in batches:
+        yield encode(type_adapter(list[OfferExportRow]).validate_python(batch, from_attributes=True))
+
+
+def _ndjson(rows: list[OfferExportRow]) -> bytes:
+    adapter = type_adapter(OfferExportRow)
+    return b"".join(adapter.dump_json(row) + b"\n" for row in rows)
+
+
+def _csv(rows: list[OfferExportRow]) -> bytes:
+    return _csv_lines([_csv_value(value) for value in row.model_dump(mode="json").values()] for row in rows)
+
+
+def _csv_lines(lines) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+    return buffer.getvalue().encode()
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list | dict):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
@@ -0,0 +1,81 @@
+from collections.abc import Awaitable, Callable, Hashable
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from app.core.config import get_settings
+from app.core.http_cache import Representation, content_etag, etag_matches, version_token, weak_etag
+from app.core.responses import type_adapter
+from app.database.models.models import Offer
+from app.infrastructure.cache.ttl_cache import TTLCache
+
+OFFER_DETAIL = "offer"
+RAW_OFFER_DETAIL = "raw_offer"
+LEGAL_ROLES = "legal_roles"
+
+
+def offer_etag(kind: str, offer: Offer) -> str:
+    return weak_etag(kind, offer.uuid.hex, version_token(offer.updated_at))
+
+
+class OfferReadCache:
+    """
+    Bounded LRU of serialized read responses (offer detail, raw offer detail, legal roles) and their ETags.
+
+    Entries are dropped explicitly by the service write paths through `invalidate_offer`; the TTL only
+    bounds how stale a response can get when another process wrote the offer.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = 2048) -> None:
+        self._cache = TTLCache[Representation](ttl_seconds=ttl_seconds, max_size=max_size)
+        # Bumped on every invalidation so a read that raced a write does not store what it loaded before it
+        self._generation = 0
+
+    async def get_or_build(
+        self,
+        key: Hashable,
+        response_type: Any,
+        build: Callable[[], Awaitable[Any]],
+        etag: Callable[[Any], str] | None = None,
+        if_none_match: str | None = None,
+    ) -> Representation:
+        """
+        Cached representation under `key`, or one built from `build()`. With an `etag` function a miss whose
+        validator matches `if_none_match` returns without a body: nothing is serialized or stored. Without
+        one, the ETag is a hash of the serialized body.
+        """
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self._generation
+        value = await build()
+        if etag is not None and etag_matches(if_none_match, tag := etag(value)):
+            return Representation(etag=tag)
+
+        adapter = type_adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        representation = Representation(etag=etag(value) if etag is not None else content_etag(body), body=body)
+        if generation == self._generation:
+            self._cache.set(key, representation)
+        return representation
+
+    def invalidate_offer(self, offer_uuid: UUID) -> None:
+        self._generation += 1
+        self._cache.delete((OFFER_DETAIL, offer_uuid))
+        self._cache.delete((RAW_OFFER_DETAIL, offer_uuid))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._cache.stats()
+
+
+@lru_cache
+def get_offer_read_cache() -> OfferReadCache:
+    settings = get_settings()
+    return OfferReadCache(
+        ttl_seconds=settings.OFFER_READ_CACHE_TTL_SECONDS, max_size=settings.OFFER_READ_CACHE_MAX_ENTRIES
+    )
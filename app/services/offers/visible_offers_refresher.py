@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+from app.repositories.visible_offer_repo import VisibleOfferRepo
+
+
+class VisibleOffersRefresher:
+    """
+    Coalesces refreshes of the `visible_offers` view: writes only mark it stale, and a background task
+    rebuilds it once per tick however many writes came in meanwhile.
+    """
+
+    def __init__(self) -> None:
+        self.stale = False
+
+    def mark_stale(self) -> None:
+        self.stale = True
+
+    async def refresh_if_stale(self, repo: VisibleOfferRepo) -> bool:
+        if not self.stale:
+            return False
+
+        # Cleared first: a write landing while the view is rebuilt marks it stale again
+        self.stale = False
+        try:
+            await repo.refresh()
+        except Exception:
+            self.stale = True
+            raise
+        return True
+
+
+@lru_cache
+def get_visible_offers_refresher() -> VisibleOffersRefresher:
+    return VisibleOffersRefresher()
@@ -9,6 +9,7 @@ from app.core.protocols import CityRepoProtocol, PlaceRepoProtocol
 from app.database.models.models import City, Place
 from app.schemas.domain.place import CityAdd, PlaceAdd
 from app.services.places.city_mapper import CityMapper
+from app.services.places.gazetteer import CityEntry, GazetteerIndex, PlaceEntry
 from app.services.places.place_mapper import PlaceMapper
 
 
@@ -17,9 +18,11 @@ class PlaceService:
         self,
         city_repo: CityRepoProtocol,
         place_repo: PlaceRepoProtocol,
+        gazetteer: GazetteerIndex | None = None,
     ) -> None:
         self.city_repo = city_repo
         self.place_repo = place_repo
+        self.gazetteer = gazetteer
 
     async def get_place_by_uuid(self, place_uuid: UUID) -> Place:
         db_place = await self.place_repo.get_by_uuid(place_uuid)
@@ -47,7 +50,9 @@ class PlaceService:
             # raise HTTPException(status_code=HTTP_409_CONFLICT, detail=f"Place `{place_add.name}` already exists" )
 
         place_data = PlaceMapper.map_to_db_dict(place_add)
-        await self.place_repo.create(**place_data)
+        db_place = await self.place_repo.create(**place_data)
+        if self.gazetteer:
+            self.gazetteer.add_place(db_place)
 
         return None
 
@@ -58,14 +63,20 @@ class PlaceService:
             raise ConflictError(f"City `{city.city_name} - {city.state}` already exists as {db_city.uuid}")
 
         city_data = CityMapper.map_to_db_dict(city)
-        await self.city_repo.create(**city_data)
+        db_city = await self.city_repo.create(**city_data)
+        if self.gazetteer:
+            self.gazetteer.add_city(db_city)
 
         return None
 
-    async def get_cities(self, city_name: str) -> Sequence[City]:
+    async def get_cities(self, city_name: str) -> Sequence[City | CityEntry]:
         sanitized_name = sanitize_name(city_name)
+        if self.gazetteer and self.gazetteer.is_ready:
+            return self.gazetteer.search_cities(sanitized_name)
         return await self.city_repo.get_by_partial_name(sanitized_name)
 
-    async def get_facilities(self, city_name: str, place_type: str | None = None) -> Sequence[Place]:
+    async def get_facilities(self, city_name: str, place_type: str | None = None) -> Sequence[Place | PlaceEntry]:
         sanitized_name = sanitize_name(city_name)
+        if self.gazetteer and self.gazetteer.is_ready:
+            return self.gazetteer.search_places(sanitized_name, place_type)
         return await self.place_repo.get_by_partial_name(sanitized_name, place_type)
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import Row
+
+from app.common.name_index import NameIndex
+from app.core.protocols import CityRepoProtocol, PlaceRepoProtocol
+from app.database.models.enums import PlaceCategory
+from app.database.models.models import City, Place
+
+CITY_LIMIT = 5
+PLACE_LIMIT = 7
+
+
+@dataclass(frozen=True, slots=True)
+class CityEntry:
+    uuid: UUID
+    name: str
+    name_ascii: str
+    lat: float | None
+    lon: float | None
+    voivodeship_name: str | None
+    importance: float | None
+    population: int | None
+
+    @classmethod
+    def from_model(cls, city: City | Row) -> "CityEntry":
+        return cls(
+            uuid=city.uuid,
+            name=city.name,
+            name_ascii=city.name_ascii,
+            lat=_to_float(city.lat),
+            lon=_to_float(city.lon),
+            voivodeship_name=city.voivodeship_name,
+            importance=city.importance,
+            population=city.population,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PlaceEntry:
+    uuid: UUID
+    name: str | None
+    name_ascii: str | None
+    category: PlaceCategory
+    type: str | None
+    city: str | None
+    street_name: str | None
+    street_number: str | None
+
+    @classmethod
+    def from_model(cls, place: Place | Row) -> "PlaceEntry":
+        return cls(
+            uuid=place.uuid,
+            name=place.name,
+            name_ascii=place.name_ascii,
+            category=place.category,
+            type=place.type,
+            city=place.city,
+            street_name=place.street_name,
+            street_number=place.street_number,
+        )
+
+
+def _to_float(value: Any) -> float | None:
+    return float(value) if value is not None else None
+
+
+def _city_rank(city: CityEntry) -> tuple[float, ...]:
+    return city.importance or 0.0, float(city.population or 0)
+
+
+def _place_rank(place: PlaceEntry) -> tuple[float, ...]:
+    return ()
+
+
+class GazetteerIndex:
+    """
+    Process-local autocomplete index over cities and places, so `/places/city` and `/places/facility`
+    are answered from memory. Writes made through this process are applied immediately; rows inserted or
+    deleted elsewhere show up on the next periodic `load`, which skips the rebuild while both tables keep
+    their row count and highest id.
+    """
+
+    def __init__(self) -> None:
+        self.cities: NameIndex[CityEntry] = self._new_city_index()
+        self.places: NameIndex[PlaceEntry] = self._new_place_index()
+        self.loaded_at: float | None = None
+        self.version: tuple[Any, ...] | None = None
+        self._load_started_at: float | None = None
+        self._writes_during_load: list[CityEntry | PlaceEntry] = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self.loaded_at is not None
+
+    async def load(self, city_repo: CityRepoProtocol, place_repo: PlaceRepoProtocol) -> None:
+        start_time = time.perf_counter()
+        version = (await city_repo.get_version(), await place_repo.get_version())
+        if self.is_ready and version == self.version:
+            return
+
+        self._load_started_at = time.monotonic()
+        self._writes_during_load = []
+        try:
+            city_rows = await city_repo.get_gazetteer_rows()
+            place_rows = await place_repo.get_gazetteer_rows()
+
+            # Building the trigram postings is CPU-bound over the whole gazetteer: keep it off the event loop
+            city_index, place_index = await asyncio.to_thread(self._build, city_rows, place_rows)
+
+            # Rows created while the snapshot was being read may be missing from it
+            for entry in self._writes_during_load:
+                (city_index if isinstance(entry, CityEntry) else place_index).add(entry)
+
+            self.cities, self.places = city_index, place_index
+            self.version = version
+            self.loaded_at = time.monotonic()
+        finally:
+            self._load_started_at = None
+            self._writes_during_load = []
+
+        logger.info(
+            f"Gazetteer index loaded {len(self.cities)} cities and {len(self.places)} places "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+
+    def add_city(self, city: City) -> None:
+        self._add(CityEntry.from_model(city), self.cities)
+
+    def add_place(self, place: Place) -> None:
+        self._add(PlaceEntry.from_model(place), self.places)
+
+    def search_cities(self, name: str, limit: int = CITY_LIMIT) -> list[CityEntry]:
+        return self.cities.search(name, limit)
+
+    def search_places(self, name: str, place_type: str | None = None, limit: int = PLACE_LIMIT) -> list[PlaceEntry]:
+        predicate = (lambda place: place.type == place_type) if place_type else None
+        return self.places.search(name, limit, predicate)
+
+    def _add(self, entry: CityEntry | PlaceEntry, index: NameIndex[Any]) -> None:
+        if self._load_started_at is not None:
+            self._writes_during_load.append(entry)
+        index.add(entry)
+
+    @classmethod
+    def _build(
+        cls, city_rows: Sequence[Row], place_rows: Sequence[Row]
+    ) -> tuple[NameIndex[CityEntry], NameIndex[PlaceEntry]]:
+        city_index = cls._new_city_index()
+        city_index.rebuild(CityEntry.from_model(row) for row in city_rows)
+        place_index = cls._new_place_index()
+        place_index.rebuild(PlaceEntry.from_model(row) for row in place_rows)
+        return city_index, place_index
+
+    @staticmethod
+    def _new_city_index() -> NameIndex[CityEntry]:
+        return NameIndex(key=lambda city: city.name_ascii, identity=lambda city: city.uuid, rank=_city_rank)
+
+    @staticmethod
+    def _new_place_index() -> NameIndex[PlaceEntry]:
+        return NameIndex(key=lambda place: place.name_ascii, identity=lambda place: place.uuid, rank=_place_rank)
+
+
+@lru_cache
+def get_gazetteer_index() -> GazetteerIndex:
+    return GazetteerIndex()
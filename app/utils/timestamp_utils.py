@@ -29,3 +29,8 @@ def extract_timestamp_from_filename(filename: str) -> datetime:
         )
     except Exception:
         return datetime.now(UTC)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
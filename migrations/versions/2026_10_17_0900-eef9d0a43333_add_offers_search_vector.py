@@ -0,0 +1,87 @@
+"""add Offers full-text search vector
+
+Revision ID: eef9d0a43333
+Revises: 73a219a8e6b8
+Create Date: 2026-10-17 09:00:12.418305
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'eef9d0a43333'
+down_revision: Union[str, Sequence[str], None] = '73a219a8e6b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    # Postgres ships no Polish snowball stemmer, so fold diacritics (ą -> a, ł -> l) on top of `simple`
+    op.execute("CREATE TEXT SEARCH CONFIGURATION public.pl_unaccent (COPY = pg_catalog.simple)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION public.pl_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH public.unaccent, pg_catalog.simple"
+    )
+
+    op.execute("""
+        CREATE FUNCTION public.offers_search_document(
+            description text, place_name text, city_name text, author text, raw_data text, offer_uid text
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('public.pl_unaccent', coalesce(description, '')), 'A')
+                || setweight(to_tsvector('public.pl_unaccent', concat_ws(' ', place_name, city_name)), 'B')
+                || setweight(to_tsvector('public.pl_unaccent', coalesce(author, '')), 'C')
+                || setweight(to_tsvector('public.pl_unaccent', concat_ws(' ', raw_data, offer_uid)), 'D')
+        $$
+    """)
+
+    # Turns free text into an AND of prefix terms. Compound tokens (e.g. `o-abc-123`) are dropped in favour of
+    # their parts, so a search matches any document that was tokenized with the same configuration.
+    op.execute("""
+        CREATE FUNCTION public.offers_search_query(q text) RETURNS tsquery LANGUAGE sql STABLE AS $$
+            SELECT string_agg(quote_literal(lexeme) || ':*', ' & ')::tsquery
+            FROM (
+                SELECT unnest(lexemes) AS lexeme
+                FROM ts_debug('public.pl_unaccent', q)
+                WHERE alias NOT IN ('asciihword', 'hword', 'numhword')
+            ) AS terms
+        $$
+    """)
+
+    op.add_column("offers", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+
+    op.execute("""
+        CREATE FUNCTION public.offers_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := public.offers_search_document(
+                NEW.description, NEW.place_name, NEW.city_name, NEW.author, NEW.raw_data, NEW.offer_uid
+            );
+            RETURN NEW;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_offers_search_vector
+        BEFORE INSERT OR UPDATE OF description, place_name, city_name, author, raw_data, offer_uid ON offers
+        FOR EACH ROW EXECUTE FUNCTION public.offers_search_vector_refresh()
+    """)
+
+    op.execute(
+        "UPDATE offers SET search_vector = "
+        "public.offers_search_document(description, place_name, city_name, author, raw_data, offer_uid)"
+    )
+
+    op.create_index("ix_offers_search_vector", "offers", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_offers_search_vector", table_name="offers")
+    op.execute("DROP TRIGGER IF EXISTS trg_offers_search_vector ON offers")
+    op.execute("DROP FUNCTION IF EXISTS public.offers_search_vector_refresh()")
+    op.drop_column("offers", "search_vector")
+    op.execute("DROP FUNCTION IF EXISTS public.offers_search_query(text)")
+    op.execute("DROP FUNCTION IF EXISTS public.offers_search_document(text, text, text, text, text, text)")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS public.pl_unaccent")
@@ -0,0 +1,34 @@
+"""add trigram indexes on Cities and Places name_ascii
+
+Revision ID: 70fc9140b669
+Revises: eef9d0a43333
+Create Date: 2026-10-17 09:30:41.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '70fc9140b669'
+down_revision: Union[str, Sequence[str], None] = 'eef9d0a43333'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Serve both `name_ascii ILIKE '%x%'` and `name_ascii % 'x'` (similarity) from one index
+    op.create_index(
+        "ix_cities_name_ascii_trgm", "cities", ["name_ascii"],
+        postgresql_using="gin", postgresql_ops={"name_ascii": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_places_name_ascii_trgm", "places", ["name_ascii"],
+        postgresql_using="gin", postgresql_ops={"name_ascii": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_places_name_ascii_trgm", table_name="places")
+    op.drop_index("ix_cities_name_ascii_trgm", table_name="cities")
@@ -0,0 +1,45 @@
+"""add earthdistance GiST indexes on Offers and Places coordinates
+
+Revision ID: 3b8d0e6f2c41
+Revises: 70fc9140b669
+Create Date: 2026-10-17 10:00:27.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '3b8d0e6f2c41'
+down_revision: Union[str, Sequence[str], None] = '70fc9140b669'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+
+    # Same cube as ll_to_earth(), but with a SQL-standard body and qualified names: references are bound
+    # now, so the index expression still resolves when maintenance commands (VACUUM, REINDEX, pg_restore)
+    # run with a restricted search_path
+    op.execute("""
+        CREATE FUNCTION public.geo_point(lat numeric, lon numeric) RETURNS public.earth
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+        RETURN public.cube(
+            public.cube(
+                public.cube(public.earth() * cos(radians(lat::float8)) * cos(radians(lon::float8))),
+                public.earth() * cos(radians(lat::float8)) * sin(radians(lon::float8))
+            ),
+            public.earth() * sin(radians(lat::float8))
+        )::public.earth
+    """)
+
+    # Building the expression indexes covers every existing row, no separate backfill is needed
+    op.execute("CREATE INDEX ix_offers_geo_point ON offers USING gist (public.geo_point(lat, lon))")
+    op.execute("CREATE INDEX ix_places_geo_point ON places USING gist (public.geo_point(lat, lon))")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_places_geo_point")
+    op.execute("DROP INDEX IF EXISTS ix_offers_geo_point")
+    op.execute("DROP FUNCTION IF EXISTS public.geo_point(numeric, numeric)")
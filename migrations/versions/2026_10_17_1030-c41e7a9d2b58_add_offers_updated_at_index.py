@@ -0,0 +1,24 @@
+"""add index on Offers updated_at
+
+Revision ID: c41e7a9d2b58
+Revises: 3b8d0e6f2c41
+Create Date: 2026-10-17 10:30:12.448190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'c41e7a9d2b58'
+down_revision: Union[str, Sequence[str], None] = '3b8d0e6f2c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # `max(updated_at)` is the collection version behind listing ETags; the index makes it a single lookup
+    op.create_index("ix_offers_updated_at", "offers", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_offers_updated_at", table_name="offers")
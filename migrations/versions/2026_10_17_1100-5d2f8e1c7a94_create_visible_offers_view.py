@@ -0,0 +1,70 @@
+"""create visible_offers materialized view
+
+Revision ID: 5d2f8e1c7a94
+Revises: c41e7a9d2b58
+Create Date: 2026-10-17 11:00:37.215604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '5d2f8e1c7a94'
+down_revision: Union[str, Sequence[str], None] = 'c41e7a9d2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Publicly visible offers with place/city and legal roles already resolved. Readers still apply the
+    # `valid_to` threshold themselves: rows only ever leave the visible set with time, never join it.
+    op.execute("""
+        CREATE MATERIALIZED VIEW public.visible_offers AS
+        SELECT
+            o.id,
+            o.uuid,
+            o.author,
+            o.status,
+            o.place_name,
+            o.city_name,
+            c.uuid AS city_uuid,
+            p.uuid AS facility_uuid,
+            o.date,
+            o.hour,
+            o.price,
+            o.description,
+            o.invoice,
+            o.added_at,
+            o.valid_to,
+            o.created_at,
+            o.search_vector,
+            COALESCE(o.lat, p.lat, c.lat) AS lat,
+            COALESCE(o.lon, p.lon, c.lon) AS lon,
+            COALESCE(o.place_name, p.name, c.name) AS location_name,
+            COALESCE(roles.legal_role_uuids, '{}') AS legal_role_uuids,
+            COALESCE(roles.legal_roles, '[]') AS legal_roles
+        FROM public.offers o
+        LEFT JOIN public.places p ON p.id = o.place_id
+        LEFT JOIN public.cities c ON c.id = o.city_id
+        LEFT JOIN LATERAL (
+            SELECT
+                array_agg(lr.uuid ORDER BY lr.name) AS legal_role_uuids,
+                jsonb_agg(jsonb_build_object('uuid', lr.uuid, 'name', lr.name) ORDER BY lr.name) AS legal_roles
+            FROM public.offers_legal_roles_link link
+            JOIN public.legal_roles lr ON lr.id = link.legal_role_id
+            WHERE link.offer_id = o.id
+        ) roles ON true
+        WHERE o.status = 'ACTIVE' AND o.valid_to > now() - interval '12 hours'
+    """)
+
+    # REFRESH ... CONCURRENTLY requires a unique index
+    op.create_index("ux_visible_offers_id", "visible_offers", ["id"], unique=True)
+    op.create_index("ix_visible_offers_valid_to", "visible_offers", ["valid_to", "id"])
+    op.create_index("ix_visible_offers_created_at", "visible_offers", ["created_at", "id"])
+    op.create_index("ix_visible_offers_search_vector", "visible_offers", ["search_vector"], postgresql_using="gin")
+    op.create_index("ix_visible_offers_legal_role_uuids", "visible_offers", ["legal_role_uuids"], postgresql_using="gin")
+    op.execute("CREATE INDEX ix_visible_offers_geo_point ON public.visible_offers USING gist (public.geo_point(lat, lon))")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS public.visible_offers")
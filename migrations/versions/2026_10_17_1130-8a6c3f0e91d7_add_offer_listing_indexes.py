@@ -0,0 +1,61 @@
+"""add listing indexes on Offers and the legal roles link table
+
+Revision ID: 8a6c3f0e91d7
+Revises: 5d2f8e1c7a94
+Create Date: 2026-10-17 11:30:05.630117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '8a6c3f0e91d7'
+down_revision: Union[str, Sequence[str], None] = '5d2f8e1c7a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("status = 'ACTIVE'")
+
+
+def upgrade() -> None:
+    # Detail, accept/reject and update all look offers up by uuid
+    op.create_index("ix_offers_uuid", "offers", ["uuid"], unique=True)
+
+    # Public listing, public count, map and visible_offers refresh: `status = 'ACTIVE' AND valid_to > X`,
+    # ordered (and keyset-paginated) by `(valid_to, id)` or `(created_at, id)`
+    op.create_index("ix_offers_active_valid_to", "offers", ["valid_to", "id"], postgresql_where=ACTIVE)
+    op.create_index("ix_offers_active_created_at", "offers", ["created_at", "id"], postgresql_where=ACTIVE)
+
+    # Moderation queue: newest first, optionally narrowed to one status
+    op.create_index(
+        "ix_offers_status_created_at", "offers",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index("ix_offers_created_at", "offers", ["created_at", "id"])
+
+    # Raw import de-duplication and "similar offers" by author email
+    op.create_index("ix_offers_offer_uid", "offers", ["offer_uid"])
+    op.create_index("ix_offers_email", "offers", ["email"])
+
+    # Foreign keys: joins to places/cities and their ON DELETE SET NULL
+    op.create_index("ix_offers_place_id", "offers", ["place_id"])
+    op.create_index("ix_offers_city_id", "offers", ["city_id"])
+
+    # The primary key (offer_id, legal_role_id) serves lookups by offer; this one serves the role filter
+    op.create_index(
+        "ix_offers_legal_roles_link_legal_role_id", "offers_legal_roles_link", ["legal_role_id", "offer_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_offers_legal_roles_link_legal_role_id", table_name="offers_legal_roles_link")
+    op.drop_index("ix_offers_city_id", table_name="offers")
+    op.drop_index("ix_offers_place_id", table_name="offers")
+    op.drop_index("ix_offers_email", table_name="offers")
+    op.drop_index("ix_offers_offer_uid", table_name="offers")
+    op.drop_index("ix_offers_created_at", table_name="offers")
+    op.drop_index("ix_offers_status_created_at", table_name="offers")
+    op.drop_index("ix_offers_active_created_at", table_name="offers")
+    op.drop_index("ix_offers_active_valid_to", table_name="offers")
+    op.drop_index("ix_offers_uuid", table_name="offers")
@@ -0,0 +1,47 @@
+"""de-duplicate and make Offers offer_uid unique
+
+Revision ID: e27b4c9a0d36
+Revises: 8a6c3f0e91d7
+Create Date: 2026-10-17 12:00:41.902385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'e27b4c9a0d36'
+down_revision: Union[str, Sequence[str], None] = '8a6c3f0e91d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One row per offer_uid survives: the first one that went through moderation, otherwise the oldest.
+# Scraper duplicates carry the same post, so the other copies only lose their own queue state.
+DUPLICATE_OFFERS = """
+    SELECT id FROM (
+        SELECT
+            id,
+            row_number() OVER (
+                PARTITION BY offer_uid ORDER BY status IN ('IMPORTED', 'NEW', 'POSTPONED', 'DRAFT'), id
+            ) AS copy_number
+        FROM public.offers
+        WHERE offer_uid IS NOT NULL
+    ) copies
+    WHERE copy_number > 1
+"""
+
+
+def upgrade() -> None:
+    op.execute(f"DELETE FROM public.offers_legal_roles_link WHERE offer_id IN ({DUPLICATE_OFFERS})")
+    op.execute(f"DELETE FROM public.offers WHERE id IN ({DUPLICATE_OFFERS})")
+
+    # Raw imports de-duplicate with `ON CONFLICT (offer_uid)`, which needs a unique index.
+    # Offers created through the API have no offer_uid; NULLs never conflict.
+    op.drop_index("ix_offers_offer_uid", table_name="offers")
+    op.create_index("ix_offers_offer_uid", "offers", ["offer_uid"], unique=True)
+
+
+def downgrade() -> None:
+    # Removed duplicates are not restored
+    op.drop_index("ix_offers_offer_uid", table_name="offers")
+    op.create_index("ix_offers_offer_uid", "offers", ["offer_uid"])
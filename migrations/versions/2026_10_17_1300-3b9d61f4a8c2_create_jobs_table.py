@@ -0,0 +1,46 @@
+"""create Jobs table
+
+Revision ID: 3b9d61f4a8c2
+Revises: e27b4c9a0d36
+Create Date: 2026-10-17 13:00:12.518302
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '3b9d61f4a8c2'
+down_revision: Union[str, Sequence[str], None] = 'e27b4c9a0d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jobs',
+        sa.Column("id", sa.INTEGER(), sa.Identity(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('kind', sa.String(64), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('status', sa.Text(), nullable=False),
+        sa.Column('attempts', sa.INTEGER(), server_default='0', nullable=False),
+        sa.Column('max_attempts', sa.INTEGER(), nullable=False),
+        sa.Column('run_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('locked_at', postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('locked_by', sa.TEXT(), nullable=True),
+        sa.Column('last_error', sa.TEXT(), nullable=True),
+        sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    # Workers only ever look at due queued jobs (claims) and long-held running ones (stale lock recovery)
+    op.create_index(
+        "ix_jobs_queued_run_at", "jobs", ["run_at", "id"], postgresql_where=sa.text("status = 'QUEUED'")
+    )
+    op.create_index(
+        "ix_jobs_running_locked_at", "jobs", ["locked_at"], postgresql_where=sa.text("status = 'RUNNING'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("jobs")
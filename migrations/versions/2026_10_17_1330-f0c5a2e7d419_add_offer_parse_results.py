@@ -0,0 +1,38 @@
+"""add Offers parse results and Jobs dedupe key
+
+Revision ID: f0c5a2e7d419
+Revises: 3b9d61f4a8c2
+Create Date: 2026-10-17 13:30:05.117264
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'f0c5a2e7d419'
+down_revision: Union[str, Sequence[str], None] = '3b9d61f4a8c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('offers', sa.Column('parse_result', postgresql.JSONB(), nullable=True))
+    op.add_column('offers', sa.Column('parsed_at', sa.DateTime(), nullable=True))
+    # The parse sweep's backlog: stays as small as the number of NEW offers still waiting for the parser
+    op.create_index(
+        "ix_offers_new_unparsed", "offers", ["id"], postgresql_where=sa.text("status = 'NEW' AND parsed_at IS NULL")
+    )
+
+    op.add_column('jobs', sa.Column('dedupe_key', sa.TEXT(), nullable=True))
+    op.create_index("ix_jobs_dedupe_key", "jobs", ["dedupe_key"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_dedupe_key", table_name="jobs")
+    op.drop_column('jobs', 'dedupe_key')
+
+    op.drop_index("ix_offers_new_unparsed", table_name="offers")
+    op.drop_column('offers', 'parsed_at')
+    op.drop_column('offers', 'parse_result')
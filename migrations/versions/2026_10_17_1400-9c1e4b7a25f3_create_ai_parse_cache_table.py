@@ -0,0 +1,34 @@
+"""create AI parse cache table
+
+Revision ID: 9c1e4b7a25f3
+Revises: f0c5a2e7d419
+Create Date: 2026-10-17 14:00:48.330671
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '9c1e4b7a25f3'
+down_revision: Union[str, Sequence[str], None] = 'f0c5a2e7d419'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_parse_cache',
+        sa.Column("id", sa.INTEGER(), sa.Identity(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('text_hash', sa.String(64), nullable=False),
+        sa.Column('model', sa.TEXT(), nullable=False),
+        sa.Column('prompt_hash', sa.String(64), nullable=False),
+        sa.Column('result', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint('text_hash', 'model', 'prompt_hash', name='uq_ai_parse_cache_key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ai_parse_cache")
@@ -0,0 +1,30 @@
+"""add Offers MinHash signatures
+
+Revision ID: d84b2f6e3a17
+Revises: 9c1e4b7a25f3
+Create Date: 2026-10-17 14:30:21.604918
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'd84b2f6e3a17'
+down_revision: Union[str, Sequence[str], None] = '9c1e4b7a25f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('offers', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column('offers', sa.Column('minhash_bands', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+    # Near-duplicate candidates share at least one band key: one `&&` probe of this index per lookup
+    op.create_index("ix_offers_minhash_bands", "offers", ["minhash_bands"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_offers_minhash_bands", table_name="offers")
+    op.drop_column('offers', 'minhash_bands')
+    op.drop_column('offers', 'minhash')
@@ -0,0 +1,27 @@
+"""recompute Offers MinHash signatures
+
+Revision ID: 6a3f9d1c8e52
+Revises: d84b2f6e3a17
+Create Date: 2026-10-17 15:00:43.118204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '6a3f9d1c8e52'
+down_revision: Union[str, Sequence[str], None] = 'd84b2f6e3a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Signatures now come from one-permutation hashing and aren't comparable with the stored ones: clear them
+    # all, the job worker's sweep fingerprints offers whose band keys are NULL
+    op.execute("UPDATE offers SET minhash = NULL, minhash_bands = NULL WHERE minhash_bands IS NOT NULL")
+    op.create_index("ix_offers_minhash_pending", "offers", ["id"], postgresql_where=sa.text("minhash_bands IS NULL"))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_offers_minhash_pending", table_name="offers")
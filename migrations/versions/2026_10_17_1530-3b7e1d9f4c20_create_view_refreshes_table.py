@@ -0,0 +1,30 @@
+"""create view_refreshes table
+
+Revision ID: 3b7e1d9f4c20
+Revises: 6a3f9d1c8e52
+Create Date: 2026-10-17 15:30:12.508193
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '3b7e1d9f4c20'
+down_revision: Union[str, Sequence[str], None] = '6a3f9d1c8e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'view_refreshes',
+        sa.Column('name', sa.TEXT(), primary_key=True, nullable=False),
+        sa.Column('refreshed_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute("INSERT INTO public.view_refreshes (name) VALUES ('visible_offers')")
+
+
+def downgrade() -> None:
+    op.drop_table("view_refreshes")
@@ -0,0 +1,24 @@
+"""add cities geo_point index
+
+Revision ID: 7e2a5c8b1f06
+Revises: 3b7e1d9f4c20
+Create Date: 2026-10-17 15:45:03.917264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '7e2a5c8b1f06'
+down_revision: Union[str, Sequence[str], None] = '3b7e1d9f4c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Radius filters fall back to the city's coordinates for offers located by their city only
+    op.execute("CREATE INDEX ix_cities_geo_point ON cities USING gist (public.geo_point(lat, lon))")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_cities_geo_point")
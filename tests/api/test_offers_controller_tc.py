@@ -1,6 +1,8 @@
 import json
+from datetime import UTC, datetime, timedelta
 from uuid import uuid4
 
+import msgpack
 import pytest
 from pydantic import EmailStr
 
@@ -105,6 +107,29 @@ def test_should_return_409_on_duplicate_raw_offer(client):
     assert "already exists" in r2.json()["detail"]
 
 
+@pytest.mark.integration
+def test_should_import_raw_offer_batch_skipping_known_offer_uids(client):
+    """Test batch import with an already imported offer_uid and a repeat within the batch"""
+    prefix = f"o-batch-{uuid4().hex[:6]}"
+    client.post("/offers/raw", json=make_offer_payload(f"{prefix}-1"))
+    batch = [make_offer_payload(f"{prefix}-{i}") for i in (1, 2, 3, 3)]
+
+    response = client.post("/offers/raw/batch", json=batch)
+    repeated = client.post("/offers/raw/batch", json=batch)
+
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 2, "skipped": 2}
+    assert repeated.json() == {"inserted": 0, "skipped": 4}
+    listed = client.get("/offers/raw", params={"search": prefix, "limit": 10}).json()
+    assert sorted(item["offer_uid"] for item in listed["data"]) == [f"{prefix}-{i}" for i in (1, 2, 3)]
+
+
+@pytest.mark.integration
+def test_should_reject_empty_raw_offer_batch(client):
+    response = client.post("/offers/raw/batch", json=[])
+    assert response.status_code == 422
+
+
 @pytest.mark.integration
 def test_should_return_404_on_nonexistent_raw_offer(client):
     """Test fetching a raw offer that doesn't exist"""
@@ -139,6 +164,26 @@ def test_should_accept_raw_offer_and_change_status(client):
     assert got.json()["status"].lower() == "active"
 
 
+@pytest.mark.integration
+def test_should_refresh_cached_raw_offer_after_accept(client):
+    # Given
+    client.post("/offers/raw", json=make_offer_payload("o-cache"))
+    raw = client.get("/offers/raw")
+    offer_uuid = next(item["uuid"] for item in raw.json()["data"] if item["offer_uid"] == "o-cache")
+    before = client.get(f"/offers/raw/{offer_uuid}")
+    metrics_before = client.get("/metrics").json()["offer_read_cache"]
+
+    # When
+    cached = client.get(f"/offers/raw/{offer_uuid}")
+    client.patch(f"/offers/raw/{offer_uuid}/accept")
+    after = client.get(f"/offers/raw/{offer_uuid}")
+
+    # Then
+    assert before.json() == cached.json()
+    assert client.get("/metrics").json()["offer_read_cache"]["hits"] == metrics_before["hits"] + 1
+    assert after.json()["status"].lower() == "active"
+
+
 @pytest.mark.integration
 def test_should_reject_raw_offer_and_change_status(client):
     """Test rejecting a raw offer changes its status to rejected"""
@@ -268,6 +313,29 @@ def test_should_list_offers(client_with_overrides):
     assert any(item["description"] == description for item in body["data"])
 
 
+@pytest.mark.integration
+def test_should_list_offers_with_sparse_fieldset(client_with_overrides):
+    """Test that fields= returns only the requested offer fields, including relation-backed ones"""
+    # Given
+    city_uuid = setup_test_city(client_with_overrides, "SparseCity")
+    role_uuid = client_with_overrides.get("/offers/legal_roles").json()[0]["uuid"]
+    description = f"sparse-offer-{uuid4().hex[:8]}"
+    payload = make_offer_create_payload(description)
+    payload["city_uuid"] = city_uuid
+    payload["roles"] = [role_uuid]
+    assert client_with_overrides.post("/offers", json=payload).status_code == 201
+
+    # When
+    listed = client_with_overrides.get("/offers", params={"search": description, "fields": "description,city_uuid,legal_roles"})
+
+    # Then
+    assert listed.status_code == 200
+    item = listed.json()["data"][0]
+    assert set(item) == {"uuid", "description", "city_uuid", "legal_roles"}
+    assert item["city_uuid"] == city_uuid
+    assert [role["uuid"] for role in item["legal_roles"]] == [role_uuid]
+
+
 @pytest.mark.integration
 def test_should_create_offer_without_city_uuid_successfully(client_with_overrides):
     """Test that creating an offer without city_uuid succeeds if facility_uuid is provided"""
@@ -641,6 +709,90 @@ def test_should_maintain_pagination_consistency(client_with_overrides):
     assert page1_uuids.isdisjoint(page2_uuids), "Pages should not contain overlapping offers"
 
 
+@pytest.mark.integration
+def test_should_walk_offers_with_cursor_pagination(client_with_overrides):
+    """Test that keyset pagination returns every offer exactly once"""
+    city_uuid = setup_test_city(client_with_overrides, "CursorCity")
+    marker = f"cursor-{uuid4().hex[:6]}"
+
+    for i in range(7):
+        payload = make_offer_create_payload(f"{marker}-{i}", f"cursor{i}@test.com")
+        payload["city_uuid"] = city_uuid
+        client_with_overrides.post("/offers", json=payload)
+
+    params = {"search": marker, "limit": 3, "field": "created_at", "order": "asc"}
+    seen = []
+    response = client_with_overrides.get("/offers", params=params)
+    while True:
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(item["uuid"] for item in body["data"])
+        if not body["next_cursor"]:
+            break
+        response = client_with_overrides.get("/offers", params={**params, "cursor": body["next_cursor"]})
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+@pytest.mark.integration
+def test_should_reject_invalid_cursor(client_with_overrides):
+    """Test that a malformed or mismatched cursor is rejected"""
+    response = client_with_overrides.get("/offers/raw", params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+    first = client_with_overrides.get("/offers/raw", params={"limit": 1, "order": "desc"}).json()
+    if first["next_cursor"]:
+        mismatched = client_with_overrides.get("/offers/raw", params={"limit": 1, "order": "asc", "cursor": first["next_cursor"]})
+        assert mismatched.status_code == 400
+
+
+@pytest.mark.integration
+def test_should_refresh_cached_count_after_new_offer(client_with_overrides):
+    """Test that totals can be skipped and that cached totals follow writes"""
+    city_uuid = setup_test_city(client_with_overrides, "CountCity")
+    marker = f"count-{uuid4().hex[:6]}"
+
+    def create_offer(i: int) -> None:
+        payload = make_offer_create_payload(f"{marker}-{i}", f"count{i}@test.com")
+        payload["city_uuid"] = city_uuid
+        client_with_overrides.post("/offers", json=payload)
+
+    create_offer(0)
+    assert client_with_overrides.get("/offers", params={"search": marker}).json()["count"] == 1
+
+    create_offer(1)
+    assert client_with_overrides.get("/offers", params={"search": marker}).json()["count"] == 2
+
+    skipped = client_with_overrides.get("/offers", params={"search": marker, "include_count": False}).json()
+    assert skipped["count"] is None
+    assert len(skipped["data"]) == 2
+
+    estimated = client_with_overrides.get("/offers/raw", params={"count_mode": "estimate"})
+    assert estimated.status_code == 200
+    assert estimated.json()["count"] is not None
+
+
+@pytest.mark.integration
+def test_should_report_total_on_pages_past_the_end(client_with_overrides):
+    """Test that the windowed total matches on a regular page and an empty page past the end"""
+    city_uuid = setup_test_city(client_with_overrides, "WindowCity")
+    marker = f"window-{uuid4().hex[:6]}"
+
+    for i in range(3):
+        payload = make_offer_create_payload(f"{marker}-{i}", f"window{i}@test.com")
+        payload["city_uuid"] = city_uuid
+        client_with_overrides.post("/offers", json=payload)
+
+    first_page = client_with_overrides.get("/offers/raw", params={"search": marker, "limit": 2}).json()
+    past_end = client_with_overrides.get("/offers/raw", params={"search": marker, "limit": 2, "offset": 10}).json()
+
+    assert len(first_page["data"]) == 2
+    assert first_page["count"] == 3
+    assert past_end["data"] == []
+    assert past_end["count"] == 3
+
+
 @pytest.mark.integration
 def test_should_filter_offers_by_invoice(client_with_overrides):
     """Test invoice filtering works correctly"""
@@ -711,6 +863,69 @@ def test_should_list_legal_roles_and_count_offers(client_with_overrides):
     assert count.json()["count"] >= 1
 
 
+@pytest.mark.integration
+def test_should_revalidate_offer_detail_until_it_changes(client_with_overrides):
+    # Given
+    city_uuid = setup_test_city(client_with_overrides, "EtagCity")
+    description = f"etag-{uuid4().hex[:8]}"
+    payload = make_offer_create_payload(description, email="etag@example.com")
+    payload["city_uuid"] = city_uuid
+    client_with_overrides.post("/offers", json=payload)
+    offer_uuid = client_with_overrides.get("/offers", params={"search": description}).json()["data"][0]["uuid"]
+    first = client_with_overrides.get(f"/offers/{offer_uuid}")
+    etag = first.headers["etag"]
+
+    # When
+    unchanged = client_with_overrides.get(f"/offers/{offer_uuid}", headers={"If-None-Match": etag})
+    client_with_overrides.patch(f"/offers/{offer_uuid}", json={"description": f"{description}-edited"})
+    changed = client_with_overrides.get(f"/offers/{offer_uuid}", headers={"If-None-Match": etag})
+
+    # Then
+    assert etag.startswith("W/")
+    assert first.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=300"
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["description"] == f"{description}-edited"
+
+
+@pytest.mark.integration
+def test_should_revalidate_offer_listing_until_offers_change(client_with_overrides):
+    # Given
+    city_uuid = setup_test_city(client_with_overrides, "EtagListCity")
+    first = client_with_overrides.get("/offers")
+    etag = first.headers["etag"]
+
+    # When
+    unchanged = client_with_overrides.get("/offers", headers={"If-None-Match": etag})
+    payload = make_offer_create_payload(f"etag-list-{uuid4().hex[:8]}", email="etag@example.com")
+    payload["city_uuid"] = city_uuid
+    client_with_overrides.post("/offers", json=payload)
+    changed = client_with_overrides.get("/offers", headers={"If-None-Match": etag})
+
+    # Then
+    assert first.headers["cache-control"] == "public, no-cache"
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+
+
+@pytest.mark.integration
+def test_should_serve_offer_listing_as_msgpack_on_request(client_with_overrides):
+    # Given
+    params = {"limit": 5, "field": "created_at", "order": "desc"}
+    as_json = client_with_overrides.get("/offers", params=params)
+
+    # When
+    as_msgpack = client_with_overrides.get("/offers", params=params, headers={"Accept": "application/msgpack"})
+
+    # Then
+    assert as_msgpack.status_code == 200
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    assert as_msgpack.headers["vary"] == as_json.headers["vary"] == "Accept"
+    assert as_msgpack.headers["etag"] != as_json.headers["etag"]
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+
+
 # ============================================================================
 # MAP OFFERS
 # ============================================================================
@@ -731,6 +946,68 @@ def test_should_list_map_offers(client_with_overrides):
     assert isinstance(map_resp.json(), list)
 
 
+@pytest.mark.integration
+def test_should_serve_map_geojson_with_etag(client_with_overrides):
+    """Test that the GeoJSON map snapshot is revalidated with ETags and follows new offers"""
+    city_uuid = setup_test_city(client_with_overrides, "GeoJsonCity")
+    description = f"geojson-offer-{uuid4().hex[:8]}"
+
+    payload = make_offer_create_payload(description, email="geojson@example.com")
+    payload["city_uuid"] = city_uuid
+    client_with_overrides.post("/offers", json=payload)
+
+    first = client_with_overrides.get("/offers/map/geojson")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/geo+json"
+    assert first.headers["content-encoding"] == "gzip"
+    features = first.json()["features"]
+    assert any(feature["properties"]["description"] == description for feature in features)
+
+    etag = first.headers["etag"]
+    not_modified = client_with_overrides.get("/offers/map/geojson", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    payload = make_offer_create_payload(f"geojson-offer-{uuid4().hex[:8]}", email="geojson2@example.com")
+    payload["city_uuid"] = city_uuid
+    client_with_overrides.post("/offers", json=payload)
+
+    changed = client_with_overrides.get("/offers/map/geojson", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()["features"]) == len(features) + 1
+
+
+@pytest.mark.integration
+def test_should_cluster_map_offers_by_viewport(client_with_overrides):
+    """Test that map clusters collapse offers at low zoom and list them individually at high zoom"""
+    city_name = f"ClusterCity-{uuid4().hex[:6]}"
+    client_with_overrides.post(
+        "/places/city", json=make_city_payload(city_name, teryt=f"SIMC-{uuid4().hex[:6]}", lat=-45.0, lon=-120.0)
+    )
+    city_uuid = client_with_overrides.get(f"/places/city/{city_name}").json()[0]["uuid"]
+
+    for i in range(3):
+        payload = make_offer_create_payload(f"cluster-{uuid4().hex[:6]}-{i}", email=f"cluster{i}@example.com")
+        payload["city_uuid"] = city_uuid
+        client_with_overrides.post("/offers", json=payload)
+
+    bbox = "-121,-46,-119,-44"
+    low = client_with_overrides.get("/offers/map/clusters", params={"bbox": bbox, "zoom": 3}).json()
+    high = client_with_overrides.get("/offers/map/clusters", params={"bbox": bbox, "zoom": 20}).json()
+
+    assert [cluster["count"] for cluster in low["clusters"]] == [3]
+    assert low["offers"] == []
+    assert high["clusters"] == []
+    assert len(high["offers"]) == 3
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "0,50,10,40"])
+def test_should_reject_invalid_map_cluster_bbox(client_with_overrides, bbox):
+    """Test bbox validation for map clusters"""
+    response = client_with_overrides.get("/offers/map/clusters", params={"bbox": bbox, "zoom": 5})
+    assert response.status_code == 400
+
+
 # ============================================================================
 # IMPORT & PARSING
 # ============================================================================
@@ -758,6 +1035,30 @@ def test_should_import_and_parse_raw_offer(client_with_overrides):
     assert parsed_body["success"] is True
 
 
+@pytest.mark.integration
+def test_should_serve_stored_parse_result_without_calling_parser(client_with_overrides):
+    # Given
+    offer_uid = f"o-parse-stored-{uuid4().hex[:6]}"
+    client_with_overrides.post("/offers/raw", json=make_offer_payload(offer_uid))
+    raw_items = client_with_overrides.get("/offers/raw", params={"search": offer_uid}).json()["data"]
+    offer_uuid = next(item["uuid"] for item in raw_items if item["offer_uid"] == offer_uid)
+    first = client_with_overrides.get(f"/offers/raw/{offer_uuid}/parse")
+
+    class UnavailableParser:
+        async def parse_offer(self, raw_data: str) -> ParseResponse:
+            raise AssertionError("the stored result should be served")
+
+    client_with_overrides.app.dependency_overrides[get_ai_parser] = lambda: UnavailableParser()
+
+    # When
+    second = client_with_overrides.get(f"/offers/raw/{offer_uuid}/parse")
+
+    # Then
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.json()["data"]["email"] == "parsed@example.com"
+
+
 @pytest.mark.integration
 def test_should_return_404_when_parsing_nonexistent_raw_offer(client_with_overrides):
     """Test parsing a raw offer that doesn't exist"""
@@ -849,6 +1150,52 @@ def test_should_sort_raw_offers_by_name(client):
     assert response_desc.status_code == 200
 
 
+@pytest.mark.integration
+def test_should_return_sparse_fieldset_of_raw_offers(client):
+    """Test that fields= limits the returned item fields (uuid is always included)"""
+    offer_uid = f"o-sparse-{uuid4().hex[:6]}"
+    client.post("/offers/raw", json=make_offer_payload(offer_uid))
+
+    response = client.get("/offers/raw", params={"fields": "offer_uid,author", "search": offer_uid})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["count"] == 1
+    assert set(body["data"][0]) == {"uuid", "offer_uid", "author"}
+    assert body["data"][0]["offer_uid"] == offer_uid
+    assert "ETag" in response.headers
+
+
+@pytest.mark.integration
+def test_should_export_offers_as_ndjson_and_csv(client):
+    """Test streaming export with status and since filters"""
+    offer_uid = f"o-export-{uuid4().hex[:6]}"
+    since = datetime.now(UTC) - timedelta(minutes=1)
+    client.post("/offers/raw", json=make_offer_payload(offer_uid))
+
+    ndjson = client.get("/offers/export", params={"status": "new", "since": since.isoformat()})
+    csv_export = client.get("/offers/export", params={"format": "csv", "status": "new", "since": since.isoformat()})
+    future = client.get("/offers/export", params={"since": (datetime.now(UTC) + timedelta(days=1)).isoformat()})
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert all(row["status"] == "new" for row in exported)
+    assert any(row["offer_uid"] == offer_uid and row["raw_data"] for row in exported)
+
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    assert csv_export.text.splitlines()[0].startswith("uuid,status,source,author")
+    assert offer_uid in csv_export.text
+    assert future.text == ""
+
+
+@pytest.mark.integration
+def test_should_reject_unknown_sparse_fields(client):
+    """Test that fields outside the response model are rejected"""
+    response = client.get("/offers/raw", params={"fields": "uuid,password"})
+    assert response.status_code == 400
+
+
 @pytest.mark.integration
 @pytest.mark.parametrize(
     "search_len, expected_status",
@@ -877,6 +1224,24 @@ def test_should_search_raw_offers(client):
     assert any(unique_text in item["offer_uid"] for item in body["data"])
 
 
+@pytest.mark.integration
+def test_should_search_offers_ignoring_polish_diacritics(client_with_overrides):
+    """Test that full-text search folds diacritics and matches word prefixes"""
+    city_uuid = setup_test_city(client_with_overrides, "FtsCity")
+    marker = uuid4().hex[:8]
+    description = f"Zastępstwo przed Sądem Okręgowym w Łodzi {marker}"
+    payload = make_offer_create_payload(description, email="fts@example.com")
+    payload["city_uuid"] = city_uuid
+    client_with_overrides.post("/offers", json=payload)
+
+    response = client_with_overrides.get("/offers", params={"search": f"sadem lodz {marker}", "field": "relevance"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["description"] for item in body["data"]] == [description]
+    assert body["next_cursor"] is None
+
+
 # ============================================================================
 # ADDITIONAL VALIDATION TESTS
 # ============================================================================
@@ -913,6 +1278,31 @@ def test_should_validate_offer_creation_payload(client_with_overrides, payload_u
         assert response.status_code == expected_status
 
 
+@pytest.mark.integration
+def test_should_limit_location_filtering_to_radius(client_with_overrides):
+    """Test that the radius search includes offers inside the circle and excludes those outside"""
+    city_name = f"RadiusCity-{uuid4().hex[:6]}"
+    client_with_overrides.post(
+        "/places/city", json=make_city_payload(city_name, teryt=f"SIMC-{uuid4().hex[:6]}", lat=52.0, lon=21.0)
+    )
+    city_uuid = client_with_overrides.get(f"/places/city/{city_name}").json()[0]["uuid"]
+
+    marker = f"radius-{uuid4().hex[:8]}"
+    payload = make_offer_create_payload(marker, email="radius@example.com")
+    payload["city_uuid"] = city_uuid
+    client_with_overrides.post("/offers", json=payload)
+
+    # ~30 km north of the city
+    params = {"search": marker, "lat": 52.27, "lon": 21.0}
+    inside = client_with_overrides.get("/offers", params={**params, "distance_km": 35}).json()
+    outside = client_with_overrides.get("/offers", params={**params, "distance_km": 25}).json()
+
+    assert [item["description"] for item in inside["data"]] == [marker]
+    assert inside["count"] == 1
+    assert outside["data"] == []
+    assert outside["count"] == 0
+
+
 # ============================================================================
 # COMPREHENSIVE WORKFLOW TESTS
 # ============================================================================
@@ -1095,3 +1485,29 @@ def test_should_prevent_concurrent_duplicates(client):
     # Immediate duplicate should fail
     resp2 = client.post("/offers/raw", json=payload)
     assert resp2.status_code == 409
+
+
+@pytest.mark.integration
+def test_should_find_reposted_raw_offer_as_duplicate(client):
+    # Given
+    tag = uuid4().hex[:8]
+    post = f"Zastępstwo {tag} w Sądzie Okręgowym w Poznaniu 20.11 godz. 11:00, sprawa rodzinna, kontakt ewa@kancelaria.pl"
+    texts = {
+        f"dup-{tag}-post": post,
+        f"dup-{tag}-repost": post.replace(",", " -") + " Pilne!",
+        f"dup-{tag}-other": f"Policja {tag} Gdańsk jutro rano, przesłuchanie, radca prawny poszukiwany",
+    }
+    for offer_uid, raw_data in texts.items():
+        client.post("/offers/raw", json={**make_offer_payload(offer_uid), "raw_data": raw_data})
+    listed = client.get("/offers/raw", params={"search": tag, "limit": 10}).json()["data"]
+    uuids = {item["offer_uid"]: item["uuid"] for item in listed}
+
+    # When
+    response = client.get(f"/offers/{uuids[f'dup-{tag}-post']}/duplicates")
+
+    # Then
+    assert response.status_code == 200
+    duplicates = response.json()
+    assert [duplicate["uuid"] for duplicate in duplicates] == [uuids[f"dup-{tag}-repost"]]
+    assert duplicates[0]["similarity"] >= 0.7
+    assert client.get(f"/offers/{uuid4()}/duplicates").status_code == 404
@@ -124,6 +124,22 @@ def test_should_get_city_by_uuid(client):
     assert body["name"] == cities[0]["name"]
 
 
+@pytest.mark.integration
+def test_should_revalidate_city_with_etag(client):
+    # Given
+    client.post("/places/city", json=make_city_payload("Etagowo", teryt="SIMC-E1"))
+    city_uuid = client.get("/places/city/etag").json()[0]["uuid"]
+    first = client.get(f"/places/city/uuid/{city_uuid}")
+
+    # When
+    revalidated = client.get(f"/places/city/uuid/{city_uuid}", headers={"If-None-Match": first.headers["etag"]})
+
+    # Then
+    assert first.headers["cache-control"] == "public, max-age=86400"
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
 @pytest.mark.integration
 def test_should_return_correct_fields_in_place_index(client):
     # Given
@@ -0,0 +1,45 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.http_cache import CachePolicy, Representation, conditional_json, etag_matches, version_token
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+])
+def test_should_compare_if_none_match_weakly(if_none_match, expected):
+    assert etag_matches(if_none_match, '"abc"') is expected
+
+
+@pytest.mark.parametrize("policy, expected", [
+    (CachePolicy(), "public, no-cache"),
+    (CachePolicy(private=True), "private, no-cache"),
+    (CachePolicy(max_age=60, stale_while_revalidate=300), "public, max-age=60, stale-while-revalidate=300"),
+])
+def test_should_render_cache_control(policy, expected):
+    assert policy.header == expected
+
+
+def test_should_treat_naive_and_utc_timestamps_as_the_same_version():
+    assert version_token(datetime(2026, 1, 1, 12)) == version_token(datetime(2026, 1, 1, 12, tzinfo=UTC))
+
+
+def test_should_answer_304_with_validators_when_etag_matches():
+    # Given
+    representation = Representation(etag='W/"v1"', body=b"{}")
+
+    # When
+    fresh = conditional_json(representation, CachePolicy(), None)
+    revalidated = conditional_json(representation, CachePolicy(), '"v1"')
+
+    # Then
+    assert (fresh.status_code, fresh.body) == (200, b"{}")
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == 'W/"v1"'
+    assert revalidated.headers["cache-control"] == "public, no-cache"
@@ -0,0 +1,60 @@
+import json
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import msgpack
+import pytest
+
+from app.core.responses import JSON, MSGPACK, accepts_gzip, negotiate, negotiated_response, variant_etag
+from app.schemas.domain.common import BaseResponse
+
+
+class PriceResponse(BaseResponse):
+    uuid: UUID
+    price: Decimal
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("*/*", JSON),
+    ("application/json", JSON),
+    ("application/msgpack", MSGPACK),
+    ("application/json;q=0.5, application/x-msgpack", MSGPACK),
+    ("application/msgpack;q=0, application/json", JSON),
+    ("application/x-msgpack;q=0.0", JSON),
+    ("application/msgpack; Q=0.00, */*", JSON),
+    ("application/msgpack;q=0.1", MSGPACK),
+])
+def test_should_negotiate_msgpack_only_when_asked_for(accept, expected):
+    assert negotiate(accept) == expected
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, False),
+    ("gzip, deflate, br", True),
+    ("br;q=1.0, gzip;q=0.8", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip;q=0.0, br", False),
+    ("*;q=0.5, gzip;q=0", False),
+])
+def test_should_accept_gzip_only_with_non_zero_quality(accept_encoding, expected):
+    assert accepts_gzip(accept_encoding) is expected
+
+
+def test_should_give_msgpack_variant_its_own_etag():
+    assert variant_etag('W/"offers-1"', JSON) == 'W/"offers-1"'
+    assert variant_etag('W/"offers-1"', MSGPACK) == 'W/"offers-1-msgpack"'
+
+
+def test_should_encode_same_content_in_both_media_types():
+    # Given
+    value = [PriceResponse(uuid=uuid4(), price=Decimal("120.50"))]
+
+    # When
+    as_json = negotiated_response(list[PriceResponse], value, JSON, {"ETag": 'W/"a"'})
+    as_msgpack = negotiated_response(list[PriceResponse], value, MSGPACK, {"ETag": 'W/"a-msgpack"'})
+
+    # Then
+    assert as_msgpack.media_type == MSGPACK
+    assert msgpack.unpackb(as_msgpack.body) == json.loads(as_json.body)
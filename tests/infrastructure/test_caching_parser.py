@@ -0,0 +1,129 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure.ai.parsers.caching_parser import CachingAIParser, text_hash
+from app.infrastructure.cache.ttl_cache import TTLCache
+from app.repositories.ai_parse_cache_repo import AIParseCacheRepo
+from app.schemas.domain.ai import ParseResponse, SubstitutionOffer, UsageDetails
+
+PARSED = ParseResponse(
+    success=True,
+    data=SubstitutionOffer(description="Sąd Rejonowy", email="jan@kancelaria.pl"),
+    usage=UsageDetails(input_tokens=500, output_tokens=50, total_tokens=550, elapsed_time=1.2),
+)
+
+
+@pytest.fixture
+def repo_mock():
+    repo = AsyncMock(spec=AIParseCacheRepo)
+    repo.get_result.return_value = None
+    return repo
+
+
+@pytest.fixture
+def parser_mock():
+    parser = AsyncMock()
+    parser.parse_offer.return_value = PARSED
+    return parser
+
+
+def make_parser(parser, repo, prompt: str = "prompt") -> CachingAIParser:
+    return CachingAIParser(parser, repo, TTLCache(ttl_seconds=60), "gpt-5-nano", prompt, prompt + " batch")
+
+
+async def test_should_parse_repeated_text_once(parser_mock, repo_mock):
+    # Given
+    caching_parser = make_parser(parser_mock, repo_mock)
+
+    # When
+    first = await caching_parser.parse_offer("Zastępstwo w Sądzie Rejonowym")
+    repeated = await caching_parser.parse_offer("Zastępstwo  w Sądzie​ Rejonowym\n")
+
+    # Then
+    assert first == PARSED
+    assert repeated.cached is True
+    assert repeated.usage is None
+    assert repeated.data == PARSED.data
+    parser_mock.parse_offer.assert_awaited_once()
+    repo_mock.save_result.assert_awaited_once()
+    repo_mock.get_result.assert_awaited_once()
+
+
+async def test_should_serve_result_stored_by_another_process(parser_mock, repo_mock):
+    # Given
+    repo_mock.get_result.return_value = PARSED.model_copy(update={"usage": None, "cached": True}).model_dump(mode="json")
+    caching_parser = make_parser(parser_mock, repo_mock)
+
+    # When
+    result = await caching_parser.parse_offer("Zastępstwo")
+
+    # Then
+    assert (result.cached, result.data) == (True, PARSED.data)
+    parser_mock.parse_offer.assert_not_awaited()
+
+
+async def test_should_not_cache_failed_parse(parser_mock, repo_mock):
+    # Given
+    parser_mock.parse_offer.return_value = ParseResponse(success=False, error="rate limited")
+    caching_parser = make_parser(parser_mock, repo_mock)
+
+    # When
+    await caching_parser.parse_offer("Zastępstwo")
+    await caching_parser.parse_offer("Zastępstwo")
+
+    # Then
+    assert parser_mock.parse_offer.await_count == 2
+    repo_mock.save_result.assert_not_awaited()
+
+
+async def test_should_key_cache_by_system_prompt(parser_mock, repo_mock):
+    # When
+    await make_parser(parser_mock, repo_mock, prompt="v1").parse_offer("Zastępstwo")
+    await make_parser(parser_mock, repo_mock, prompt="v2").parse_offer("Zastępstwo")
+
+    # Then
+    (v1_key, v2_key) = [call.args[:3] for call in repo_mock.save_result.await_args_list]
+    assert v1_key[:2] == v2_key[:2]
+    assert v1_key[2] != v2_key[2]
+
+
+def test_should_hash_texts_differing_only_in_spacing_alike():
+    assert text_hash("Sąd “Rejonowy”\r\n\r\njutro ") == text_hash('Sąd "Rejonowy" jutro')
+    assert text_hash("Sąd Rejonowy") != text_hash("Sąd Okręgowy")
+
+
+async def test_should_batch_parse_only_uncached_distinct_texts(parser_mock, repo_mock):
+    # Given
+    caching_parser = make_parser(parser_mock, repo_mock)
+    await caching_parser.parse_offer("Zastępstwo")
+    failed = ParseResponse(success=False, error="invalid output")
+    parser_mock.parse_offers.return_value = [PARSED, failed]
+
+    # When
+    results = await caching_parser.parse_offers(["Policja", "Zastępstwo", "Prokuratura", "Policja "])
+
+    # Then
+    parser_mock.parse_offers.assert_awaited_once_with(["Policja", "Prokuratura"])
+    assert results == [PARSED, results[1], failed, PARSED]
+    assert results[1].cached is True
+    assert repo_mock.save_result.await_count == 2
+
+
+async def test_should_keep_batch_results_out_of_single_offer_cache(parser_mock, repo_mock):
+    # Given
+    caching_parser = make_parser(parser_mock, repo_mock)
+    parser_mock.parse_offers.return_value = [PARSED]
+
+    # When
+    await caching_parser.parse_offers(["Zastępstwo"])
+    single = await caching_parser.parse_offer("Zastępstwo")
+    repeated = await caching_parser.parse_offers(["Zastępstwo"])
+
+    # Then
+    assert single == PARSED
+    parser_mock.parse_offer.assert_awaited_once()
+    parser_mock.parse_offers.assert_awaited_once()
+    assert repeated[0].cached is True
+    (batch_key, single_key) = [call.args[:3] for call in repo_mock.save_result.await_args_list]
+    assert batch_key[2] != single_key[2]
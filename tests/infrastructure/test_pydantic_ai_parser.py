@@ -0,0 +1,72 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from app.infrastructure.ai.parsers.pydantic_ai_open_ai_parser import PydanticAIOpenAIParser
+from app.schemas.domain.ai import ParseResponse, SubstitutionOffer
+
+SINGLE = ParseResponse(success=True, data=SubstitutionOffer(description="single"))
+
+
+def answer(items: list[dict]):
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, {"items": items})])
+
+    return FunctionModel(respond)
+
+
+@pytest.fixture
+def parser():
+    parser = PydanticAIOpenAIParser(api_key="test")
+    parser.parse_offer = AsyncMock(return_value=SINGLE)
+    return parser
+
+
+async def test_should_parse_batch_in_a_single_call(parser):
+    # Given
+    items = [
+        {"index": 1, "offer": {"description": "Prokuratura"}},
+        {"index": 0, "offer": {"description": "Policja"}},
+    ]
+
+    # When
+    with parser.batch_agent.override(model=answer(items)):
+        results = await parser.parse_offers(["Policja jutro", "Prokuratura dziś"])
+
+    # Then
+    assert [result.data.description for result in results] == ["Policja", "Prokuratura"]
+    parser.parse_offer.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "indices",
+    [
+        pytest.param([0, 7], id="out of range"),
+        pytest.param([1, 2], id="one-based"),
+        pytest.param([0, 0], id="duplicated"),
+        pytest.param([0], id="missing"),
+    ],
+)
+async def test_should_parse_whole_batch_one_by_one_when_indices_do_not_match(parser, indices):
+    # Given
+    items = [{"index": index, "offer": {"description": "Policja"}} for index in indices]
+
+    # When
+    with parser.batch_agent.override(model=answer(items)):
+        results = await parser.parse_offers(["Policja jutro", "Prokuratura dziś"])
+
+    # Then
+    assert results == [SINGLE, SINGLE]
+    assert [call.args for call in parser.parse_offer.await_args_list] == [("Policja jutro",), ("Prokuratura dziś",)]
+
+
+async def test_should_parse_one_by_one_when_batch_output_is_invalid(parser):
+    # When
+    with parser.batch_agent.override(model=answer([{"index": "x"}])):
+        results = await parser.parse_offers(["Policja jutro", "Prokuratura dziś"])
+
+    # Then
+    assert results == [SINGLE, SINGLE]
+    assert parser.parse_offer.await_count == 2
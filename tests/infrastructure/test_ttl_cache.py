@@ -0,0 +1,50 @@
+from app.infrastructure.cache.ttl_cache import TTLCache
+
+
+def test_should_expire_entries_after_ttl(monkeypatch):
+    # Given
+    now = [100.0]
+    monkeypatch.setattr("app.infrastructure.cache.ttl_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache[int](ttl_seconds=30)
+    cache.set("key", 5)
+
+    # When
+    fresh = cache.get("key")
+    now[0] += 30
+    expired = cache.get("key")
+
+    # Then
+    assert fresh == 5
+    assert expired is None
+    assert len(cache) == 0
+
+
+def test_should_evict_least_recently_used_entry_when_full():
+    # Given
+    cache = TTLCache[int](ttl_seconds=60, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # When
+    cache.set("c", 3)
+
+    # Then
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_should_count_hits_and_misses():
+    # Given
+    cache = TTLCache[int](ttl_seconds=60)
+    cache.set("a", 1)
+
+    # When
+    cache.get("a")
+    cache.get("b")
+    cache.delete("a")
+    cache.get("a")
+
+    # Then
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,31 @@
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.ai_parse_cache_repo import AIParseCacheRepo
+
+
+@pytest.fixture
+async def db_session(client) -> AsyncSession:
+    from app.core.database import _init_engine_if_needed, get_db
+    _init_engine_if_needed()
+    async for session in get_db():
+        yield session
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_keep_first_stored_parse_result(db_session: AsyncSession):
+    # Given
+    repo = AIParseCacheRepo(db_session)
+    text_hash = uuid.uuid4().hex * 2
+
+    # When
+    await repo.save_result(text_hash, "gpt-5-nano", "p" * 64, {"success": True, "data": {"description": "first"}})
+    await repo.save_result(text_hash, "gpt-5-nano", "p" * 64, {"success": True, "data": {"description": "second"}})
+
+    # Then
+    stored = await repo.get_result(text_hash, "gpt-5-nano", "p" * 64)
+    assert stored["data"]["description"] == "first"
+    assert await repo.get_result(text_hash, "gpt-5-nano", "q" * 64) is None
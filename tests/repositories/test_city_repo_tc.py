@@ -54,3 +54,47 @@ async def test_should_perform_city_repo_operations(db_session: AsyncSession):
     # Test find_by_teryt failure
     not_found = await repo.find_by_teryt("nonexistent")
     assert not_found is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_find_city_despite_abbreviation_or_typo(db_session: AsyncSession):
+    # Given
+    repo = CityRepo(db_session)
+    db_session.add(City(
+        uuid=uuid.uuid4(),
+        name="Gorzów Wielkopolski",
+        name_ascii="gorzow-wielkopolski",
+        importance=0.6,
+        category="city",
+        teryt_simc="0977283",
+    ))
+    await db_session.commit()
+
+    # When
+    abbreviated = await repo.get_by_partial_name("gorzow-wlkp")
+    misspelled = await repo.get_by_partial_name("gorzuw-wielkopolski")
+
+    # Then
+    assert abbreviated[0].name == "Gorzów Wielkopolski"
+    assert misspelled[0].name == "Gorzów Wielkopolski"
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_bump_version_and_read_gazetteer_rows_after_insert(db_session: AsyncSession):
+    # Given
+    repo = CityRepo(db_session)
+    before = await repo.get_version()
+    city_uuid = uuid.uuid4()
+    db_session.add(City(uuid=city_uuid, name="Radom", name_ascii="radom", category="city", population=200000))
+    await db_session.commit()
+
+    # When
+    after = await repo.get_version()
+    rows = {row.uuid: row for row in await repo.get_gazetteer_rows()}
+
+    # Then
+    assert after[0] == before[0] + 1
+    assert after[1] > (before[1] or 0)
+    assert (rows[city_uuid].name_ascii, rows[city_uuid].population) == ("radom", 200000)
@@ -0,0 +1,157 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.database.models.enums import JobKind, OfferStatus, SourceType
+from app.database.models.models import Job, Offer
+from app.repositories.job_repo import JobRepo
+from app.repositories.offer_repo import OfferRepo
+from app.services.jobs.handlers import HANDLERS
+from app.services.jobs.worker import JobWorker
+
+
+@pytest.fixture
+def database(client):
+    from app.core import database
+
+    database._init_engine_if_needed()
+    return database
+
+
+@pytest.fixture
+async def empty_queue(database):
+    async with database.async_session() as session:
+        await session.execute(delete(Job))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_hand_each_job_to_one_concurrent_worker(database, empty_queue):
+    # Given
+    async with database.async_session() as session:
+        enqueued = [
+            (await JobRepo(session).enqueue(JobKind.INGEST_RAW_OFFER, {"n": n}, max_attempts=3)).id for n in range(10)
+        ]
+
+    async def claim(worker_id: str) -> list[int]:
+        async with database.async_session() as session:
+            return [job.id for job in await JobRepo(session).claim(3, worker_id)]
+
+    # When
+    claims = await asyncio.gather(*(claim(f"worker-{n}") for n in range(4)))
+
+    # Then
+    claimed = [job_id for worker_claims in claims for job_id in worker_claims]
+    assert sorted(claimed) == enqueued
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_hide_retried_job_until_its_backoff_ends(database, empty_queue):
+    # Given
+    async with database.async_session() as session:
+        repo = JobRepo(session)
+        job = await repo.enqueue(JobKind.INGEST_RAW_OFFER, {}, max_attempts=3)
+        [claimed] = await repo.claim(1, "worker")
+
+        # When
+        await repo.retry(claimed.id, "boom", timedelta(minutes=5))
+        during_backoff = await repo.claim(1, "worker")
+        await session.execute(update(Job).where(Job.id == job.id).values(run_at=datetime.now(UTC)))
+        after_backoff = await repo.claim(1, "worker")
+
+    # Then
+    assert claimed.attempts == 1
+    assert during_backoff == []
+    assert [(retried.id, retried.attempts, retried.last_error) for retried in after_backoff] == [(job.id, 2, "boom")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_requeue_jobs_of_dead_workers(database, empty_queue):
+    # Given
+    async with database.async_session() as session:
+        repo = JobRepo(session)
+        job = await repo.enqueue(JobKind.INGEST_RAW_OFFER, {}, max_attempts=3)
+        await repo.claim(1, "crashed-worker")
+        await session.execute(
+            update(Job).where(Job.id == job.id).values(locked_at=datetime.now(UTC) - timedelta(hours=1))
+        )
+        await session.commit()
+
+        # When
+        released = await repo.release_stale(timedelta(minutes=10))
+        reclaimed = await repo.claim(1, "worker")
+
+    # Then
+    assert released == 1
+    assert [(retried.id, retried.locked_by) for retried in reclaimed] == [(job.id, "worker")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_ingest_queued_raw_offer_once(database, empty_queue):
+    # Given
+    offer_uid = f"queued-{uuid.uuid4().hex[:8]}"
+    payload = {
+        "raw_data": "Zastępstwo, kontakt: jan@kancelaria.pl", "author": "queue", "author_uid": "1",
+        "offer_uid": offer_uid, "timestamp": datetime.now(UTC).isoformat(), "source": "bot",
+    }
+    async with database.async_session() as session:
+        for _ in range(2):
+            await JobRepo(session).enqueue(JobKind.INGEST_RAW_OFFER, payload, max_attempts=3)
+    worker = JobWorker(
+        HANDLERS, concurrency=1, poll_interval_seconds=0, retry_backoff_seconds=1, retry_backoff_max_seconds=1,
+        lock_timeout_seconds=600,
+    )
+
+    # When
+    processed = [await worker.run_once() for _ in range(3)]
+
+    # Then
+    assert processed == [True, True, False]
+    async with database.async_session() as session:
+        offers = (await session.execute(select(Offer).where(Offer.offer_uid == offer_uid))).scalars().all()
+        remaining = (await session.execute(select(Job))).scalars().all()
+    assert [(offer.email, offer.status.name) for offer in offers] == [("jan@kancelaria.pl", "NEW")]
+    assert remaining == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_enqueue_parsing_of_new_offers_once(database, empty_queue):
+    # Given
+    tag = uuid.uuid4().hex[:8]
+    rows = [
+        {
+            "uuid": uuid.uuid4(), "author": "sweep", "offer_uid": f"sweep-{tag}-{status.name}", "raw_data": "post",
+            "source": SourceType.BOT, "status": status,
+        }
+        for status in [OfferStatus.NEW, OfferStatus.NEW, OfferStatus.POSTPONED]
+    ]
+    async with database.async_session() as session:
+        offer_repo = OfferRepo(session)
+        rows[1]["offer_uid"] += "-parsed"
+        await offer_repo.insert_raw_offers(rows)
+        offers = {
+            offer.offer_uid: offer.id
+            for offer in (await session.execute(select(Offer).where(Offer.author == "sweep"))).scalars()
+        }
+        await offer_repo.save_parse_result(offers[f"sweep-{tag}-NEW-parsed"], {"success": True})
+
+        # When
+        first = await JobRepo(session).enqueue_offer_parsing(limit=10_000, max_attempts=3)
+        second = await JobRepo(session).enqueue_offer_parsing(limit=10_000, max_attempts=3)
+        jobs = (await session.execute(select(Job))).scalars().all()
+
+    # Then
+    assert first >= 1
+    assert second == 0
+    queued_offer_ids = {job.payload["offer_id"] for job in jobs if job.kind == JobKind.PARSE_RAW_OFFER}
+    assert offers[f"sweep-{tag}-NEW"] in queued_offer_ids
+    assert offers[f"sweep-{tag}-NEW-parsed"] not in queued_offer_ids
+    assert offers[f"sweep-{tag}-POSTPONED"] not in queued_offer_ids
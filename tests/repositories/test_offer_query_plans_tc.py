@@ -0,0 +1,134 @@
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.enums import OfferStatus
+from app.database.models.models import LegalRole
+from app.repositories.filters.offer_filters import OfferFilters
+from app.repositories.offer_repo import OfferRepo
+
+# Physical layout mirrors production: the moderation queue and the visible offers are the newest rows,
+# older rows are rejected or long expired
+SEED_OFFERS = """
+    INSERT INTO offers (uuid, status, source, author, email, offer_uid, description, valid_to, created_at, updated_at)
+    SELECT
+        gen_random_uuid(),
+        CASE
+            WHEN i <= 500 THEN 'NEW'
+            WHEN i <= 2500 OR i % 4 = 0 THEN 'ACTIVE'
+            ELSE 'REJECTED'
+        END,
+        'USER',
+        'plan-seed',
+        'seed' || (i % 500) || '@example.com',
+        'plan-seed-' || i,
+        'seed offer ' || i,
+        CASE
+            WHEN i <= 2500 THEN now() + ((i % 30) - 3) * interval '1 day'
+            ELSE now() - interval '30 days' - i * interval '1 minute'
+        END,
+        now() - i * interval '1 minute',
+        now()
+    FROM generate_series(1, 20000) AS i
+"""
+
+SEED_LEGAL_ROLES = """
+    INSERT INTO offers_legal_roles_link (offer_id, legal_role_id)
+    SELECT o.id, roles.ids[1 + o.id % cardinality(roles.ids)]
+    FROM offers o, (SELECT array_agg(id ORDER BY id) AS ids FROM legal_roles) roles
+    WHERE o.author = 'plan-seed'
+"""
+
+
+@pytest.fixture
+async def seeded_session(client) -> AsyncSession:
+    """Session holding ~20k analyzed offers in an open transaction that is rolled back afterwards."""
+    from app.core.database import _init_engine_if_needed, get_db
+    _init_engine_if_needed()
+    async for session in get_db():
+        await session.execute(text(SEED_OFFERS))
+        await session.execute(text(SEED_LEGAL_ROLES))
+        await session.execute(text("ANALYZE offers"))
+        await session.execute(text("ANALYZE offers_legal_roles_link"))
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+@contextmanager
+def captured_statements() -> Generator[list[tuple[str, dict]]]:
+    from app.core import database
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(database.engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(database.engine.sync_engine, "before_cursor_execute", capture)
+
+
+def _plan_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def seq_scanned_tables(session: AsyncSession, statement: str, parameters) -> set[str]:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters or None)
+    plan = result.scalar_one()[0]["Plan"]
+    return {node["Relation Name"] for node in _plan_nodes(plan) if node["Node Type"] == "Seq Scan"}
+
+
+def visible_after() -> datetime:
+    return datetime.now(UTC) - timedelta(hours=12)
+
+
+HOT_QUERIES = {
+    "public listing by valid_to": lambda repo, role_uuid: repo.get_offers(
+        0, 10, "valid_to", "asc", OfferFilters(status=OfferStatus.ACTIVE, valid_to=visible_after())
+    ),
+    "public listing by created_at": lambda repo, role_uuid: repo.get_offers(
+        0, 10, "created_at", "desc", OfferFilters(status=OfferStatus.ACTIVE, valid_to=visible_after())
+    ),
+    "public listing by legal role": lambda repo, role_uuid: repo.get_offers(
+        0, 10, "valid_to", "asc",
+        OfferFilters(status=OfferStatus.ACTIVE, valid_to=visible_after(), legal_role_uuids=[role_uuid]),
+    ),
+    "public count": lambda repo, role_uuid: repo.get_offers_count(),
+    "active offer locations": lambda repo, role_uuid: repo.get_active_locations(visible_after()),
+    "moderation queue": lambda repo, role_uuid: repo.get_offers(
+        0, 10, "created_at", "desc", OfferFilters(status=OfferStatus.NEW)
+    ),
+    "offer by uuid": lambda repo, role_uuid: repo.find_by_uuid(uuid4()),
+    "offers by email": lambda repo, role_uuid: repo.get_by_email("seed7@example.com"),
+    "raw import by offer_uid": lambda repo, role_uuid: repo.get_by_offer_uid("plan-seed-42"),
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize("query_name", list(HOT_QUERIES))
+async def test_should_not_seq_scan_offers_in_hot_queries(seeded_session: AsyncSession, query_name: str):
+    # Given
+    repo = OfferRepo(seeded_session)
+    role_uuid = (await seeded_session.execute(select(LegalRole.uuid).limit(1))).scalar_one()
+
+    # When
+    with captured_statements() as statements:
+        await HOT_QUERIES[query_name](repo, role_uuid)
+    scanned = [await seq_scanned_tables(seeded_session, statement, parameters) for statement, parameters in statements]
+
+    # Then
+    assert statements
+    assert all("offers" not in tables for tables in scanned), f"{query_name} falls back to a seq scan: {scanned}"
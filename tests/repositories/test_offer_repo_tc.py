@@ -0,0 +1,253 @@
+import asyncio
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.minhash import signature
+from app.database.models.enums import OfferStatus, PlaceCategory, SourceType
+from app.database.models.models import City, LegalRole, Offer, Place
+from app.repositories.filters.offer_filters import OfferFilters
+from app.repositories.offer_repo import OfferRepo
+from app.schemas.domain.common import Coordinates
+from app.schemas.domain.offer import OfferIndexResponse
+
+
+@pytest.fixture
+async def db_session(client) -> AsyncSession:
+    from app.core.database import _init_engine_if_needed, get_db
+    _init_engine_if_needed()
+    async for session in get_db():
+        yield session
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_load_listing_relations_in_a_single_statement(db_session: AsyncSession):
+    # Given
+    from app.core import database
+
+    repo = OfferRepo(db_session)
+    roles = (await db_session.execute(select(LegalRole).order_by(LegalRole.id).limit(2))).scalars().all()
+    place = Place(
+        uuid=uuid.uuid4(), name="Sąd Okręgowy Jedno", name_ascii="sad okregowy jedno", city="Jedno",
+        category=PlaceCategory.COURT, lat=50.1, lon=19.9,
+    )
+    tag = uuid.uuid4().hex[:8]
+    offer = Offer(
+        uuid=uuid.uuid4(), author="single", source=SourceType.USER, status=OfferStatus.ACTIVE, place=place,
+        description=f"single-{tag}", valid_to=datetime.now(UTC) + timedelta(days=1), legal_roles=list(roles),
+    )
+    db_session.add_all([place, offer])
+    await db_session.commit()
+    filters = OfferFilters(search=f"single-{tag}")
+
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # When
+    entities = await repo.get_offers(0, 10, "valid_to", "asc", filters, ["legal_roles", "place", "city"])
+    db_session.expunge_all()
+    event.listen(database.engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        rows = await repo.get_offers(0, 10, "valid_to", "asc", filters, columns=list(OfferIndexResponse.model_fields))
+    finally:
+        event.remove(database.engine.sync_engine, "before_cursor_execute", listener)
+
+    # Then
+    assert len(statements) == 1
+    assert rows.count == entities.count == 1
+    assert rows.items[0].facility_uuid == place.uuid
+    assert rows.items[0].city_uuid is None
+    assert [role["uuid"] for role in rows.items[0].legal_roles] == [
+        str(role.uuid) for role in sorted(roles, key=lambda role: role.name)
+    ]
+    from_rows = OfferIndexResponse.model_validate(rows.items[0])
+    from_entities = OfferIndexResponse.model_validate(entities.items[0])
+    assert from_rows.model_dump(exclude={"legal_roles"}) == from_entities.model_dump(exclude={"legal_roles"})
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_insert_concurrently_imported_post_once(client):
+    # Given
+    from app.core import database
+
+    database._init_engine_if_needed()
+    offer_uid = f"race-{uuid.uuid4().hex[:8]}"
+
+    async def import_post() -> list[str]:
+        async with database.async_session() as session:
+            row = {
+                "uuid": uuid.uuid4(), "author": "race", "offer_uid": offer_uid, "raw_data": "post",
+                "source": SourceType.BOT, "status": OfferStatus.POSTPONED, "email": None,
+            }
+            return list(await OfferRepo(session).insert_raw_offers([row]))
+
+    # When
+    results = await asyncio.gather(*(import_post() for _ in range(5)))
+
+    # Then
+    assert sorted(results) == [[], [], [], [], [offer_uid]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_locate_active_offers_through_their_place(db_session: AsyncSession):
+    # Given
+    repo = OfferRepo(db_session)
+    place = Place(
+        uuid=uuid.uuid4(), name="Sąd Rejonowy Lokalny", name_ascii="sad rejonowy lokalny", city="Lokalne",
+        category=PlaceCategory.COURT, lat=50.5, lon=20.5,
+    )
+    offer = Offer(
+        uuid=uuid.uuid4(), author="placed", source=SourceType.USER, status=OfferStatus.ACTIVE, place=place,
+        valid_to=datetime.now(UTC) + timedelta(days=1),
+    )
+    db_session.add_all([place, offer])
+    await db_session.commit()
+
+    # When
+    rows = await repo.get_active_locations(datetime.now(UTC))
+
+    # Then
+    located = next(row for row in rows if row.id == offer.id)
+    assert (float(located.lat), float(located.lon)) == (50.5, 20.5)
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_rank_duplicate_above_newer_single_band_candidates(db_session: AsyncSession):
+    # Given
+    repo = OfferRepo(db_session)
+    base = random.randrange(1, 2 ** 60)
+    source_bands = [base + band for band in range(16)]
+
+    def raw_offer(author: str, minhash_bands: list[int]) -> Offer:
+        return Offer(
+            uuid=uuid.uuid4(), author=author, source=SourceType.BOT, status=OfferStatus.NEW,
+            minhash=bytes(256), minhash_bands=minhash_bands,
+        )
+
+    source = raw_offer("source", source_bands)
+    duplicate = raw_offer("duplicate", source_bands[:12] + [base + 100 + band for band in range(4)])
+    db_session.add_all([source, duplicate])
+    await db_session.commit()
+    # Template-alike posts, newer than the duplicate, each sharing one band key by chance
+    db_session.add_all(
+        raw_offer(f"template-{i}", [source_bands[i % 16]] + [base + 1000 + 16 * i + band for band in range(15)])
+        for i in range(55)
+    )
+    await db_session.commit()
+
+    # When
+    candidates = await repo.find_by_minhash_bands(source_bands, exclude_id=source.id)
+
+    # Then
+    assert len(candidates) == 50
+    assert candidates[0].uuid == duplicate.uuid
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_fingerprint_pending_offers_once(db_session: AsyncSession):
+    # Given
+    repo = OfferRepo(db_session)
+    post = "Zastępstwo w Sądzie Rejonowym Kraków-Podgórze 14.11 godz. 9:30, sprawa cywilna"
+    pending = Offer(uuid=uuid.uuid4(), author="pending", source=SourceType.BOT, status=OfferStatus.NEW, raw_data=post)
+    empty = Offer(uuid=uuid.uuid4(), author="empty", source=SourceType.BOT, status=OfferStatus.NEW, raw_data=" -- ")
+    db_session.add_all([pending, empty])
+    await db_session.commit()
+
+    # When
+    while await repo.fill_minhash(500):
+        pass
+
+    # Then
+    assert (await repo.get_minhash(pending.uuid)).minhash == signature(post)
+    assert (await repo.get_minhash(empty.uuid)).minhash_bands == []
+    assert await repo.fill_minhash(500) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_filter_radius_by_offer_then_place_then_city_coordinates(db_session: AsyncSession):
+    # Given
+    repo = OfferRepo(db_session)
+    tag = uuid.uuid4().hex[:8]
+    city = City(uuid=uuid.uuid4(), name="Promień", name_ascii="promien", category="city", lat=50.0, lon=20.0)
+    located_place = Place(
+        uuid=uuid.uuid4(), name="Sąd Promień", name_ascii="sad promien", city="Promień",
+        category=PlaceCategory.COURT, lat=50.5, lon=20.0,
+    )
+    unlocated_place = Place(
+        uuid=uuid.uuid4(), name="Sąd Bez Punktu", name_ascii="sad bez punktu", city="Promień",
+        category=PlaceCategory.COURT,
+    )
+
+    def offer(author: str, **location) -> Offer:
+        return Offer(
+            uuid=uuid.uuid4(), author=author, source=SourceType.USER, status=OfferStatus.ACTIVE,
+            description=f"radius-{tag}", valid_to=datetime.now(UTC) + timedelta(days=1), **location,
+        )
+
+    db_session.add_all([
+        offer("own", lat=50.0, lon=20.0, city=city),
+        offer("place", place=located_place, city=city),
+        offer("city", place=unlocated_place, city=city),
+        offer("far own", lat=51.0, lon=20.0, city=city),
+    ])
+    await db_session.commit()
+
+    # When
+    near_city = await repo.get_offers(
+        0, 10, "created_at", "asc",
+        OfferFilters(search=f"radius-{tag}", coordinates=Coordinates(lat=50.0, lon=20.0), distance_km=10),
+    )
+    near_place = await repo.get_offers(
+        0, 10, "created_at", "asc",
+        OfferFilters(search=f"radius-{tag}", coordinates=Coordinates(lat=50.5, lon=20.0), distance_km=10),
+    )
+
+    # Then
+    assert {offer.author for offer in near_city.items} == {"own", "city"}
+    assert {offer.author for offer in near_place.items} == {"place"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_should_page_through_null_sort_keys_with_cursor(db_session: AsyncSession, sort_order: str):
+    # Given
+    repo = OfferRepo(db_session)
+    tag = uuid.uuid4().hex[:8]
+    now = datetime.now(UTC)
+    offers = [
+        Offer(
+            uuid=uuid.uuid4(), author=f"cursor-{index}", source=SourceType.USER, status=OfferStatus.ACTIVE,
+            description=f"cursor-{tag}", valid_to=valid_to,
+        )
+        for index, valid_to in enumerate([now + timedelta(days=1), None, now + timedelta(days=2), None])
+    ]
+    db_session.add_all(offers)
+    await db_session.commit()
+    expected = await repo.get_offers(0, 10, "valid_to", sort_order, OfferFilters(search=f"cursor-{tag}"))
+
+    # When
+    seen, cursor = [], None
+    while True:
+        page = await repo.get_offers(0, 1, "valid_to", sort_order, OfferFilters(search=f"cursor-{tag}", cursor=cursor))
+        seen.extend(offer.id for offer in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    # Then
+    assert seen == [offer.id for offer in expected.items]
+    assert len(seen) == 4
+    assert (expected.items[-1].valid_to is None) == (sort_order == "asc")
@@ -0,0 +1,73 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.enums import OfferStatus, PlaceCategory, SourceType
+from app.database.models.models import LegalRole, Offer, Place
+from app.repositories.filters.offer_filters import OfferFilters
+from app.repositories.visible_offer_repo import VisibleOfferRepo
+
+
+@pytest.fixture
+async def db_session(client) -> AsyncSession:
+    from app.core.database import _init_engine_if_needed, get_db
+    _init_engine_if_needed()
+    async for session in get_db():
+        yield session
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_list_resolved_visible_offers_after_refresh(db_session: AsyncSession):
+    # Given
+    repo = VisibleOfferRepo(db_session)
+    role = (await db_session.execute(select(LegalRole).limit(1))).scalar_one()
+    place = Place(
+        uuid=uuid.uuid4(), name="Sąd Rejonowy Widok", name_ascii="sad rejonowy widok", city="Widok",
+        category=PlaceCategory.COURT, lat=51.1, lon=17.0,
+    )
+    tag = uuid.uuid4().hex[:8]
+    visible = Offer(
+        uuid=uuid.uuid4(), author="visible", source=SourceType.USER, status=OfferStatus.ACTIVE, place=place,
+        description=f"view-{tag}", valid_to=datetime.now(UTC) + timedelta(days=1), legal_roles=[role],
+    )
+    hidden = Offer(
+        uuid=uuid.uuid4(), author="hidden", source=SourceType.USER, status=OfferStatus.NEW,
+        description=f"view-{tag}", valid_to=datetime.now(UTC) + timedelta(days=1),
+    )
+    db_session.add_all([place, visible, hidden])
+    await db_session.commit()
+
+    # When
+    await repo.refresh()
+    after = await repo.get_offers(
+        0, 10, "valid_to", "asc", OfferFilters(search=f"view-{tag}", legal_role_uuids=[role.uuid])
+    )
+
+    # Then
+    assert after.count == 1
+    row = after.items[0]
+    assert row.uuid == visible.uuid
+    assert row.facility_uuid == place.uuid
+    assert row.location_name == "Sąd Rejonowy Widok"
+    assert (float(row.lat), float(row.lon)) == (51.1, 17.0)
+    assert row.legal_roles == [{"uuid": str(role.uuid), "name": role.name}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+async def test_should_move_refreshed_at_forward_with_each_refresh(db_session: AsyncSession):
+    # Given
+    repo = VisibleOfferRepo(db_session)
+    await repo.refresh()
+    before = await repo.get_refreshed_at()
+
+    # When
+    await repo.refresh()
+
+    # Then
+    assert before is not None
+    assert await repo.get_refreshed_at() > before
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.database.models.enums import JobKind, JobStatus
+from app.database.models.models import Job
+from app.repositories.job_repo import JobRepo
+from app.services.jobs.worker import JobWorker
+
+
+def make_worker(handler=None, dead_letter_handler=None) -> JobWorker:
+    handlers = {JobKind.INGEST_RAW_OFFER: handler} if handler else {}
+    return JobWorker(
+        handlers,
+        concurrency=1,
+        poll_interval_seconds=0,
+        retry_backoff_seconds=10,
+        retry_backoff_max_seconds=60,
+        lock_timeout_seconds=600,
+        worker_id="test",
+        dead_letter_handlers={JobKind.INGEST_RAW_OFFER: dead_letter_handler} if dead_letter_handler else None,
+    )
+
+
+def make_job(attempts: int = 1, max_attempts: int = 3) -> Job:
+    return Job(
+        id=7, kind=JobKind.INGEST_RAW_OFFER, payload={"offer_uid": "fb-1"}, status=JobStatus.RUNNING,
+        attempts=attempts, max_attempts=max_attempts,
+    )
+
+
+@pytest.fixture
+def job_repo_mock():
+    return AsyncMock(spec=JobRepo)
+
+
+async def test_should_complete_job_when_handler_succeeds(job_repo_mock):
+    # Given
+    handler = AsyncMock()
+
+    # When
+    await make_worker(handler).process(job_repo_mock, make_job())
+
+    # Then
+    handler.assert_awaited_once_with({"offer_uid": "fb-1"})
+    job_repo_mock.complete.assert_awaited_once_with(7)
+    job_repo_mock.retry.assert_not_awaited()
+
+
+async def test_should_retry_failed_job_with_backoff(job_repo_mock):
+    # Given
+    handler = AsyncMock(side_effect=ConnectionError("db gone"))
+
+    # When
+    await make_worker(handler).process(job_repo_mock, make_job(attempts=2))
+
+    # Then
+    job_repo_mock.retry.assert_awaited_once_with(7, "ConnectionError: db gone", timedelta(seconds=20))
+    job_repo_mock.complete.assert_not_awaited()
+    job_repo_mock.bury.assert_not_awaited()
+
+
+async def test_should_dead_letter_job_out_of_attempts(job_repo_mock):
+    # Given
+    handler = AsyncMock(side_effect=ValueError("bad payload"))
+
+    # When
+    await make_worker(handler).process(job_repo_mock, make_job(attempts=3, max_attempts=3))
+
+    # Then
+    job_repo_mock.bury.assert_awaited_once_with(7, "ValueError: bad payload")
+    job_repo_mock.retry.assert_not_awaited()
+
+
+async def test_should_record_final_failure_only_when_dead_lettering(job_repo_mock):
+    # Given
+    handler = AsyncMock(side_effect=ValueError("bad payload"))
+    dead_letter_handler = AsyncMock()
+    worker = make_worker(handler, dead_letter_handler)
+
+    # When
+    await worker.process(job_repo_mock, make_job(attempts=2, max_attempts=3))
+    await worker.process(job_repo_mock, make_job(attempts=3, max_attempts=3))
+
+    # Then
+    dead_letter_handler.assert_awaited_once_with({"offer_uid": "fb-1"}, "ValueError: bad payload")
+    job_repo_mock.bury.assert_awaited_once()
+
+
+async def test_should_dead_letter_job_without_handler(job_repo_mock):
+    # When
+    await make_worker().process(job_repo_mock, make_job())
+
+    # Then
+    job_repo_mock.bury.assert_awaited_once_with(7, "No handler for INGEST_RAW_OFFER")
+
+
+def test_should_double_retry_delay_up_to_the_cap():
+    # Given
+    worker = make_worker()
+
+    # When
+    delays = [worker.retry_delay(attempts).total_seconds() for attempts in range(1, 6)]
+
+    # Then
+    assert delays == [10, 20, 40, 60, 60]
@@ -0,0 +1,63 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.database.models.enums import OfferStatus
+from app.database.models.models import Offer, Place
+from app.repositories.offer_repo import OfferRepo
+from app.services.offers.active_offer_index import ActiveOfferIndex
+
+
+def make_offer(offer_id: int, status: OfferStatus = OfferStatus.ACTIVE, lat: float | None = 52.0, lon: float | None = 21.0,
+               valid_to: datetime | None = None) -> Offer:
+    return Offer(id=offer_id, status=status, lat=lat, lon=lon, valid_to=valid_to or datetime.now(UTC) + timedelta(days=1))
+
+
+@pytest.mark.asyncio
+async def test_should_load_active_locations_and_filter_by_validity():
+    # Given
+    now = datetime.now(UTC)
+    offer_repo = AsyncMock(spec=OfferRepo)
+    offer_repo.get_active_locations.return_value = [
+        SimpleNamespace(id=1, lat=52.0, lon=21.0, valid_to=now + timedelta(days=1)),
+        SimpleNamespace(id=2, lat=52.01, lon=21.01, valid_to=now - timedelta(hours=1)),
+        SimpleNamespace(id=3, lat=50.06, lon=19.94, valid_to=now + timedelta(days=1)),
+    ]
+    index = ActiveOfferIndex()
+
+    # When
+    await index.load(offer_repo)
+
+    # Then
+    assert index.is_ready
+    assert sorted(index.candidate_ids(52.0, 21.0, 10)) == [1, 2]
+    assert index.candidate_ids(52.0, 21.0, 10, valid_after=now) == [1]
+
+
+def test_should_follow_offer_status_changes():
+    # Given
+    index = ActiveOfferIndex()
+
+    # When
+    index.offer_changed(make_offer(1))
+    index.offer_changed(make_offer(2))
+    index.offer_changed(make_offer(2, status=OfferStatus.REJECTED))
+    index.offer_changed(make_offer(3, lat=None, lon=None))
+
+    # Then
+    assert index.candidate_ids(52.0, 21.0, 5) == [1]
+
+
+def test_should_locate_offer_through_its_place():
+    # Given
+    index = ActiveOfferIndex()
+    offer = make_offer(1, lat=None, lon=None)
+    offer.place = Place(name="Sąd Rejonowy", lat=50.06, lon=19.94)
+
+    # When
+    index.offer_changed(offer)
+
+    # Then
+    assert index.candidate_ids(50.06, 19.94, 5) == [1]
@@ -0,0 +1,92 @@
+import gzip
+import json
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from app.database.models.enums import OfferStatus
+from app.database.models.models import City, Offer
+from app.repositories.offer_repo import OfferRepo
+from app.services.offers.map_snapshot import MapSnapshot
+
+
+def make_row(offer_id: int, **overrides):
+    row = {
+        "id": offer_id,
+        "uuid": uuid4(),
+        "description": f"offer {offer_id}",
+        "date": date(2025, 7, 30),
+        "valid_to": datetime.now(UTC) + timedelta(days=1),
+        "lat": 52.0,
+        "lon": 21.0,
+        "place_name": "Sąd Rejonowy",
+    }
+    return SimpleNamespace(**{**row, **overrides})
+
+
+@pytest_asyncio.fixture
+async def snapshot():
+    offer_repo = AsyncMock(spec=OfferRepo)
+    offer_repo.get_map_rows.return_value = [make_row(1), make_row(2, lat=50.06, lon=19.94)]
+    snapshot = MapSnapshot()
+    await snapshot.load(offer_repo)
+    return snapshot
+
+
+@pytest.mark.asyncio
+async def test_should_serialize_feature_collection_with_gzip_and_etag(snapshot):
+    # When
+    payload = snapshot.payload()
+
+    # Then
+    collection = json.loads(payload.body)
+    assert collection["type"] == "FeatureCollection"
+    assert [feature["geometry"]["coordinates"] for feature in collection["features"]] == [[21.0, 52.0], [19.94, 50.06]]
+    assert collection["features"][0]["properties"]["place_name"] == "Sąd Rejonowy"
+    assert gzip.decompress(payload.gzip_body) == payload.body
+    assert payload.etag.startswith('"') and payload.etag.endswith('"')
+    assert snapshot.payload() is payload
+
+
+@pytest.mark.asyncio
+async def test_should_patch_features_on_offer_writes(snapshot):
+    # Given
+    etag = snapshot.payload().etag
+    city = City(name="Radom", lat=51.4, lon=21.15)
+    activated = Offer(id=3, uuid=uuid4(), status=OfferStatus.ACTIVE, city=city,
+                      valid_to=datetime.now(UTC) + timedelta(days=1), description="new")
+    unresolved = Offer(id=4, uuid=uuid4(), status=OfferStatus.ACTIVE, lat=50.0, lon=20.0, city_name="Typed city",
+                       valid_to=datetime.now(UTC) + timedelta(days=1), description="typed")
+    rejected = Offer(id=1, uuid=uuid4(), status=OfferStatus.REJECTED, lat=52.0, lon=21.0)
+
+    # When
+    snapshot.offer_changed(activated)
+    snapshot.offer_changed(unresolved)
+    snapshot.offer_changed(rejected)
+    payload = snapshot.payload()
+
+    # Then
+    features = {feature["properties"]["description"]: feature for feature in json.loads(payload.body)["features"]}
+    assert set(features) == {"offer 2", "new", "typed"}
+    assert features["new"]["geometry"]["coordinates"] == [21.15, 51.4]
+    assert features["new"]["properties"]["place_name"] == "Radom"
+    # Like the SQL snapshot: a typed-in city name is not a place name
+    assert features["typed"]["properties"]["place_name"] is None
+    assert payload.etag != etag
+
+
+@pytest.mark.asyncio
+async def test_should_drop_offers_past_visibility_window(snapshot):
+    # Given
+    snapshot.offer_changed(Offer(id=2, uuid=uuid4(), status=OfferStatus.ACTIVE, lat=50.06, lon=19.94,
+                                 valid_to=datetime.now(UTC) - timedelta(hours=13)))
+
+    # When
+    features = snapshot.visible_features()
+
+    # Then
+    assert [feature.offer_id for feature in features] == [1]
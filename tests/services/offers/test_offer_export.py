@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.database.models.enums import OfferStatus, SourceType
+from app.services.offers.offer_export import EXPORT_FIELDS, export_chunks
+
+
+def make_row(**overrides):
+    row = dict.fromkeys(EXPORT_FIELDS)
+    row.update(uuid=uuid4(), status=OfferStatus.NEW, source=SourceType.BOT, author="Jan", legal_roles=[])
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+async def batches(*groups):
+    for group in groups:
+        yield group
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def test_should_encode_one_json_document_per_line():
+    # Given
+    rows = [make_row(raw_data="Szukam zastępstwa\nw sądzie", price=Decimal("150.00")), make_row()]
+
+    # When
+    body = await collect(export_chunks(batches(rows[:1], rows[1:]), "ndjson"))
+
+    # Then
+    lines = body.decode().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["raw_data"] == "Szukam zastępstwa\nw sądzie"
+    assert json.loads(lines[0])["price"] == "150.00"
+    assert json.loads(lines[1])["uuid"] == str(rows[1].uuid)
+
+
+async def test_should_encode_csv_with_header_and_flattened_values():
+    # Given
+    role = {"uuid": str(uuid4()), "name": "adwokat"}
+    row = make_row(raw_data='quoted "text", with comma', legal_roles=[role], added_at=datetime(2026, 10, 1, 8, 30))
+
+    # When
+    body = await collect(export_chunks(batches([row]), "csv"))
+
+    # Then
+    header, record = list(csv.reader(io.StringIO(body.decode())))
+    exported = dict(zip(header, record, strict=True))
+    assert header == EXPORT_FIELDS
+    assert exported["raw_data"] == 'quoted "text", with comma'
+    assert json.loads(exported["legal_roles"]) == [role]
+    assert exported["added_at"] == "2026-10-01T08:30:00"
+    assert exported["email"] == ""
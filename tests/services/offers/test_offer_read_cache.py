@@ -0,0 +1,61 @@
+import json
+from uuid import uuid4
+
+from app.schemas.domain.place import LegalRoleIndexResponse
+from app.services.offers.offer_read_cache import LEGAL_ROLES, OFFER_DETAIL, OfferReadCache
+
+
+async def test_should_not_store_response_loaded_before_invalidation():
+    # Given
+    cache = OfferReadCache(ttl_seconds=60)
+    offer_uuid = uuid4()
+    key = (OFFER_DETAIL, offer_uuid)
+
+    async def build_racing_a_write():
+        cache.invalidate_offer(offer_uuid)
+        return {"uuid": offer_uuid, "name": "stale"}
+
+    # When
+    await cache.get_or_build(key, LegalRoleIndexResponse, build_racing_a_write)
+
+    # Then
+    assert cache.stats()["size"] == 0
+
+
+async def test_should_serialize_once_and_count_hits():
+    # Given
+    cache = OfferReadCache(ttl_seconds=60)
+    calls = []
+
+    async def build():
+        calls.append(1)
+        return [{"uuid": uuid4(), "name": "radca prawny"}]
+
+    # When
+    first = await cache.get_or_build((LEGAL_ROLES,), list[LegalRoleIndexResponse], build)
+    second = await cache.get_or_build((LEGAL_ROLES,), list[LegalRoleIndexResponse], build)
+
+    # Then
+    assert first == second
+    assert json.loads(first.body)[0]["name"] == "radca prawny"
+    assert len(calls) == 1
+    assert cache.stats() == {"size": 1, "max_size": 2048, "hits": 1, "misses": 1}
+
+
+async def test_should_skip_serialization_when_validator_matches():
+    # Given
+    cache = OfferReadCache(ttl_seconds=60)
+    role_uuid = uuid4()
+
+    async def build():
+        return {"uuid": role_uuid, "name": "adwokat"}
+
+    # When
+    representation = await cache.get_or_build(
+        (OFFER_DETAIL, role_uuid), LegalRoleIndexResponse, build, lambda value: f'W/"{value["uuid"].hex}"', f'"{role_uuid.hex}"'
+    )
+
+    # Then
+    assert representation.etag == f'W/"{role_uuid.hex}"'
+    assert representation.body is None
+    assert cache.stats()["size"] == 0
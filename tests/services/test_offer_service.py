@@ -9,16 +9,28 @@ import pytest_asyncio
 from fastapi import HTTPException
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
 
-from app.database.models.enums import OfferStatus, SourceType
+from app.common.minhash import signature
+from app.core.exceptions import AIParseError
+from app.database.models.enums import JobKind, OfferStatus, SourceType
 from app.database.models.models import City, LegalRole, Offer
+from app.infrastructure.cache.ttl_cache import TTLCache
 from app.repositories.city_repo import CityRepo
+from app.repositories.filters.offer_filters import OfferFilters
+from app.repositories.job_repo import JobRepo
 from app.repositories.legal_role_repo import LegalRoleRepo
 from app.repositories.offer_repo import OfferRepo
+from app.repositories.pagination import Page
 from app.repositories.place_repo import PlaceRepo
-from app.schemas.domain.offer import OfferAdd, OfferRawAdd, OfferUpdate
+from app.repositories.visible_offer_repo import VisibleOfferRepo
+from app.schemas.domain.ai import ParseResponse, SubstitutionOffer
+from app.schemas.domain.common import Coordinates
+from app.schemas.domain.offer import OfferAdd, OfferRawAdd, OfferUpdate, RawOfferIndexResponse
 from app.services.email_validation_service import EmailValidationService
 from app.services.offer_service import OfferService
+from app.services.offers.active_offer_index import ActiveOfferIndex
 from app.services.offers.offer_notification_service import OfferNotificationService
+from app.services.offers.offer_read_cache import OfferReadCache
+from app.services.offers.visible_offers_refresher import VisibleOffersRefresher
 
 
 @pytest_asyncio.fixture
@@ -327,3 +339,476 @@ async def test_should_ignore_null_status_during_offer_update(service, offer_repo
     # Check that status was NOT changed to None on the model
     assert db_offer.status == OfferStatus.NEW
     assert db_offer.description == "New Desc"
+
+
+@pytest.fixture
+def cached_service(service):
+    service.count_cache = TTLCache[int](ttl_seconds=60)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_should_reuse_cached_count_for_same_filters(cached_service, offer_repo_mock):
+    # Given
+    offer_repo_mock.get_offers.return_value = Page(items=[], count=42)
+    now = datetime(2025, 7, 30, 10, 15, 5, tzinfo=UTC)
+
+    # When
+    first = await cached_service.list_offers(0, 10, "valid_to", "asc", OfferFilters(status=OfferStatus.ACTIVE, valid_to=now))
+    second = await cached_service.list_offers(
+        10, 10, "created_at", "desc", OfferFilters(status=OfferStatus.ACTIVE, valid_to=now + timedelta(seconds=20))
+    )
+
+    # Then
+    assert first.count == second.count == 42
+    include_count = [call.kwargs["include_count"] for call in offer_repo_mock.get_offers.await_args_list]
+    assert include_count == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_should_drop_cached_counts_after_status_change(cached_service, offer_repo_mock):
+    # Given
+    offer_repo_mock.get_offers.side_effect = [Page(items=[], count=3), Page(items=[], count=4)]
+    offer_repo_mock.get_by_uuid.return_value = MagicMock(spec=Offer, id=1, status=OfferStatus.NEW)
+
+    # When
+    before = await cached_service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters())
+    await cached_service.accept_raw_offer(uuid4())
+    after = await cached_service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters())
+
+    # Then
+    assert (before.count, after.count) == (3, 4)
+
+
+@pytest.mark.asyncio
+async def test_should_skip_count_when_not_requested(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.get_offers.return_value = Page(items=[], count=None)
+
+    # When
+    page = await service.list_offers(0, 10, "valid_to", "asc", OfferFilters(), "none")
+
+    # Then
+    assert page.count is None
+    assert offer_repo_mock.get_offers.await_args.kwargs["include_count"] is False
+
+
+@pytest.mark.asyncio
+async def test_should_use_planner_estimate_only_for_unfiltered_listing(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.get_offers.side_effect = [Page(items=[], count=None), Page(items=[], count=7)]
+    offer_repo_mock.estimate_count.return_value = 1200
+
+    # When
+    unfiltered = await service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters(), "estimate")
+    filtered = await service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters(status=OfferStatus.NEW), "estimate")
+
+    # Then
+    assert (unfiltered.count, unfiltered.count_is_estimate) == (1200, True)
+    assert (filtered.count, filtered.count_is_estimate) == (7, False)
+
+
+@pytest.mark.asyncio
+async def test_should_resolve_radius_filter_from_active_offer_index(service, offer_repo_mock):
+    # Given
+    index = ActiveOfferIndex()
+    index.loaded_at = 0.0
+    index.offer_changed(Offer(id=7, status=OfferStatus.ACTIVE, lat=52.0, lon=21.0, valid_to=datetime.now(UTC) + timedelta(days=1)))
+    index.offer_changed(Offer(id=8, status=OfferStatus.ACTIVE, lat=50.0, lon=19.9, valid_to=datetime.now(UTC) + timedelta(days=1)))
+    service.active_offer_index = index
+    offer_repo_mock.get_offers.return_value = Page(items=[], count=0)
+    filters = OfferFilters(
+        status=OfferStatus.ACTIVE, coordinates=Coordinates(lat=52.1, lon=21.0), distance_km=50, valid_to=datetime.now(UTC)
+    )
+
+    # When
+    await service.list_offers(0, 10, "valid_to", "asc", filters)
+
+    # Then
+    repo_filters = offer_repo_mock.get_offers.await_args.args[4]
+    assert repo_filters.offer_ids == [7]
+
+
+@pytest.mark.asyncio
+async def test_should_update_active_offer_index_when_raw_offer_accepted(service, offer_repo_mock):
+    # Given
+    index = ActiveOfferIndex()
+    service.active_offer_index = index
+    offer = Offer(id=5, status=OfferStatus.NEW, lat=52.0, lon=21.0, valid_to=datetime.now(UTC) + timedelta(days=1))
+    offer_repo_mock.get_by_uuid.return_value = offer
+
+    async def apply_update(offer_id, **values):
+        for field, value in values.items():
+            setattr(offer, field, value)
+
+    offer_repo_mock.update.side_effect = apply_update
+
+    # When
+    await service.accept_raw_offer(uuid4())
+
+    # Then
+    assert index.candidate_ids(52.0, 21.0, 1) == [5]
+
+
+@pytest.mark.asyncio
+async def test_should_serve_legal_roles_from_read_cache(service, legal_role_repo_mock):
+    # Given
+    service.read_cache = OfferReadCache(ttl_seconds=60)
+    legal_role_repo_mock.get_all.return_value = [LegalRole(uuid=uuid4(), name="adwokat")]
+
+    # When
+    first = await service.get_legal_roles_response()
+    second = await service.get_legal_roles_response()
+
+    # Then
+    assert first == second
+    assert json.loads(first.body)[0]["name"] == "adwokat"
+    legal_role_repo_mock.get_all.assert_awaited_once()
+    assert service.read_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_should_invalidate_cached_raw_offer_when_rejected(service, offer_repo_mock):
+    # Given
+    service.read_cache = OfferReadCache(ttl_seconds=60)
+    offer_uuid = uuid4()
+    offer = Offer(id=3, uuid=offer_uuid, author="Author", status=OfferStatus.NEW)
+    offer_repo_mock.get_by_uuid.return_value = offer
+
+    async def apply_update(offer_id, **values):
+        for field, value in values.items():
+            setattr(offer, field, value)
+
+    offer_repo_mock.update.side_effect = apply_update
+
+    # When
+    before = await service.get_raw_offer_response(offer_uuid)
+    await service.reject_raw_offer(offer_uuid)
+    after = await service.get_raw_offer_response(offer_uuid)
+
+    # Then
+    assert json.loads(before.body)["status"] == "new"
+    assert json.loads(after.body)["status"] == "rejected"
+
+
+@pytest.mark.asyncio
+async def test_should_list_public_offers_from_visible_offers_view(service, offer_repo_mock):
+    # Given
+    visible_offer_repo = AsyncMock(spec=VisibleOfferRepo)
+    visible_offer_repo.get_offers.return_value = Page(items=[], count=0)
+    offer_repo_mock.get_offers.return_value = Page(items=[], count=0)
+    service.visible_offer_repo = visible_offer_repo
+
+    # When
+    await service.list_offers(0, 10, "valid_to", "asc", OfferFilters(status=OfferStatus.ACTIVE))
+    await service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters())
+
+    # Then
+    visible_offer_repo.get_offers.assert_awaited_once()
+    offer_repo_mock.get_offers.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_should_version_public_listings_by_visible_offers_refresh(service, offer_repo_mock):
+    # Given
+    refreshed_at = datetime(2026, 10, 17, 12, 0, tzinfo=UTC)
+    visible_offer_repo = AsyncMock(spec=VisibleOfferRepo)
+    visible_offer_repo.get_refreshed_at.return_value = refreshed_at
+    offer_repo_mock.get_last_updated_at.return_value = refreshed_at + timedelta(seconds=1)
+
+    # When
+    table_version = await service.get_visible_offers_version()
+    service.visible_offer_repo = visible_offer_repo
+    view_version = await service.get_visible_offers_version()
+
+    # Then
+    assert table_version == refreshed_at + timedelta(seconds=1)
+    assert view_version == refreshed_at
+
+
+@pytest.mark.asyncio
+async def test_should_mark_visible_offers_view_stale_after_accept_only(service, offer_repo_mock):
+    # Given
+    visible_offer_repo = AsyncMock(spec=VisibleOfferRepo)
+    service.visible_offer_repo = visible_offer_repo
+    service.visible_offers_refresher = VisibleOffersRefresher()
+    offer_repo_mock.get_by_uuid.return_value = MagicMock(spec=Offer, id=1, status=OfferStatus.NEW)
+    offer_repo_mock.insert_raw_offers.return_value = ["2"]
+
+    # When
+    await service.create_raw_offer(
+        OfferRawAdd(raw_data="x", author="a", author_uid="1", offer_uid="2", timestamp=datetime.now(UTC), source=SourceType.USER)
+    )
+    stale_after_import = service.visible_offers_refresher.stale
+    await service.accept_raw_offer(uuid4())
+
+    # Then
+    assert stale_after_import is False
+    assert service.visible_offers_refresher.stale is True
+    visible_offer_repo.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_refresh_stale_visible_offers_view_once():
+    # Given
+    refresher = VisibleOffersRefresher()
+    visible_offer_repo = AsyncMock(spec=VisibleOfferRepo)
+    refresher.mark_stale()
+    refresher.mark_stale()
+
+    # When
+    refreshed = [await refresher.refresh_if_stale(visible_offer_repo) for _ in range(2)]
+
+    # Then
+    assert refreshed == [True, False]
+    visible_offer_repo.refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_should_select_requested_and_required_fields_of_raw_offers(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.get_offers.return_value = Page(items=[], count=0)
+
+    # When
+    await service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters(), fields=["uuid", "offer_uid"])
+    await service.list_raw_offers(0, 10, "created_at", "desc", OfferFilters())
+
+    # Then
+    sparse, full = [call.kwargs["columns"] for call in offer_repo_mock.get_offers.await_args_list]
+    assert sparse == ["uuid", "author", "status", "offer_uid"]
+    assert "raw_data" in full
+    assert set(full) == set(RawOfferIndexResponse.model_fields)
+
+
+@pytest.mark.asyncio
+async def test_should_import_raw_offer_batch_in_one_insert(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.insert_raw_offers.return_value = ["fb-1"]
+    offers = [
+        OfferRawAdd(
+            raw_data=raw_data, author="a", author_uid="1", offer_uid=uid, timestamp=datetime.now(UTC), source=SourceType.BOT
+        )
+        for uid, raw_data in [("fb-1", "Pilne, kontakt: jan@kancelaria.pl"), ("fb-2", "Szukam zastępstwa")]
+    ]
+
+    # When
+    result = await service.create_raw_offers(offers)
+
+    # Then
+    rows = offer_repo_mock.insert_raw_offers.await_args.args[0]
+    assert [(row["offer_uid"], row["email"], row["status"]) for row in rows] == [
+        ("fb-1", "jan@kancelaria.pl", OfferStatus.NEW),
+        ("fb-2", None, OfferStatus.POSTPONED),
+    ]
+    assert (result.inserted, result.skipped) == (1, 1)
+    offer_repo_mock.get_by_offer_uid.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_reject_known_raw_offer_without_reading_it_first(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.insert_raw_offers.return_value = []
+    offer = OfferRawAdd(raw_data="x", author="a", author_uid="1", offer_uid="fb-1", timestamp=datetime.now(UTC), source=SourceType.BOT)
+
+    # When
+    with pytest.raises(HTTPException) as exc_info:
+        await service.create_raw_offer(offer)
+
+    # Then
+    assert exc_info.value.status_code == 409
+    offer_repo_mock.get_by_offer_uid.assert_not_awaited()
+    offer_repo_mock.create.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_enqueue_raw_offer_when_job_queue_is_enabled(service, offer_repo_mock):
+    # Given
+    service.job_repo = AsyncMock(spec=JobRepo)
+    offer = OfferRawAdd(raw_data="x", author="a", author_uid="1", offer_uid="fb-1", timestamp=datetime.now(UTC), source=SourceType.BOT)
+
+    # When
+    queued = await service.submit_raw_offer(offer)
+
+    # Then
+    assert queued is True
+    kind, payload, _ = service.job_repo.enqueue.await_args.args
+    assert kind == JobKind.INGEST_RAW_OFFER
+    assert OfferRawAdd.model_validate(payload) == offer
+    offer_repo_mock.insert_raw_offers.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_import_raw_offer_inline_without_job_queue(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.insert_raw_offers.return_value = ["fb-1"]
+    offer = OfferRawAdd(raw_data="x", author="a", author_uid="1", offer_uid="fb-1", timestamp=datetime.now(UTC), source=SourceType.BOT)
+
+    # When
+    queued = await service.submit_raw_offer(offer)
+
+    # Then
+    assert queued is False
+    offer_repo_mock.insert_raw_offers.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_should_return_stored_parse_result_without_calling_parser(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    stored = ParseResponse(success=True, data=SubstitutionOffer(description="Sąd Rejonowy", email="jan@kancelaria.pl"))
+    offer_repo_mock.get_by_uuid.return_value = MagicMock(spec=Offer, raw_data="x", parse_result=stored.model_dump(mode="json"))
+
+    # When
+    result = await service.parse_raw_offer(uuid4())
+
+    # Then
+    assert result == stored
+    ai_parser_mock.parse_offer.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_parse_live_and_store_result_when_offer_not_parsed_yet(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    parsed = ParseResponse(success=True, data=SubstitutionOffer(description="Policja"))
+    ai_parser_mock.parse_offer.return_value = parsed
+    failed = ParseResponse(success=False, error="timeout").model_dump(mode="json")
+    offer_repo_mock.get_by_uuid.side_effect = [
+        MagicMock(spec=Offer, id=1, raw_data="x", parse_result=None),
+        MagicMock(spec=Offer, id=2, raw_data="y", parse_result=failed),
+    ]
+
+    # When
+    results = [await service.parse_raw_offer(uuid4()) for _ in range(2)]
+
+    # Then
+    assert results == [parsed, parsed]
+    stored = [call.args for call in offer_repo_mock.save_parse_result.await_args_list]
+    assert stored == [(1, parsed.model_dump(mode="json")), (2, parsed.model_dump(mode="json"))]
+
+
+@pytest.mark.asyncio
+async def test_should_not_store_failed_live_parse(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    ai_parser_mock.parse_offer.return_value = ParseResponse(success=False, error="timeout")
+    offer_repo_mock.get_by_uuid.return_value = MagicMock(spec=Offer, id=1, raw_data="x", parse_result=None)
+
+    # When
+    result = await service.parse_raw_offer(uuid4())
+
+    # Then
+    assert result.success is False
+    offer_repo_mock.save_parse_result.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_store_background_parse_of_new_offer(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    parsed = ParseResponse(success=True, data=SubstitutionOffer(description="Policja"))
+    ai_parser_mock.parse_offer.return_value = parsed
+    offer_repo_mock.get_by_id.return_value = MagicMock(spec=Offer, status=OfferStatus.NEW, parse_result=None, raw_data="x")
+
+    # When
+    await service.parse_new_offer(7)
+
+    # Then
+    ai_parser_mock.parse_offer.assert_awaited_once_with("x")
+    offer_repo_mock.save_parse_result.assert_awaited_once_with(7, parsed.model_dump(mode="json"))
+
+
+@pytest.mark.asyncio
+async def test_should_raise_failed_background_parse_for_retry(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    ai_parser_mock.parse_offer.return_value = ParseResponse(success=False, error="rate limited")
+    offer_repo_mock.get_by_id.return_value = MagicMock(spec=Offer, status=OfferStatus.NEW, parse_result=None, raw_data="x")
+
+    # When / Then
+    with pytest.raises(AIParseError, match="rate limited"):
+        await service.parse_new_offer(7)
+    offer_repo_mock.save_parse_result.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_store_failure_of_dead_lettered_parse(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.get_by_id.return_value = MagicMock(spec=Offer, parse_result=None)
+
+    # When
+    await service.save_parse_failure(7, "AIParseError: rate limited")
+
+    # Then
+    offer_repo_mock.save_parse_result.assert_awaited_once_with(
+        7, ParseResponse(success=False, error="AIParseError: rate limited").model_dump(mode="json")
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_drain_parse_backlog_in_batches(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    parsed = ParseResponse(success=True, data=SubstitutionOffer(description="x"))
+    failed = ParseResponse(success=False, error="rate limited")
+    offer_repo_mock.get_unparsed_new_offers.side_effect = [
+        [MagicMock(id=3, raw_data="a"), MagicMock(id=5, raw_data="b")],
+        [MagicMock(id=9, raw_data="c")],
+    ]
+    ai_parser_mock.parse_offers.side_effect = [[parsed, failed], [parsed]]
+
+    # When
+    count = await service.parse_new_offers(batch_size=2, limit=3)
+
+    # Then
+    assert count == 2
+    assert [call.args for call in offer_repo_mock.get_unparsed_new_offers.await_args_list] == [(2, 0), (1, 5)]
+    ai_parser_mock.parse_offers.assert_any_await(["a", "b"])
+    assert [call.args[0] for call in offer_repo_mock.save_parse_results.await_args_list] == [
+        {3: parsed.model_dump(mode="json")}, {9: parsed.model_dump(mode="json")}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_should_skip_background_parse_of_moderated_offer(service, offer_repo_mock, ai_parser_mock):
+    # Given
+    offer_repo_mock.get_by_id.return_value = MagicMock(
+        spec=Offer, status=OfferStatus.ACTIVE, parse_result=None, raw_data="x"
+    )
+
+    # When
+    await service.parse_new_offer(7)
+
+    # Then
+    ai_parser_mock.parse_offer.assert_not_awaited()
+    offer_repo_mock.save_parse_result.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_return_near_duplicates_most_similar_first(service, offer_repo_mock):
+    # Given
+    post = "Zastępstwo w Sądzie Rejonowym Kraków-Podgórze 14.11 godz. 9:30, sprawa cywilna, kontakt anna@kancelaria.pl"
+    source = signature(post)
+    offer_repo_mock.get_minhash.return_value = MagicMock(id=1, minhash=source, minhash_bands=[1, 2])
+    offer_repo_mock.find_by_minhash_bands.return_value = [
+        MagicMock(uuid=uuid4(), author="edit", status=OfferStatus.NEW, minhash=signature(post + " Pilne!")),
+        MagicMock(uuid=uuid4(), author="other", status=OfferStatus.NEW, minhash=signature("Policja Gdańsk jutro, radca")),
+        MagicMock(uuid=uuid4(), author="repost", status=OfferStatus.ACTIVE, minhash=source),
+    ]
+
+    # When
+    duplicates = await service.get_duplicate_offers(uuid4())
+
+    # Then
+    assert [duplicate.author for duplicate in duplicates] == ["repost", "edit"]
+    assert duplicates[0].similarity == 1.0
+    offer_repo_mock.find_by_minhash_bands.assert_awaited_once_with([1, 2], exclude_id=1)
+
+
+@pytest.mark.asyncio
+async def test_should_leave_fingerprinting_of_raw_imports_to_the_worker(service, offer_repo_mock):
+    # Given
+    offer_repo_mock.insert_raw_offers.return_value = ["fb-1"]
+    offer = OfferRawAdd(raw_data="Zastępstwo", author="a", author_uid="1", offer_uid="fb-1", timestamp=datetime.now(UTC), source=SourceType.BOT)
+
+    # When
+    await service.create_raw_offers([offer])
+
+    # Then
+    [row] = offer_repo_mock.insert_raw_offers.await_args.args[0]
+    assert "minhash" not in row
+    assert "minhash_bands" not in row
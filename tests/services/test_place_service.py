@@ -7,12 +7,13 @@ import pytest_asyncio
 
 from app.core.exceptions import ConflictError, NotFoundError
 from app.database.models.enums import PlaceCategory
-from app.database.models.models import Place
+from app.database.models.models import City, Place
 from app.repositories.city_repo import CityRepo
 from app.repositories.place_repo import PlaceRepo
 from app.schemas.domain.common import Coordinates
 from app.schemas.domain.place import Address, PlaceAdd
 from app.services.place_service import PlaceService
+from app.services.places.gazetteer import GazetteerIndex
 
 
 @pytest_asyncio.fixture
@@ -114,3 +115,83 @@ async def test_should_successfully_create_new_place(service, place_repo_mock):
 
     # Then
     place_repo_mock.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_should_answer_city_autocomplete_from_loaded_gazetteer(city_repo_mock, place_repo_mock):
+    # Given
+    gazetteer = GazetteerIndex()
+    city_repo_mock.get_version.return_value = (3, 3)
+    city_repo_mock.get_gazetteer_rows.return_value = [
+        City(uuid=uuid4(), name="Warka", name_ascii="warka", importance=0.2),
+        City(uuid=uuid4(), name="Warszawa", name_ascii="warszawa", importance=0.9),
+        City(uuid=uuid4(), name="Kraków", name_ascii="krakow", importance=0.8),
+    ]
+    place_repo_mock.get_gazetteer_rows.return_value = []
+    await gazetteer.load(city_repo_mock, place_repo_mock)
+    service = PlaceService(city_repo=city_repo_mock, place_repo=place_repo_mock, gazetteer=gazetteer)
+
+    # When
+    result = await service.get_cities("War")
+
+    # Then
+    assert [city.name for city in result] == ["Warszawa", "Warka"]
+    city_repo_mock.get_by_partial_name.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_skip_gazetteer_reload_while_tables_are_unchanged(city_repo_mock, place_repo_mock):
+    # Given
+    gazetteer = GazetteerIndex()
+    city_repo_mock.get_version.return_value = (1, 1)
+    city_repo_mock.get_gazetteer_rows.return_value = [City(uuid=uuid4(), name="Radom", name_ascii="radom")]
+    place_repo_mock.get_version.return_value = (0, None)
+    place_repo_mock.get_gazetteer_rows.return_value = []
+    await gazetteer.load(city_repo_mock, place_repo_mock)
+
+    # When
+    await gazetteer.load(city_repo_mock, place_repo_mock)
+    city_repo_mock.get_version.return_value = (2, 2)
+    await gazetteer.load(city_repo_mock, place_repo_mock)
+
+    # Then
+    assert city_repo_mock.get_gazetteer_rows.await_count == 2
+    assert [city.name for city in gazetteer.search_cities("rad")] == ["Radom"]
+
+
+@pytest.mark.asyncio
+async def test_should_fall_back_to_repo_until_gazetteer_is_loaded(city_repo_mock, place_repo_mock):
+    # Given
+    service = PlaceService(city_repo=city_repo_mock, place_repo=place_repo_mock, gazetteer=GazetteerIndex())
+    city_repo_mock.get_by_partial_name.return_value = []
+
+    # When
+    await service.get_cities("war")
+
+    # Then
+    city_repo_mock.get_by_partial_name.assert_awaited_once_with("war")
+
+
+@pytest.mark.asyncio
+async def test_should_make_created_place_searchable_immediately(city_repo_mock, place_repo_mock):
+    # Given
+    gazetteer = GazetteerIndex()
+    city_repo_mock.get_gazetteer_rows.return_value = []
+    place_repo_mock.get_gazetteer_rows.return_value = []
+    await gazetteer.load(city_repo_mock, place_repo_mock)
+    service = PlaceService(city_repo=city_repo_mock, place_repo=place_repo_mock, gazetteer=gazetteer)
+
+    place_add = PlaceAdd(name="Sąd Rejonowy w Radomiu", type="SR", category=PlaceCategory.COURT,
+                         coordinates=Coordinates(lat=51.4, lon=21.15))
+    place_repo_mock.get_by_name_and_distance.return_value = []
+    place_repo_mock.create.side_effect = lambda **kwargs: Place(**kwargs)
+
+    # When
+    await service.create(place_add)
+    matching = await service.get_facilities("radom", "SR")
+    other_type = await service.get_facilities("radom", "SO")
+
+    # Then
+    assert [place.name for place in matching] == ["Sąd Rejonowy w Radomiu"]
+    assert other_type == []
+    place_repo_mock.get_by_partial_name.assert_not_awaited()
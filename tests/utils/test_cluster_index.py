@@ -0,0 +1,54 @@
+import pytest
+
+from app.common.spatial.cluster_index import ClusterIndex, lat_to_y, lon_to_x, x_to_lon, y_to_lat
+
+
+def make_index() -> ClusterIndex[str]:
+    warsaw = [(52.22 + i * 0.001, 21.01 + i * 0.001, f"waw-{i}") for i in range(20)]
+    return ClusterIndex([*warsaw, (50.06, 19.94, "krakow")])
+
+
+def test_should_round_trip_mercator_projection():
+    assert x_to_lon(lon_to_x(21.01)) == pytest.approx(21.01)
+    assert y_to_lat(lat_to_y(52.22)) == pytest.approx(52.22)
+
+
+def test_should_merge_nearby_points_at_low_zoom():
+    # When
+    nodes = make_index().get_clusters(14.0, 49.0, 24.5, 55.0, zoom=5)
+
+    # Then
+    clusters = [node for node in nodes if node.item is None]
+    points = [node.item for node in nodes if node.item is not None]
+    assert [cluster.count for cluster in clusters] == [20]
+    assert clusters[0].lat == pytest.approx(52.2295, abs=0.01)
+    assert clusters[0].expansion_zoom is not None
+    assert points == ["krakow"]
+
+
+def test_should_return_individual_points_at_max_zoom():
+    # When
+    nodes = make_index().get_clusters(14.0, 49.0, 24.5, 55.0, zoom=17)
+
+    # Then
+    assert len(nodes) == 21
+    assert all(node.count == 1 for node in nodes)
+
+
+def test_should_only_return_nodes_inside_bbox():
+    # When
+    nodes = make_index().get_clusters(19.0, 49.5, 20.5, 50.5, zoom=10)
+
+    # Then
+    assert [node.item for node in nodes] == ["krakow"]
+
+
+def test_should_handle_bbox_crossing_antimeridian():
+    # Given
+    index = ClusterIndex([(-17.8, 179.5, "fiji"), (-14.3, -170.7, "samoa"), (52.2, 21.0, "warsaw")])
+
+    # When
+    nodes = index.get_clusters(170.0, -30.0, -160.0, 0.0, zoom=8)
+
+    # Then
+    assert sorted(node.item for node in nodes) == ["fiji", "samoa"]
@@ -0,0 +1,44 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.common.cursor import decode_cursor, encode_cursor
+from app.core.exceptions import BadRequestError
+
+
+def test_should_round_trip_datetime_cursor():
+    # Given
+    value = datetime(2025, 7, 30, 10, 15, 0, 123456, tzinfo=UTC)
+
+    # When
+    token = encode_cursor("valid_to", "asc", value, 42)
+    decoded_value, row_id = decode_cursor(token, "valid_to", "asc")
+
+    # Then
+    assert datetime.fromisoformat(decoded_value) == value
+    assert row_id == 42
+    assert "=" not in token
+
+
+def test_should_round_trip_string_cursor():
+    # When
+    token = encode_cursor("author", "desc", "Zażółć", 7)
+
+    # Then
+    assert decode_cursor(token, "author", "desc") == ("Zażółć", 7)
+
+
+def test_should_reject_cursor_issued_for_another_ordering():
+    # Given
+    token = encode_cursor("created_at", "desc", "2025-01-01T00:00:00", 1)
+
+    # When & Then
+    with pytest.raises(BadRequestError):
+        decode_cursor(token, "created_at", "asc")
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", "", "e30", "W10"])
+def test_should_reject_malformed_cursor(token):
+    # When & Then
+    with pytest.raises(BadRequestError):
+        decode_cursor(token, "created_at", "desc")
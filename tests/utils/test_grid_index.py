@@ -0,0 +1,50 @@
+import pytest
+
+from app.common.spatial.grid_index import GridIndex, haversine_km
+
+
+def test_should_measure_great_circle_distance():
+    # Warsaw -> Kraków is roughly 252 km
+    assert haversine_km(52.2297, 21.0122, 50.0647, 19.945) == pytest.approx(252.3, abs=1.0)
+
+
+def test_should_return_points_within_radius_only():
+    # Given
+    grid = GridIndex(cell_degrees=0.5)
+    grid.upsert("warszawa", 52.2297, 21.0122)
+    grid.upsert("radom", 51.4027, 21.1471)
+    grid.upsert("krakow", 50.0647, 19.945)
+
+    # When
+    near = grid.within(52.2297, 21.0122, 100)
+    wide = grid.within(52.2297, 21.0122, 300)
+
+    # Then
+    assert set(near) == {"warszawa", "radom"}
+    assert set(wide) == {"warszawa", "radom", "krakow"}
+
+
+def test_should_move_and_remove_points():
+    # Given
+    grid = GridIndex()
+    grid.upsert(1, 52.0, 21.0)
+
+    # When
+    grid.upsert(1, 50.0, 19.9)
+    grid.upsert(2, 52.0, 21.0)
+    grid.remove(2)
+    grid.remove(3)
+
+    # Then
+    assert grid.within(52.0, 21.0, 50) == []
+    assert grid.within(50.0, 19.9, 1) == [1]
+    assert len(grid) == 1
+
+
+def test_should_search_across_antimeridian():
+    # Given
+    grid = GridIndex()
+    grid.upsert("fiji", -17.8, 179.9)
+
+    # When & Then
+    assert grid.within(-17.8, -179.9, 50) == ["fiji"]
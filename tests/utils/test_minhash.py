@@ -0,0 +1,47 @@
+from app.common.minhash import BANDS, bands, shingles, signature, signature_fields, similarity
+
+POST = (
+    "Szukam zastępstwa w Sądzie Rejonowym dla Warszawy-Mokotowa 12.11 o 10:00, sprawa karna, "
+    "kontakt jan@kancelaria.pl, faktura VAT."
+)
+REPOST = (
+    "Szukam zastepstwa w Sadzie Rejonowym dla Warszawy-Mokotowa 12.11 o 10:00 - sprawa karna. "
+    "Kontakt: jan@kancelaria.pl faktura VAT!"
+)
+OTHER = "Pilnie potrzebne zastępstwo na policji w Krakowie jutro rano, przesłuchanie świadka, radca prawny."
+
+
+def test_should_estimate_repost_as_near_duplicate():
+    # When
+    repost_similarity = similarity(signature(POST), signature(REPOST))
+    other_similarity = similarity(signature(POST), signature(OTHER))
+
+    # Then
+    assert repost_similarity >= 0.7
+    assert other_similarity < 0.3
+
+
+def test_should_share_band_keys_only_with_similar_texts():
+    # When
+    post_bands = bands(signature(POST))
+
+    # Then
+    assert len(post_bands) == BANDS
+    assert set(post_bands) & set(bands(signature(REPOST)))
+    assert not set(post_bands) & set(bands(signature(OTHER)))
+
+
+def test_should_compute_stable_compact_signature():
+    # When
+    first = signature(POST)
+
+    # Then
+    assert first == signature(POST)
+    assert len(first) == 256
+    assert all(-(2 ** 63) <= key < 2 ** 63 for key in bands(first))
+
+
+def test_should_skip_signature_of_text_without_content():
+    assert shingles(" -- ") == set()
+    assert signature(None) is None
+    assert signature_fields("...") == {"minhash": None, "minhash_bands": []}
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+
+import pytest
+
+from app.common.name_index import NameIndex
+
+
+@dataclass(frozen=True)
+class Item:
+    id: int
+    name: str
+    rank: float = 0.0
+
+
+def make_index(*items: Item) -> NameIndex[Item]:
+    index = NameIndex(key=lambda item: item.name, identity=lambda item: item.id, rank=lambda item: (item.rank,))
+    index.rebuild(items)
+    return index
+
+
+def test_should_rank_prefix_before_substring_and_by_rank_within_tier():
+    # Given
+    index = make_index(
+        Item(1, "nowa-warka"),
+        Item(2, "warka", rank=0.2),
+        Item(3, "warszawa", rank=0.9),
+        Item(4, "krakow"),
+    )
+
+    # When
+    result = index.search("war", limit=5)
+
+    # Then
+    assert [item.id for item in result] == [3, 2, 1]
+
+
+@pytest.mark.parametrize("query, expected", [("w", [2, 1]), ("wa", [2, 1, 3]), ("WAR", [2, 1])])
+def test_should_match_short_queries(query, expected):
+    # Given
+    index = make_index(Item(1, "warszawa"), Item(2, "warka", rank=1.0), Item(3, "nowa-wies"))
+
+    # When
+    result = index.search(query, limit=5)
+
+    # Then
+    assert [item.id for item in result] == expected
+
+
+def test_should_tolerate_typos_and_abbreviations():
+    # Given
+    index = make_index(Item(1, "gorzow-wielkopolski"), Item(2, "gdansk"))
+
+    # When & Then
+    assert [item.id for item in index.search("gorzow-wlkp", limit=5)] == [1]
+    assert [item.id for item in index.search("gdansk-", limit=5)] == [2]
+
+
+def test_should_replace_and_remove_items():
+    # Given
+    index = make_index(Item(1, "warka"))
+
+    # When
+    index.add(Item(1, "radom"))
+    index.add(Item(2, "radomsko"))
+    index.remove(2)
+
+    # Then
+    assert index.search("war", limit=5) == []
+    assert [item.id for item in index.search("rad", limit=5)] == [1]
+    assert len(index) == 1
+
+
+def test_should_apply_predicate_and_limit():
+    # Given
+    index = make_index(*(Item(i, f"sad-{i}", rank=i) for i in range(10)))
+
+    # When
+    result = index.search("sad", limit=3, predicate=lambda item: item.id % 2 == 0)
+
+    # Then
+    assert [item.id for item in result] == [8, 6, 4]
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 
 from app.common.text_utils import (
+    escape_like,
     generate_offer_management_token,
     remove_html_tags,
     sanitize_and_normalize_text,
@@ -95,3 +96,17 @@ def test_should_split_street_correctly(street_input, expected_street, expected_n
 
     # Then
     assert result == (expected_street, expected_number)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("warszawa", "warszawa"),
+    ("100%", "100\\%"),
+    ("a_b", "a\\_b"),
+    ("c:\\dir", "c:\\\\dir"),
+])
+def test_should_escape_like_wildcards(value, expected):
+    # When
+    result = escape_like(value)
+
+    # Then
+    assert result == expected
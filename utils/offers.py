@@ -275,18 +275,15 @@ class FacebookPageParser:
         ]
         print("\n".join(filter(None, lines)))
 
-    def push_to_server(self, offers: list[FacebookPost]):
+    def push_to_server(self, offers: list[FacebookPost], batch_size: int = 500):
         headers = {
             "Accept": "application/json",
             "Cache-Control": "no-cache",
             "Content-Type": "application/json"
         }
 
-        for offer in offers:
-            if not offer.author_link or not offer.post_link:
-                continue
-
-            payload = {
+        payloads = [
+            {
                 "author": offer.author,
                 "raw_data": offer.content,
                 "author_uid": offer.author_link,
@@ -294,19 +291,25 @@ class FacebookPageParser:
                 "timestamp": offer.timestamp,
                 "source": "bot"
             }
+            for offer in offers
+            if offer.author_link and offer.post_link
+        ]
 
+        for start in range(0, len(payloads), batch_size):
             try:
                 response = requests.post(
-                    f"{BASE_API_URL}/offers/raw",
+                    f"{BASE_API_URL}/offers/raw/batch",
                     headers=headers,
-                    json=payload,
+                    json=payloads[start:start + batch_size],
                     timeout=30
                 )
 
                 response.raise_for_status()
+                result = response.json()
+                logger.info(f"Pushed offers: {result['inserted']} new, {result['skipped']} already known")
 
             except RequestException as e:
-                logger.error(f"Error pushing offer to server: {e}, {offer.index}")
+                logger.error(f"Error pushing offers to server: {e}, batch starting at {start}")
 
     def run(self) -> list[FacebookPost]:
         """Main execution method."""